@@ -0,0 +1,89 @@
+"""
+Dependency resolution benchmark
+
+Times DependencyNode.resolve_dependencies on a deep chain, a wide fan-out and a diamond-heavy lattice, against the
+previous recursive resolver that tracked resolved and unresolved nodes in lists.
+
+Usage, from the repository root: PYTHONPATH=. python benchmarks/bench_dependency_resolve.py [size]
+"""
+
+import sys
+import time
+
+from skeema.core.container import Container
+from skeema.core.dependency import Dependency, CircularDependencyException
+
+
+class Node(Dependency):
+    pass
+
+
+def create_nodes(count: int):
+    container = Container()
+    nodes = [Node() for _ in range(count)]
+    for i, node in enumerate(nodes):
+        container.add_object(f"node{i}", node, f"node{i}")
+    return container, nodes
+
+
+def deep_chain(size: int):
+    container, nodes = create_nodes(size)
+    for node, child in zip(nodes[1:], nodes):
+        node.add_dependency(child)
+    return container, nodes, nodes[-1]
+
+
+def wide_fan_out(size: int):
+    container, nodes = create_nodes(size + 1)
+    for child in nodes[:-1]:
+        nodes[-1].add_dependency(child)
+    return container, nodes, nodes[-1]
+
+
+def diamond_lattice(size: int):
+    # Layers of `width` nodes, where every node depends on every node of the layer below
+    width = 8
+    layers = max(size // width, 1)
+    container, nodes = create_nodes(layers * width + 1)
+    for layer in range(1, layers):
+        for node in nodes[layer * width:(layer + 1) * width]:
+            for child in nodes[(layer - 1) * width:layer * width]:
+                node.add_dependency(child)
+    for child in nodes[(layers - 1) * width:layers * width]:
+        nodes[-1].add_dependency(child)
+    return container, nodes, nodes[-1]
+
+
+def legacy_resolve(node, resolved, unresolved=None):
+    if unresolved is None:
+        unresolved = []
+    unresolved.append(node)
+    for dependency in node.dependency_nodes:
+        if dependency not in resolved:
+            if dependency in unresolved:
+                raise CircularDependencyException(node, dependency)
+            legacy_resolve(dependency, resolved, unresolved)
+    resolved.append(node)
+    unresolved.remove(node)
+
+
+def time_call(function) -> str:
+    start = time.perf_counter()
+    try:
+        function()
+    except RecursionError:
+        return "RecursionError"
+    return f"{time.perf_counter() - start:.4f}s"
+
+
+def run(size: int) -> None:
+    for name, build in (("deep chain", deep_chain), ("wide fan-out", wide_fan_out), ("diamond lattice", diamond_lattice)):
+        _container, nodes, root = build(size)
+        root_node = root.dependency_node
+        current = time_call(root_node.resolve_dependencies)
+        legacy = time_call(lambda: legacy_resolve(root_node, []))
+        print(f"{name:<16} nodes={len(nodes):>7} resolve={current:>14} legacy={legacy:>14}")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
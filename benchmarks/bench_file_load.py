@@ -0,0 +1,86 @@
+"""
+File loading benchmark
+
+Loads a deep diamond lattice of JSON files, where every file references every file of the layer below, and compares
+the number of reads and the time taken by JsonFileManager.load against the previous loader, which read, parsed and
+scanned a file again for every path reaching it. Rescanning also added the file's references again, so the legacy
+read count grows faster than exponentially and is stopped after MAX_READS.
+
+Usage, from the repository root: PYTHONPATH=. python benchmarks/bench_file_load.py [layers]
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from skeema.file.file import JsonFile, JsonFileManager
+
+WIDTH = 2
+MAX_READS = 100_000
+
+
+class ReadLimitExceeded(Exception):
+    pass
+
+
+def write_lattice(directory: str, layers: int) -> str:
+    for layer in range(layers):
+        for column in range(WIDTH):
+            properties = {}
+            if layer + 1 < layers:
+                properties = {f'p{child}': {'$ref': f'./l{layer + 1}_{child}.json'} for child in range(WIDTH)}
+            with open(os.path.join(directory, f'l{layer}_{column}.json'), 'w') as file:
+                json.dump({'type': 'object', 'properties': properties}, file)
+
+    root = os.path.join(directory, 'root.json')
+    with open(root, 'w') as file:
+        json.dump({'properties': {f'p{child}': {'$ref': f'./l0_{child}.json'} for child in range(WIDTH)}}, file)
+    return root
+
+
+def legacy_load(file: JsonFile) -> None:
+    file.fetch()
+    file._populate_dependency_node()
+    for dependency in file._manager.get_files_from_handles(node.handle for node in file.dependency_node.dependency_nodes):
+        legacy_load(dependency)
+
+
+def measure(name: str, load, root: str) -> None:
+    fetched = Counter()
+    fetch = JsonFile.fetch
+
+    def counting_fetch(file):
+        fetched[file.path] += 1
+        if sum(fetched.values()) > MAX_READS:
+            raise ReadLimitExceeded()
+        fetch(file)
+
+    JsonFile.fetch = counting_fetch
+    start = time.perf_counter()
+    reads = ''
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            load(root)
+    except ReadLimitExceeded:
+        reads = '>'
+    finally:
+        JsonFile.fetch = fetch
+    elapsed = time.perf_counter() - start
+    reads += str(min(sum(fetched.values()), MAX_READS))
+    print(f"{name:<10} files={len(fetched):>5} reads={reads:>9} time={elapsed:>8.4f}s")
+
+
+def run(layers: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        root = write_lattice(directory, layers)
+        measure('load', lambda path: JsonFileManager().load(path), root)
+        measure('legacy', lambda path: legacy_load(JsonFileManager().create_file(path)), root)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
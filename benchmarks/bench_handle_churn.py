@@ -0,0 +1,51 @@
+"""
+Handle churn benchmark
+
+Repeatedly adds and removes objects through a ProxyContainer while a fixed working set stays alive, and reports the
+traced memory and the size of the handle manager entries list. With slot recycling both stay flat regardless of the
+number of cycles.
+
+Usage, from the repository root: PYTHONPATH=. python benchmarks/bench_handle_churn.py [cycles] [working_set]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from skeema.core.proxy_container import ProxyContainer
+
+
+class Resource:
+    pass
+
+
+def run(cycles: int, working_set: int) -> None:
+    container = ProxyContainer()
+    resident = [Resource() for _ in range(working_set)]
+    for resource in resident:
+        container.add_object(resource)
+
+    churned = Resource()
+    report_interval = max(cycles // 10, 1)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for cycle in range(1, cycles + 1):
+        handle = container.add_object(churned)
+        container.remove(handle)
+
+        if cycle % report_interval == 0:
+            current, peak = tracemalloc.get_traced_memory()
+            elapsed = time.perf_counter() - start
+            print(
+                f"cycles={cycle:>10} entries={container._handle_manager.num_entries:>8} "
+                f"traced={current / 1024:>10.1f}KiB peak={peak / 1024:>10.1f}KiB "
+                f"rate={cycle / elapsed:>12.0f}/s"
+            )
+    tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    num_cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    num_resident = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    run(num_cycles, num_resident)
@@ -0,0 +1,37 @@
+"""
+Handle storage benchmark
+
+Compares the memory used by the entry storage of HandleManager (one HandleEntry object per entry) and
+CompactHandleManager (generation array and active bitset) after issuing the same number of handles.
+
+Usage, from the repository root: PYTHONPATH=. python benchmarks/bench_handle_storage.py [num_handles]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from skeema.core.handle_manager import HandleManager
+from skeema.core.compact_handle_manager import CompactHandleManager
+
+
+def measure(manager_class, num_handles: int) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    manager = manager_class()
+    for _ in range(num_handles):
+        manager.issue_handle()
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{manager_class.__name__:<22} handles={num_handles:>9} total={current / 1024:>10.1f}KiB "
+        f"per_handle={current / num_handles:>7.1f}B issue={elapsed:>6.3f}s"
+    )
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    measure(HandleManager, count)
+    measure(CompactHandleManager, count)
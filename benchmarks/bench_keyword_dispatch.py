@@ -0,0 +1,120 @@
+"""
+Keyword dispatch benchmark
+
+Times the per schema overhead of Compiler.compile, which dispatches only the keys present in a definition to keywords
+created once, against the previous dispatch: every keyword was created again for each compile, looked up its own key
+in _precompile and stored the data on itself, and ran whether or not its key was present. Both run the same keyword
+bodies, so only the dispatch differs.
+
+Usage, from the repository root: PYTHONPATH=. python benchmarks/bench_keyword_dispatch.py [num_schemas]
+"""
+
+import gc
+import sys
+import time
+
+from skeema.intermediate import ClassContext, CompilationContext, Representation
+from skeema.schema import KeywordCompilationException
+from skeema.schema.json import SchemaManager
+from skeema.schema.json.compiler import Compiler
+
+
+def create_schemas(count: int):
+    manager = SchemaManager()
+    definitions = (
+        {"type": "string"},
+        {"type": "integer", "title": "Count", "description": "A count"},
+        {"type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]},
+    )
+    schemas = [
+        manager.create_schema(f'schemas/schema{i}.json', f'BenchSchema{i}', definitions[i % len(definitions)])
+        for i in range(count)
+    ]
+    for schema in schemas:
+        schema.populate(CompilationContext())
+    return schemas
+
+
+class LegacyKeyword:
+    """
+    The previous keyword protocol, running the body of a current keyword
+    """
+
+    def __init__(self, keyword):
+        self.keyword = keyword
+        self.data = None
+        self.error_message = None
+
+    @property
+    def key(self):
+        return self.keyword.key
+
+    def compile(self, schema, class_context, compilation_context):
+        self._precompile(schema)
+        if self.data:
+            try:
+                return self.keyword._compile(schema, self.data, class_context, compilation_context)
+            except KeywordCompilationException as exception:
+                self.error_message = exception.error_message
+                return False
+        else:
+            return False
+
+    def _precompile(self, schema):
+        data = schema.key_value_definition
+        if self.key in data:
+            self.data = data[self.key]
+
+
+def legacy_get_compilation_keys(keyword_classes):
+    return [LegacyKeyword(keyword_class()) for keyword_class in keyword_classes]
+
+
+def legacy_compile(keyword_classes, schema, compilation_context: CompilationContext) -> None:
+    class_name = schema.class_name
+    class_context = ClassContext(class_name)
+    compilation_keys = legacy_get_compilation_keys(keyword_classes)
+    compiled_keys = dict()
+    for compilation_key in compilation_keys:
+        compiled = compilation_key.compile(schema, class_context, compilation_context)
+        if compiled:
+            compiled_keys[compilation_key.key] = compilation_key
+        else:
+            if compilation_key.error_message is not None:
+                print(
+                    f"Warning during schema compilation for {schema.class_name} - "
+                    f"compilation key \"{compilation_key.key}\" failed to compile:\n"
+                    f"{compilation_key.error_message}")
+
+    representation = Representation(
+        class_name, class_context.base_classes, class_context.constructor_parameters, class_context.data_members
+    )
+    compilation_context.register_representation(class_name, representation)
+
+
+def measure(name: str, compile_schema, schemas, repeat: int = 5) -> None:
+    # Report the best of several runs with the garbage collector paused, to keep allocation noise out of the overhead
+    elapsed = float('inf')
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            compilation_context = CompilationContext()
+            start = time.perf_counter()
+            for schema in schemas:
+                compile_schema(schema, compilation_context)
+            elapsed = min(elapsed, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    print(f"{name:<10} schemas={len(schemas):>7} total={elapsed:>8.4f}s per_schema={elapsed / len(schemas) * 1e6:>7.2f}us")
+
+
+def run(count: int) -> None:
+    compiler = Compiler()
+    schemas = create_schemas(count)
+    measure('dispatch', compiler.compile, schemas)
+    keyword_classes = [type(keyword) for keyword in compiler.keyword_registry.keywords]
+    measure('legacy', lambda schema, context: legacy_compile(keyword_classes, schema, context), schemas)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -3,3 +3,4 @@ from .container import Container
 from .handle import Handle, INVALID_HANDLE
 from .proxy_container import ProxyContainer
 from .handle_manager import HandleManager
+from .compact_handle_manager import CompactHandleManager
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from array import array
+
+from .handle import Handle, INVALID_HANDLE
+from .handle import (
+    HandleInvalidException,
+    HandleOutOfRangeException,
+    HandleIsInactiveException,
+    HandleIsRetiredException
+)
+from .handle_manager import HandleEntry, HandleManager
+
+
+class CompactHandleManager(HandleManager):
+    """
+    Compact Handle Manager
+
+    Stores entry generations in an unsigned int array and entry active flags in a bitset, rather than one HandleEntry
+    object per entry. Generations wrap around after 2**32 - 1, skipping the zeroth generation.
+    """
+
+    GENERATION_TYPECODE = 'I'
+
+    def __init__(self, thread_safe: bool = False) -> None:
+        super().__init__(thread_safe)
+        self._generations: array = array(CompactHandleManager.GENERATION_TYPECODE)
+        self._active_flags: bytearray = bytearray()
+        self._max_generation: int = (1 << (8 * self._generations.itemsize)) - 1
+
+    @property
+    def num_entries(self) -> int:
+        return len(self._generations)
+
+    def _is_active(self, index: int) -> bool:
+        return (self._active_flags[index >> 3] >> (index & 7)) & 1 == 1
+
+    def _set_active(self, index: int) -> None:
+        self._active_flags[index >> 3] |= 1 << (index & 7)
+
+    def _set_inactive(self, index: int) -> None:
+        self._active_flags[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def issue_handle(self) -> Handle:
+        """
+        Issue a new handle for this manager.
+        Inactive entries are reused before the storage arrays are grown.
+        :return: The newly issued handle
+        """
+
+        with self._lock:
+            if self._free_indices:
+                index: int = self._free_indices.pop()
+            else:
+                index: int = len(self._generations)
+                self._generations.append(self._generation_floor)
+                # Grow the bitset one byte for every eight entries
+                if index & 7 == 0:
+                    self._active_flags.append(0)
+
+            generation: int = self._generations[index] + 1
+            if generation > self._max_generation:
+                generation = 1
+            self._generations[index] = generation
+            self._set_active(index)
+            self._num_active_handles += 1
+            handle: Handle = Handle(index, generation)
+
+        return handle
+
+    def remove_handle(self, handle: Handle) -> None:
+        """
+        Removes control of the given handle from this manager.
+        :param handle: The handle to be removed
+        :return: None
+        """
+
+        with self._lock:
+            self.validate_handle(handle)
+            index: int = handle.index
+            self._set_inactive(index)
+            self._free_indices.append(index)
+            self._num_active_handles -= 1
+
+    def remove_all_handles(self) -> None:
+        """
+        Removes control of all handles issued by this manager.
+        :return: None
+        """
+
+        with self._lock:
+            self._num_active_handles = 0
+            self._active_flags = bytearray(len(self._active_flags))
+            self._free_indices = list(reversed(range(len(self._generations))))
+
+    def compact(self) -> int:
+        """
+        Reclaims the inactive entries at the end of the storage arrays.
+        :return: The number of entries reclaimed
+        """
+
+        with self._lock:
+            num_entries: int = len(self._generations)
+            num_kept_entries: int = num_entries
+            while num_kept_entries > 0 and not self._is_active(num_kept_entries - 1):
+                num_kept_entries -= 1
+                self._generation_floor = max(self._generation_floor, self._generations[num_kept_entries])
+
+            if num_kept_entries == num_entries:
+                return 0
+
+            del self._generations[num_kept_entries:]
+            del self._active_flags[(num_kept_entries + 7) >> 3:]
+            self._free_indices = [index for index in self._free_indices if index < num_kept_entries]
+            return num_entries - num_kept_entries
+
+    def is_valid(self, handle: Handle) -> bool:
+        index: int = handle.index
+        if index < 0 or index >= len(self._generations):
+            return False
+
+        return self._is_active(index) and self._generations[index] == handle.generation
+
+    def validate_handle(self, handle: Handle) -> None:
+        handle_is_valid: bool = handle != INVALID_HANDLE
+        if not handle_is_valid:
+            raise HandleInvalidException(self, handle)
+
+        index: int = handle.index
+        index_is_in_range: bool = index < self.num_entries
+        if not index_is_in_range:
+            raise HandleOutOfRangeException(self, handle)
+
+        handle_is_active: bool = self._is_active(index)
+        if not handle_is_active:
+            raise HandleIsInactiveException(self, handle)
+
+        generation: int = self._generations[index]
+        correct_generation: bool = generation == handle.generation
+        if not correct_generation:
+            # Build an entry snapshot for the exception message
+            entry: HandleEntry = HandleEntry()
+            entry.active = True
+            entry.generation = generation
+            raise HandleIsRetiredException(self, handle, entry)
@@ -34,6 +34,12 @@ class Compilable(Dependency, metaclass=ABCMeta):
     def compiled(self) -> bool:
         return self._compiled
 
+    def _set_compiled(self) -> None:
+        self._compiled = True
+
+    def _set_uncompiled(self) -> None:
+        self._compiled = False
+
     def _precompile(self, compilation_context: CompilationContext) -> None:
         pass
 
@@ -50,6 +56,6 @@ class Compilable(Dependency, metaclass=ABCMeta):
 
         self._precompile(compilation_context)
         self._compile(compilation_context)
-        self._compiled = True
+        self._set_compiled()
 
         return compilation_context
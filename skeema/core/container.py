@@ -1,54 +1,152 @@
 from __future__ import annotations
 
+from contextlib import nullcontext
+from threading import Lock
 from typing import TYPE_CHECKING
 
+from skeema.core.dependency import DependencyStore
 from skeema.core.handle import INVALID_HANDLE
 from skeema.core.proxy_container import ProxyContainer
 
 if TYPE_CHECKING:
-    from typing import Any, Dict
+    from typing import Any, ContextManager, Dict, Iterable, List, Tuple
 
     from skeema.core import Handle
+    from skeema.core.handle_manager import HandleManager
 
     IdToHandleMap = Dict[str, Handle]
+    IdToPositionMap = Dict[str, int]
 
 
 class Container:
     """
     Container
+
+    A thread safe container makes adding and removing objects atomic, so concurrent registration of the same id adds
+    the object only once.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, handle_manager: HandleManager = None, thread_safe: bool = False) -> None:
+        self._lock: ContextManager = Lock() if thread_safe else nullcontext()
+
         # Storage for object references added to the container to preserve their lifetimes
         self._objects: [Any] = []
-        self._proxy_container: ProxyContainer = ProxyContainer()
+        # Ids of the stored objects, parallel to the object storage
+        self._object_ids: [str] = []
+        self._proxy_container: ProxyContainer = ProxyContainer(handle_manager, thread_safe)
 
         # Mapping of ids to handles
         self._id_to_object_handle_map: IdToHandleMap = {}
+        # Mapping of ids to positions in the object storage
+        self._id_to_object_position_map: IdToPositionMap = {}
+
+        # Dependency graph shared by the objects in this container, indexed by handle index
+        self._dependency_store: DependencyStore = DependencyStore()
+
+    @property
+    def dependency_store(self) -> DependencyStore:
+        return self._dependency_store
+
+    @property
+    def objects(self) -> List[Any]:
+        return list(self._objects)
 
     def add_object(self, obj_id: str, obj: Any, obj_debug_name: str) -> Handle:
-        # Do not add duplicate resources
-        if obj_id in self._id_to_object_handle_map:
-            return INVALID_HANDLE
+        with self._lock:
+            # Do not add duplicate resources
+            if obj_id in self._id_to_object_handle_map:
+                return INVALID_HANDLE
 
-        handle: Handle = self._proxy_container.add_object(obj)
-        obj.on_add_to_container(handle, obj_debug_name)
-        self._id_to_object_handle_map[obj_id] = handle
-        self._objects.append(obj)
+            handle: Handle = self._proxy_container.add_object(obj)
+            obj.on_add_to_container(handle, obj_debug_name, self._dependency_store)
+            self._id_to_object_handle_map[obj_id] = handle
+            self._id_to_object_position_map[obj_id] = len(self._objects)
+            self._objects.append(obj)
+            self._object_ids.append(obj_id)
 
         return handle
 
+    def add_objects(self, objects: Iterable[Tuple[str, Any, str]]) -> List[Handle]:
+        """
+        Adds a batch of objects, taking the lock once.
+        :param objects: The id, object and debug name of each object to add
+        :return: The handle of each object, or an invalid handle if its id was already added
+        """
+
+        handles: List[Handle] = []
+        with self._lock:
+            for obj_id, obj, obj_debug_name in objects:
+                # Do not add duplicate resources
+                if obj_id in self._id_to_object_handle_map:
+                    handles.append(INVALID_HANDLE)
+                    continue
+
+                handle: Handle = self._proxy_container.add_object(obj)
+                obj.on_add_to_container(handle, obj_debug_name, self._dependency_store)
+                self._id_to_object_handle_map[obj_id] = handle
+                self._id_to_object_position_map[obj_id] = len(self._objects)
+                self._objects.append(obj)
+                self._object_ids.append(obj_id)
+                handles.append(handle)
+
+        return handles
+
+    def remove_object(self, obj_id: str) -> bool:
+        """
+        Removes the object with the given id, retiring its handle.
+        :param obj_id: The id of the object to remove
+        :return: True if an object was removed
+        """
+
+        with self._lock:
+            if obj_id not in self._id_to_object_handle_map:
+                return False
+
+            handle: Handle = self._id_to_object_handle_map.pop(obj_id)
+            self._proxy_container.remove(handle)
+            self._dependency_store.remove_node(handle.index)
+
+            # Swap the last stored object into the vacated position
+            position: int = self._id_to_object_position_map.pop(obj_id)
+            last_obj: Any = self._objects.pop()
+            last_obj_id: str = self._object_ids.pop()
+            if position < len(self._objects):
+                self._objects[position] = last_obj
+                self._object_ids[position] = last_obj_id
+                self._id_to_object_position_map[last_obj_id] = position
+
+        return True
+
+    def compact(self) -> int:
+        """
+        Reclaims the free slots left at the end of the container by removed objects.
+        :return: The number of slots reclaimed
+        """
+
+        with self._lock:
+            num_reclaimed_slots: int = self._proxy_container.compact()
+            self._dependency_store.truncate(self._proxy_container.num_slots)
+        return num_reclaimed_slots
+
     def get_object_handle(self, obj_id: str) -> Handle:
-        if obj_id in self._id_to_object_handle_map:
-            return self._id_to_object_handle_map[obj_id]
-        else:
-            return INVALID_HANDLE
+        return self._id_to_object_handle_map.get(obj_id, INVALID_HANDLE)
+
+    def is_valid(self, handle: Handle) -> bool:
+        return self._proxy_container.is_valid(handle)
 
     def get_object(self, handle: Handle) -> Any:
         resource: Any = self._proxy_container.get(handle)
         return resource
 
+    def get_objects(self, handles: Iterable[Handle]) -> List[Any]:
+        resources: List[Any] = self._proxy_container.get_many(handles)
+        return resources
+
     def clear(self) -> None:
-        self._objects.clear()
-        self._proxy_container.clear()
-        self._id_to_object_handle_map.clear()
+        with self._lock:
+            self._objects.clear()
+            self._object_ids.clear()
+            self._proxy_container.clear()
+            self._id_to_object_handle_map.clear()
+            self._id_to_object_position_map.clear()
+            self._dependency_store.clear()
@@ -1,3 +1,9 @@
 from .dependency import Dependency, DependencyHasNoNodeException
-from .dependency_graph import CircularDependencyException
+from .dependency_graph import (
+    CircularDependencyException,
+    DependencyGraph,
+    ForeignDependencyException
+)
 from .dependency_node import DependencyNode
+from .dependency_store import DependencyStore
+from .dependency_analysis import DependencyAnalysis
@@ -3,6 +3,7 @@ from __future__ import annotations
 from abc import ABCMeta
 
 from .dependency_node import DependencyNode
+from .dependency_store import DependencyStore
 from ..handle import Handle
 
 
@@ -26,5 +27,8 @@ class Dependency(metaclass=ABCMeta):
     def dependency_node(self) -> DependencyNode:
         return self._dependency_node
 
-    def on_add_to_container(self, handle: Handle, debug_name: str) -> None:
-        self._dependency_node = DependencyNode(handle, debug_name)
+    def on_add_to_container(self, handle: Handle, debug_name: str, dependency_store: DependencyStore = None) -> None:
+        # Without a shared store, the dependency can only depend on itself
+        if dependency_store is None:
+            dependency_store = DependencyStore()
+        self._dependency_node = dependency_store.add_node(handle, debug_name)
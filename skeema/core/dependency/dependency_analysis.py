@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Set, Tuple
+
+    from .dependency_node import DependencyNodeList
+    from .dependency_store import DependencyStore
+
+    IndexList = List[int]
+    NameToWeightMap = Dict[str, float]
+
+
+class DependencyAnalysis:
+    """
+    Dependency analysis
+
+    Metrics over every node of a DependencyStore:
+
+        fan_in:         The number of nodes which depend directly on the node
+        fan_out:        The number of direct dependencies of the node
+        depth:          The number of edges on the longest path from the node to a node without dependencies
+        dependents:     The number of nodes which depend on the node directly or transitively, i.e. the number of nodes
+                        invalidated by a change to it
+        critical_path:  The highest total weight of a path ending at the node, including the node itself. A node
+                        cannot finish compiling before this, however many nodes compile in parallel.
+
+    Each node weighs 1 unless a weight is given for its debug name, such as a compile time measured by a profiling
+    CompilationContext. The graph must not contain cycles. Repeated edges between the same two nodes, e.g. from two
+    references to the same schema, count once.
+    """
+
+    def __init__(self, store: DependencyStore, weights: NameToWeightMap = None) -> None:
+        self._store: DependencyStore = store
+        self._weights: NameToWeightMap = weights if weights is not None else {}
+
+        self._indices: IndexList = store.topological_order()
+        # Distinct dependencies and dependents of each node, in edge order
+        self._dependency_indices: Dict[int, IndexList] = {
+            index: list(dict.fromkeys(store.dependency_indices(index))) for index in self._indices
+        }
+        self._dependent_indices: Dict[int, IndexList] = {
+            index: list(dict.fromkeys(store.dependent_indices(index))) for index in self._indices
+        }
+        self._fan_in: Dict[int, int] = {}
+        self._fan_out: Dict[int, int] = {}
+        self._depth: Dict[int, int] = {}
+        self._critical_path: Dict[int, float] = {}
+        # The dependency on the heaviest path to each node, used to reconstruct the critical path
+        self._critical_dependency: Dict[int, int] = {}
+        self._dependents: Dict[int, int] = {}
+        self._analyze()
+
+    @property
+    def critical_path_length(self) -> float:
+        return max(self._critical_path.values(), default=0)
+
+    def weight(self, index: int) -> float:
+        return self._weights.get(self._store.debug_name(index), 1)
+
+    def critical_path(self) -> DependencyNodeList:
+        """
+        :return: The nodes of the heaviest path in the graph, from its first dependency to its last dependent
+        """
+
+        if not self._critical_path:
+            return []
+
+        index: int = max(self._indices, key=self._critical_path.__getitem__)
+        path: IndexList = [index]
+        while index in self._critical_dependency:
+            index = self._critical_dependency[index]
+            path.append(index)
+        return [self._store.node(index) for index in reversed(path)]
+
+    def most_invalidating(self, count: int = 10) -> DependencyNodeList:
+        """
+        :return: The nodes with the most transitive dependents, most first
+        """
+
+        indices: IndexList = sorted(self._indices, key=lambda index: (-self._dependents[index], index))
+        return [self._store.node(index) for index in indices[:count]]
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                'name': self._store.debug_name(index),
+                'fan_in': self._fan_in[index],
+                'fan_out': self._fan_out[index],
+                'depth': self._depth[index],
+                'dependents': self._dependents[index],
+                'weight': self.weight(index),
+                'critical_path': self._critical_path[index]
+            }
+            for index in self._indices
+        ]
+
+    def to_json(self) -> str:
+        store: DependencyStore = self._store
+        graph = {
+            'nodes': self.metrics(),
+            'edges': [
+                {'from': store.debug_name(index), 'to': store.debug_name(dependency)}
+                for index in self._indices for dependency in self._dependency_indices[index]
+            ],
+            'critical_path': [node.debug_name for node in self.critical_path()],
+            'critical_path_length': self.critical_path_length
+        }
+        return json.dumps(graph, indent=2)
+
+    def to_dot(self) -> str:
+        """
+        :return: The graph in Graphviz DOT format, with edges pointing from each node to its dependencies and the
+                 critical path highlighted
+        """
+
+        store: DependencyStore = self._store
+        critical_path: IndexList = [node.index for node in self.critical_path()]
+        critical_indices: Set[int] = set(critical_path)
+        # Edges of the critical path, from each node to the dependency before it on the path
+        critical_edges: Set[Tuple[int, int]] = set(zip(critical_path[1:], critical_path))
+
+        def quote(name: str) -> str:
+            return json.dumps(name)
+
+        lines: List[str] = ['digraph dependencies {']
+        for index in self._indices:
+            label: str = f"{store.debug_name(index)}\ndependents={self._dependents[index]} depth={self._depth[index]}"
+            style: str = ', color=red' if index in critical_indices else ''
+            lines.append(f'  {quote(store.debug_name(index))} [label={quote(label)}{style}];')
+        for index in self._indices:
+            for dependency in self._dependency_indices[index]:
+                style: str = ' [color=red]' if (index, dependency) in critical_edges else ''
+                lines.append(f'  {quote(store.debug_name(index))} -> {quote(store.debug_name(dependency))}{style};')
+        lines.append('}')
+        return '\n'.join(lines)
+
+    def _analyze(self) -> None:
+        # Dependencies before dependents
+        for index in self._indices:
+            dependencies: IndexList = self._dependency_indices[index]
+            self._fan_out[index] = len(dependencies)
+            self._depth[index] = max((self._depth[d] + 1 for d in dependencies), default=0)
+
+            critical_dependency: int = max(dependencies, key=self._critical_path.__getitem__, default=None)
+            if critical_dependency is None:
+                self._critical_path[index] = self.weight(index)
+            else:
+                self._critical_dependency[index] = critical_dependency
+                self._critical_path[index] = self._critical_path[critical_dependency] + self.weight(index)
+
+        # Dependents before dependencies. The transitive dependents of each node are gathered as a bitset of indices.
+        # A bitset is dropped once every dependency of its node has merged it, so only the sets of the nodes still
+        # waiting for a dependency are kept, rather than one for every node.
+        dependent_sets: Dict[int, int] = {}
+        num_unmerged_dependencies: Dict[int, int] = {}
+        for index in reversed(self._indices):
+            dependents: IndexList = self._dependent_indices[index]
+            self._fan_in[index] = len(dependents)
+            dependent_set: int = 0
+            for dependent in dependents:
+                dependent_set |= dependent_sets[dependent] | (1 << dependent)
+                num_unmerged_dependencies[dependent] -= 1
+                if num_unmerged_dependencies[dependent] == 0:
+                    del dependent_sets[dependent]
+                    del num_unmerged_dependencies[dependent]
+
+            self._dependents[index] = bin(dependent_set).count('1')
+            if self._fan_out[index]:
+                dependent_sets[index] = dependent_set
+                num_unmerged_dependencies[index] = self._fan_out[index]
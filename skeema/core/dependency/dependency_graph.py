@@ -3,7 +3,10 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from typing import Dict, Iterator, List, Set, Tuple
+
     from .dependency_node import DependencyNode, DependencyNodeList
+    from .dependency_store import DependencyStore
 
 
 class CircularDependencyException(Exception):
@@ -12,6 +15,13 @@ class CircularDependencyException(Exception):
         super().__init__(msg)
 
 
+class ForeignDependencyException(Exception):
+    def __init__(self, node_a: DependencyNode, node_b: DependencyNode):
+        msg = f"Cannot add a dependency between {node_a.debug_name} and {node_b.debug_name}. " \
+              f"They are stored in different dependency stores. Were they added to the same container?"
+        super().__init__(msg)
+
+
 class DependencyGraph:
     """
     Dependency graph
@@ -21,22 +31,123 @@ class DependencyGraph:
         self._root_node = root_node
 
     def resolve_dependencies(self) -> DependencyNodeList:
+        root_node: DependencyNode = self._root_node
+        store: DependencyStore = root_node.store
+
+        cached_resolution: List[int] = store.cached_resolution(root_node.index)
+        if cached_resolution is not None:
+            return [store.node(index) for index in cached_resolution]
+
         resolved = []
-        DependencyGraph.dependency_resolve(self._root_node, resolved)
+        DependencyGraph.dependency_resolve(root_node, resolved)
+        store.cache_resolution(root_node.index, [node.index for node in resolved])
         return resolved
 
     @staticmethod
-    def dependency_resolve(node: DependencyNode, resolved: DependencyNodeList, unresolved: DependencyNodeList = None):
-        if unresolved is None:
-            unresolved = []
+    def dependency_resolve(node: DependencyNode, resolved: DependencyNodeList) -> None:
+        """
+        Appends the dependencies of the node to resolved in depth first post-order, followed by the node itself.
+        Uses an explicit stack, so the depth of the graph is not limited by the recursion limit. Dependencies with a
+        cached resolved order are spliced in without being traversed again.
+
+        :raises CircularDependencyException: If a circular dependency is reachable from the node
+        """
+
+        store: DependencyStore = node.store
+        # Nodes of one graph share a store, so they are identified by their index
+        resolved_ids: Set[int] = {resolved_node.index for resolved_node in resolved}
+        unresolved_ids: Set[int] = {node.index}
+        stack: List[Tuple[DependencyNode, Iterator[DependencyNode]]] = [(node, iter(node.dependency_nodes))]
+
+        while stack:
+            current, dependencies = stack[-1]
+            for dependency in dependencies:
+                if dependency.index not in resolved_ids:
+                    if dependency.index in unresolved_ids:
+                        raise CircularDependencyException(current, dependency)
+
+                    cached_resolution: List[int] = store.cached_resolution(dependency.index)
+                    if cached_resolution is not None:
+                        # Every node resolved so far has all of its own dependencies resolved, so skipping them keeps
+                        # the same order as traversing the dependency again
+                        for index in cached_resolution:
+                            if index in unresolved_ids:
+                                raise CircularDependencyException(dependency, store.node(index))
+                            if index not in resolved_ids:
+                                resolved.append(store.node(index))
+                                resolved_ids.add(index)
+                        continue
+
+                    unresolved_ids.add(dependency.index)
+                    stack.append((dependency, iter(dependency.dependency_nodes)))
+                    break
+            else:
+                # All dependencies of the current node are resolved
+                stack.pop()
+                resolved.append(current)
+                resolved_ids.add(current.index)
+                unresolved_ids.remove(current.index)
+
+    @staticmethod
+    def strongly_connected_components(store: DependencyStore) -> List[DependencyNodeList]:
+        """
+        Finds the strongly connected components of every node in the store, using Tarjan's algorithm with an explicit
+        stack. Each component is ordered by node index. Components are returned with dependencies before dependents.
+        """
+
+        visit_indices: Dict[int, int] = {}
+        low_links: Dict[int, int] = {}
+        component_stack: List[int] = []
+        on_component_stack: Set[int] = set()
+        components: List[DependencyNodeList] = []
 
-        unresolved.append(node)
+        for root in store.node_indices:
+            if root in visit_indices:
+                continue
 
-        for dependency in node.dependency_nodes:
-            if dependency not in resolved:
-                if dependency in unresolved:
-                    raise CircularDependencyException(node, dependency)
-                DependencyGraph.dependency_resolve(dependency, resolved, unresolved)
+            visit_indices[root] = low_links[root] = len(visit_indices)
+            component_stack.append(root)
+            on_component_stack.add(root)
+            stack: List[Tuple[int, Iterator[int]]] = [(root, iter(store.dependency_indices(root)))]
+
+            while stack:
+                current, dependencies = stack[-1]
+                for dependency in dependencies:
+                    if dependency not in visit_indices:
+                        visit_indices[dependency] = low_links[dependency] = len(visit_indices)
+                        component_stack.append(dependency)
+                        on_component_stack.add(dependency)
+                        stack.append((dependency, iter(store.dependency_indices(dependency))))
+                        break
+                    elif dependency in on_component_stack:
+                        low_links[current] = min(low_links[current], visit_indices[dependency])
+                else:
+                    stack.pop()
+                    if stack:
+                        parent: int = stack[-1][0]
+                        low_links[parent] = min(low_links[parent], low_links[current])
+
+                    # The current node is the root of a component
+                    if low_links[current] == visit_indices[current]:
+                        component: List[int] = []
+                        while True:
+                            index: int = component_stack.pop()
+                            on_component_stack.remove(index)
+                            component.append(index)
+                            if index == current:
+                                break
+                        components.append([store.node(index) for index in sorted(component)])
+
+        return components
+
+    @staticmethod
+    def find_cycles(store: DependencyStore) -> List[DependencyNodeList]:
+        """
+        Finds every circular dependency in the store in a single linear pass.
+        :return: The nodes of each cycle, as the strongly connected components containing a cycle
+        """
 
-        resolved.append(node)
-        unresolved.remove(node)
+        return [
+            component for component in DependencyGraph.strongly_connected_components(store)
+            if len(component) > 1 or component[0] in component[0].dependency_nodes
+        ]
@@ -2,38 +2,79 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, List
 
-from .dependency_graph import DependencyGraph
+from .dependency_graph import DependencyGraph, ForeignDependencyException
 
 if TYPE_CHECKING:
+    from typing import Any
+
     from ..handle import Handle
+    from .dependency_store import DependencyStore
 
 
 class DependencyNode:
-    def __init__(self, handle: Handle, debug_name: str) -> None:
-        self._handle = handle
-        self._debug_name = debug_name
-        self._dependency_nodes = []
-        self._graph = DependencyGraph(self)
+    """
+    Dependency node
+
+    A view of one node of a DependencyStore. Views are created on demand, and views of the same node compare equal.
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: DependencyStore, index: int) -> None:
+        self._store: DependencyStore = store
+        self._index: int = index
+
+    @property
+    def store(self) -> DependencyStore:
+        return self._store
+
+    @property
+    def index(self) -> int:
+        return self._index
 
     @property
     def handle(self) -> Handle:
-        return self._handle
+        return self._store.handle(self._index)
 
     @property
     def debug_name(self) -> str:
-        return self._debug_name
+        return self._store.debug_name(self._index)
 
     @property
     def dependency_nodes(self) -> DependencyNodeList:
-        return self._dependency_nodes
+        store: DependencyStore = self._store
+        return [DependencyNode(store, index) for index in store.dependency_indices(self._index)]
+
+    @property
+    def dependent_nodes(self) -> DependencyNodeList:
+        store: DependencyStore = self._store
+        return [DependencyNode(store, index) for index in store.dependent_indices(self._index)]
+
+    @property
+    def order(self) -> int:
+        return self._store.order(self._index)
 
     def add_dependency(self, node: DependencyNode) -> None:
-        self._dependency_nodes.append(node)
-        # Resolve dependencies iteratively to catch any circular dependencies
-        self._graph.resolve_dependencies()
+        if node._store is not self._store:
+            raise ForeignDependencyException(self, node)
+        self._store.add_edge(self._index, node._index)
+
+    def remove_dependencies(self) -> None:
+        self._store.remove_dependencies(self._index)
 
     def resolve_dependencies(self) -> DependencyNodeList:
-        return self._graph.resolve_dependencies()
+        return DependencyGraph(self).resolve_dependencies()
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, DependencyNode):
+            return NotImplemented
+        return self._store is other._store and self._index == other._index
+
+    def __hash__(self) -> int:
+        return hash(self._index)
+
+    def __repr__(self) -> str:
+        return f"DependencyNode({self.debug_name!r})"
 
 
 DependencyNodeList = List[DependencyNode]
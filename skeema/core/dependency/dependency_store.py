@@ -0,0 +1,518 @@
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from .dependency_graph import CircularDependencyException
+from .dependency_node import DependencyNode
+
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Set, Tuple
+
+    from ..handle import Handle
+
+    IndexList = List[int]
+    PendingEdgeMap = Dict[int, IndexList]
+    ResolutionCache = OrderedDict[int, Tuple[int, array]]
+
+
+class DependencyStore:
+    """
+    Dependency Store
+
+    Graph wide storage for the nodes of one container, indexed by handle index. Edges are kept in compressed sparse
+    row form in both directions: the dependencies of the node at index i are
+    dependency_targets[dependency_offsets[i]:dependency_offsets[i + 1]], and likewise for its dependents.
+
+    New edges are collected in per node pending lists, which build() merges into the compressed arrays in bulk. This
+    happens automatically once the pending edges outnumber the built ones, so adding an edge is amortized O(1).
+    Removed nodes, and nodes whose dependencies are removed, are likewise only marked, and their built edges are
+    skipped until build() drops them. Removing a node or its dependencies costs as much as its pending edges, however
+    large the graph.
+
+    The store also keeps the topological position of each node, which add_edge maintains with the dynamic topological
+    sort of Pearce and Kelly to catch circular dependencies as soon as they are added. Cycle detection can be turned
+    off to collect a whole graph, cycles included, for analysis with DependencyGraph.find_cycles.
+
+    Resolved dependency orders are cached per node, stamped with the store version. Adding an edge bumps the version
+    and records it as the edge version of the node the edge starts from. A cached order is still valid while no node in
+    it has a newer edge version than its stamp, i.e. no edge was added in the reachable subgraph. Removing a node or its
+    dependencies records a new edge version for it too, invalidating the orders that contain it. The cache is bounded
+    by the total number of cached indices, evicting the least recently used orders first.
+    """
+
+    INDEX_TYPECODE = 'I'
+    ORDER_TYPECODE = 'q'
+    MIN_PENDING_EDGES_TO_BUILD = 1024
+    MIN_CLEARED_NODES_TO_BUILD = 1024
+    MAX_CACHED_RESOLUTION_INDICES = 1 << 20
+
+    def __init__(self, detect_cycles: bool = True) -> None:
+        self._detect_cycles: bool = detect_cycles
+
+        # Node data, indexed by handle index. Removed nodes have no handle.
+        self._handles: List[Handle] = []
+        self._debug_names: List[str] = []
+        # Position of each node in a topological order where every node comes after its dependencies
+        self._orders: array = array(DependencyStore.ORDER_TYPECODE)
+        self._next_order: int = 0
+        # Store version when an edge was last added from each node
+        self._edge_versions: array = array(DependencyStore.ORDER_TYPECODE)
+        self._version: int = 0
+
+        self._resolutions: ResolutionCache = OrderedDict()
+        self._num_cached_resolution_indices: int = 0
+
+        self._dependency_offsets: array = array(DependencyStore.INDEX_TYPECODE, [0])
+        self._dependency_targets: array = array(DependencyStore.INDEX_TYPECODE)
+        self._dependent_offsets: array = array(DependencyStore.INDEX_TYPECODE, [0])
+        self._dependent_targets: array = array(DependencyStore.INDEX_TYPECODE)
+
+        self._pending_dependencies: PendingEdgeMap = {}
+        self._pending_dependents: PendingEdgeMap = {}
+        self._num_pending_edges: int = 0
+
+        # Nodes removed since the last build, whose built edges are skipped until build() drops them
+        self._removed_indices: Set[int] = set()
+        # Nodes whose built dependencies are skipped until build() drops them, i.e. removed nodes and nodes whose
+        # dependencies were removed since the last build
+        self._cleared_indices: Set[int] = set()
+        self._num_dropped_edges: int = 0
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self._handles)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self._dependency_targets) - self._num_dropped_edges + self._num_pending_edges
+
+    @property
+    def num_pending_edges(self) -> int:
+        return self._num_pending_edges
+
+    @property
+    def node_indices(self) -> IndexList:
+        return [index for index, handle in enumerate(self._handles) if handle is not None]
+
+    @property
+    def detect_cycles(self) -> bool:
+        return self._detect_cycles
+
+    @detect_cycles.setter
+    def detect_cycles(self, detect_cycles: bool) -> None:
+        """
+        Turning cycle detection back on recomputes the topological order of the whole graph.
+        :raises CircularDependencyException: If the graph contains a cycle. Cycle detection stays off.
+        """
+
+        if detect_cycles and not self._detect_cycles:
+            self._reorder()
+        self._detect_cycles = detect_cycles
+
+    def add_node(self, handle: Handle, debug_name: str) -> DependencyNode:
+        index: int = handle.index
+        num_missing_nodes: int = index + 1 - len(self._handles)
+        if num_missing_nodes > 0:
+            self._handles.extend([None] * num_missing_nodes)
+            self._debug_names.extend([''] * num_missing_nodes)
+            self._orders.extend([0] * num_missing_nodes)
+            self._edge_versions.extend([0] * num_missing_nodes)
+
+        self._handles[index] = handle
+        self._debug_names[index] = debug_name
+        # A new node has no edges, so any unused position is valid
+        self._orders[index] = self._next_order
+        self._next_order += 1
+
+        return DependencyNode(self, index)
+
+    def remove_node(self, index: int) -> None:
+        """
+        Removes the node at the given index, along with all edges to and from it. Its built edges are dropped by the
+        next build, which happens automatically once enough nodes have been removed.
+        """
+
+        if index >= len(self._handles) or self._handles[index] is None:
+            return
+
+        self._handles[index] = None
+        self._debug_names[index] = ''
+
+        # Count the built edges before marking the node, as marking hides them. A self edge is counted once.
+        built_dependents: IndexList = self._built_dependent_indices(index)
+        self._num_dropped_edges += len(self._built_dependency_indices(index))
+        self._num_dropped_edges += sum(1 for i in built_dependents if i != index)
+        self._removed_indices.add(index)
+        self._cleared_indices.add(index)
+
+        pending_dependencies: IndexList = DependencyStore._remove_pending_edges(
+            index, self._pending_dependencies, self._pending_dependents
+        )
+        pending_dependents: IndexList = DependencyStore._remove_pending_edges(
+            index, self._pending_dependents, self._pending_dependencies
+        )
+        self._num_pending_edges -= len(pending_dependencies) + sum(1 for i in pending_dependents if i != index)
+
+        # Invalidate the cached orders that contain the node
+        self._version += 1
+        self._edge_versions[index] = self._version
+        self._uncache_resolution(index)
+        self._build_if_cleared()
+
+    def remove_dependencies(self, index: int) -> None:
+        """
+        Removes the edges from the node at the given index to its dependencies, keeping the node and its dependents.
+        Its built edges are dropped by the next build, which happens automatically once enough nodes have been cleared.
+        Removing edges never invalidates the topological order, so the order is kept as is.
+        """
+
+        built_dependencies: IndexList = self._built_dependency_indices(index)
+        pending_dependencies: IndexList = DependencyStore._remove_pending_edges(
+            index, self._pending_dependencies, self._pending_dependents
+        )
+        if not built_dependencies and not pending_dependencies:
+            return
+
+        if built_dependencies:
+            self._num_dropped_edges += len(built_dependencies)
+            self._cleared_indices.add(index)
+        self._num_pending_edges -= len(pending_dependencies)
+
+        # Invalidate the cached orders that pass through the node
+        self._version += 1
+        self._edge_versions[index] = self._version
+        self._build_if_cleared()
+
+    def _build_if_cleared(self) -> None:
+        if len(self._cleared_indices) >= max(DependencyStore.MIN_CLEARED_NODES_TO_BUILD, len(self._handles) // 2):
+            self.build()
+
+    @staticmethod
+    def _remove_pending_edges(
+            index: int,
+            pending_edges: PendingEdgeMap,
+            reverse_pending_edges: PendingEdgeMap
+    ) -> IndexList:
+        """
+        Removes the pending edges of the node at index from both directions.
+        :return: The other ends of the removed edges
+        """
+
+        targets: IndexList = pending_edges.pop(index, [])
+        for target in set(targets):
+            if target == index:
+                continue
+            reverse_targets: IndexList = [i for i in reverse_pending_edges[target] if i != index]
+            if reverse_targets:
+                reverse_pending_edges[target] = reverse_targets
+            else:
+                del reverse_pending_edges[target]
+        return targets
+
+    def dependent_closure(self, indices: Iterable[int]) -> IndexList:
+        """
+        Finds the given nodes and every node that depends on them, directly or transitively.
+        :return: The indices of the nodes, ordered so that each node comes after its dependencies
+        """
+
+        closure: Set[int] = set(indices)
+        stack: IndexList = list(closure)
+        while stack:
+            for dependent in self.dependent_indices(stack.pop()):
+                if dependent not in closure:
+                    closure.add(dependent)
+                    stack.append(dependent)
+
+        return sorted(closure, key=self._orders.__getitem__)
+
+    def truncate(self, num_nodes: int) -> None:
+        """
+        Drops the storage for the removed nodes at and after the given index.
+        """
+
+        if num_nodes >= len(self._handles):
+            return
+        assert all(handle is None for handle in self._handles[num_nodes:])
+
+        self.build()
+        # Cached orders may still contain the truncated nodes
+        self.clear_resolutions()
+        del self._handles[num_nodes:]
+        del self._debug_names[num_nodes:]
+        del self._orders[num_nodes:]
+        del self._edge_versions[num_nodes:]
+        # The truncated nodes have no edges, so their offsets all equal the total edge count
+        del self._dependency_offsets[num_nodes + 1:]
+        del self._dependent_offsets[num_nodes + 1:]
+
+    def clear(self) -> None:
+        self.__init__(self._detect_cycles)
+
+    def node(self, index: int) -> DependencyNode:
+        return DependencyNode(self, index)
+
+    def handle(self, index: int) -> Handle:
+        return self._handles[index]
+
+    def debug_name(self, index: int) -> str:
+        return self._debug_names[index]
+
+    def order(self, index: int) -> int:
+        return self._orders[index]
+
+    def dependency_indices(self, index: int) -> IndexList:
+        indices: IndexList = self._built_dependency_indices(index)
+        pending: IndexList = self._pending_dependencies.get(index)
+        if pending:
+            indices.extend(pending)
+        return indices
+
+    def dependent_indices(self, index: int) -> IndexList:
+        indices: IndexList = self._built_dependent_indices(index)
+        pending: IndexList = self._pending_dependents.get(index)
+        if pending:
+            indices.extend(pending)
+        return indices
+
+    def add_edge(self, index: int, dependency_index: int) -> None:
+        """
+        Adds an edge from the node at index to the node it depends on.
+        :raises CircularDependencyException: If the edge would create a cycle. The edge is not added.
+        """
+
+        if self._detect_cycles:
+            self._insert_order(index, dependency_index)
+
+        self._version += 1
+        self._edge_versions[index] = self._version
+
+        self._pending_dependencies.setdefault(index, []).append(dependency_index)
+        self._pending_dependents.setdefault(dependency_index, []).append(index)
+        self._num_pending_edges += 1
+
+        if self._num_pending_edges >= max(DependencyStore.MIN_PENDING_EDGES_TO_BUILD, len(self._dependency_targets)):
+            self.build()
+
+    def cached_resolution(self, index: int) -> IndexList:
+        """
+        :return: The cached resolved dependency order of the node, or None if it is not cached or no longer valid
+        """
+
+        entry: Tuple[int, array] = self._resolutions.get(index)
+        if entry is None:
+            return None
+
+        version, resolution = entry
+        if version != self._version:
+            edge_versions: array = self._edge_versions
+            if any(edge_versions[i] > version for i in resolution):
+                del self._resolutions[index]
+                self._num_cached_resolution_indices -= len(resolution)
+                return None
+            # Nothing reachable changed, so the order is valid for the current version
+            self._resolutions[index] = (self._version, resolution)
+
+        self._resolutions.move_to_end(index)
+        return resolution.tolist()
+
+    def cache_resolution(self, index: int, resolution: IndexList) -> None:
+        if len(resolution) > DependencyStore.MAX_CACHED_RESOLUTION_INDICES:
+            return
+
+        previous_entry: Tuple[int, array] = self._resolutions.pop(index, None)
+        if previous_entry is not None:
+            self._num_cached_resolution_indices -= len(previous_entry[1])
+
+        self._resolutions[index] = (self._version, array(DependencyStore.INDEX_TYPECODE, resolution))
+        self._num_cached_resolution_indices += len(resolution)
+
+        while self._num_cached_resolution_indices > DependencyStore.MAX_CACHED_RESOLUTION_INDICES:
+            _index, (_version, evicted) = self._resolutions.popitem(last=False)
+            self._num_cached_resolution_indices -= len(evicted)
+
+    def _uncache_resolution(self, index: int) -> None:
+        entry: Tuple[int, array] = self._resolutions.pop(index, None)
+        if entry is not None:
+            self._num_cached_resolution_indices -= len(entry[1])
+
+    def clear_resolutions(self) -> None:
+        self._resolutions.clear()
+        self._num_cached_resolution_indices = 0
+
+    def build(self) -> None:
+        """
+        Merges the pending edges into the compressed arrays.
+        """
+
+        if (
+                self._num_pending_edges == 0 and
+                not self._cleared_indices and
+                len(self._dependency_offsets) == len(self._handles) + 1
+        ):
+            return
+
+        num_nodes: int = len(self._handles)
+        # A built edge is dropped if its dependent was cleared or its dependency was removed
+        self._dependency_offsets, self._dependency_targets = DependencyStore._merge_edges(
+            num_nodes, self._dependency_offsets, self._dependency_targets, self._pending_dependencies,
+            self._cleared_indices, self._removed_indices
+        )
+        self._dependent_offsets, self._dependent_targets = DependencyStore._merge_edges(
+            num_nodes, self._dependent_offsets, self._dependent_targets, self._pending_dependents,
+            self._removed_indices, self._cleared_indices
+        )
+        self._pending_dependencies = {}
+        self._pending_dependents = {}
+        self._num_pending_edges = 0
+        self._removed_indices = set()
+        self._cleared_indices = set()
+        self._num_dropped_edges = 0
+
+    def _built_dependency_indices(self, index: int) -> IndexList:
+        return DependencyStore._built_edge_indices(
+            index, self._dependency_offsets, self._dependency_targets, self._cleared_indices, self._removed_indices
+        )
+
+    def _built_dependent_indices(self, index: int) -> IndexList:
+        return DependencyStore._built_edge_indices(
+            index, self._dependent_offsets, self._dependent_targets, self._removed_indices, self._cleared_indices
+        )
+
+    @staticmethod
+    def _built_edge_indices(
+            index: int,
+            offsets: array,
+            targets: array,
+            dropped_rows: Set[int],
+            dropped_targets: Set[int]
+    ) -> IndexList:
+        """
+        :return: The built edges of the node at index, skipping the edges to be dropped by the next build
+        """
+
+        if index + 1 >= len(offsets):
+            return []
+
+        built: array = targets[offsets[index]:offsets[index + 1]]
+        if not dropped_rows and not dropped_targets:
+            return built.tolist()
+        if index in dropped_rows:
+            return []
+        return [i for i in built if i not in dropped_targets]
+
+    @staticmethod
+    def _merge_edges(
+            num_nodes: int,
+            offsets: array,
+            targets: array,
+            pending_edges: PendingEdgeMap,
+            dropped_rows: Set[int],
+            dropped_targets: Set[int]
+    ) -> (array, array):
+        """
+        Merges the pending edges into the built ones, dropping the built edges of the dropped rows and the built edges
+        to the dropped targets. Pending edges are never dropped, as removing edges removes their pending edges right
+        away.
+        """
+
+        num_built_nodes: int = len(offsets) - 1
+        merged_offsets: array = array(DependencyStore.INDEX_TYPECODE, [0])
+        merged_targets: array = array(DependencyStore.INDEX_TYPECODE)
+
+        for index in range(num_nodes):
+            if index < num_built_nodes and index not in dropped_rows:
+                built: array = targets[offsets[index]:offsets[index + 1]]
+                if dropped_targets:
+                    merged_targets.extend(target for target in built if target not in dropped_targets)
+                else:
+                    merged_targets.extend(built)
+
+            pending: IndexList = pending_edges.get(index)
+            if pending:
+                merged_targets.extend(pending)
+
+            merged_offsets.append(len(merged_targets))
+
+        return merged_offsets, merged_targets
+
+    def topological_order(self) -> IndexList:
+        """
+        Computes an order of every node where each node comes after its dependencies, using Kahn's algorithm.
+        :raises CircularDependencyException: If the graph contains a cycle
+        """
+
+        node_indices: IndexList = self.node_indices
+        num_dependencies: Dict[int, int] = {index: len(self.dependency_indices(index)) for index in node_indices}
+        ready: IndexList = [index for index in node_indices if num_dependencies[index] == 0]
+        order: IndexList = []
+        while ready:
+            index: int = ready.pop()
+            order.append(index)
+            for dependent in self.dependent_indices(index):
+                num_dependencies[dependent] -= 1
+                if num_dependencies[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) < len(node_indices):
+            ordered: Set[int] = set(order)
+            index: int = next(index for index in node_indices if index not in ordered)
+            dependency_index: int = next(i for i in self.dependency_indices(index) if i not in ordered)
+            raise CircularDependencyException(self.node(index), self.node(dependency_index))
+        return order
+
+    def _reorder(self) -> None:
+        for order, index in enumerate(self.topological_order()):
+            self._orders[index] = order
+        self._next_order = len(self._handles)
+
+    def _insert_order(self, index: int, dependency_index: int) -> None:
+        """
+        Updates the topological order for a new edge from index to dependency_index, using the dynamic topological
+        sort of Pearce and Kelly. Only the nodes positioned between the two endpoints are visited.
+        """
+
+        if index == dependency_index:
+            raise CircularDependencyException(self.node(index), self.node(dependency_index))
+
+        orders: array = self._orders
+        lower_bound: int = orders[index]
+        upper_bound: int = orders[dependency_index]
+        # The dependency is already ordered before the node
+        if upper_bound < lower_bound:
+            return
+
+        # Nodes that depend on the node and are ordered no later than the dependency
+        forward: IndexList = []
+        visited: Set[int] = {index}
+        stack: IndexList = [index]
+        while stack:
+            current: int = stack.pop()
+            forward.append(current)
+            for dependent in self.dependent_indices(current):
+                if dependent == dependency_index:
+                    raise CircularDependencyException(self.node(index), self.node(dependency_index))
+                if dependent not in visited and orders[dependent] < upper_bound:
+                    visited.add(dependent)
+                    stack.append(dependent)
+
+        # Dependencies of the dependency that are ordered no earlier than the node
+        backward: IndexList = []
+        visited = {dependency_index}
+        stack = [dependency_index]
+        while stack:
+            current = stack.pop()
+            backward.append(current)
+            for child in self.dependency_indices(current):
+                if child not in visited and orders[child] > lower_bound:
+                    visited.add(child)
+                    stack.append(child)
+
+        # Reassign the affected positions so the backward set comes before the forward set
+        forward.sort(key=orders.__getitem__)
+        backward.sort(key=orders.__getitem__)
+        reordered: IndexList = backward + forward
+        positions: IndexList = sorted(orders[i] for i in reordered)
+        for reordered_index, position in zip(reordered, positions):
+            orders[reordered_index] = position
@@ -10,28 +10,48 @@ if TYPE_CHECKING:
 class Handle:
     """
     Handle
+
+    The index and generation are packed into a single int key, so handles are cheap to compare and can be used as
+    dict keys and set members. The low INDEX_BITS bits hold the index, the remaining bits hold the generation.
     """
 
+    __slots__ = ('_key',)
+
     INVALID_INDEX = ~0x0
     ZEROTH_GENERATION = 0
 
+    INDEX_BITS = 32
+    INDEX_MASK = (1 << INDEX_BITS) - 1
+
     def __init__(self, index: int = INVALID_INDEX, generation: int = ZEROTH_GENERATION) -> None:
-        self._index = index
-        self._generation = generation
+        # The invalid index is stored as the all ones index, which is reserved
+        self._key: int = (generation << Handle.INDEX_BITS) | (index & Handle.INDEX_MASK)
+
+    @property
+    def key(self) -> int:
+        return self._key
 
     @property
     def index(self) -> int:
-        return self._index
+        index: int = self._key & Handle.INDEX_MASK
+        if index == Handle.INDEX_MASK:
+            return Handle.INVALID_INDEX
+        return index
 
     @property
     def generation(self) -> int:
-        return self._generation
+        return self._key >> Handle.INDEX_BITS
 
     def __eq__(self, other: Any) -> bool:
-        return (
-            self._index == other.index
-            and self._generation == other.generation
-        )
+        if not isinstance(other, Handle):
+            return NotImplemented
+        return self._key == other._key
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __repr__(self) -> str:
+        return f"Handle(index={self.index}, generation={self.generation})"
 
 
 INVALID_HANDLE = Handle()
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from contextlib import nullcontext
+from threading import Lock
 from typing import TYPE_CHECKING
 
 from .handle import Handle, INVALID_HANDLE
@@ -18,18 +20,27 @@ class HandleEntry:
 
 
 if TYPE_CHECKING:
-    from typing import List
+    from typing import ContextManager, List
     HandleEntryList = List[HandleEntry]
+    FreeIndexList = List[int]
 
 
 class HandleManager:
     """
     Handle Manager
+
+    A thread safe manager serializes issuing and removing handles with a lock. Otherwise, the lock is a no-op.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, thread_safe: bool = False) -> None:
+        self._lock: ContextManager = Lock() if thread_safe else nullcontext()
         self._num_active_handles: int = 0
         self._entries: HandleEntryList = list()
+        # Stack of indices of inactive entries, available for reuse
+        self._free_indices: FreeIndexList = list()
+        # Highest generation of any entry reclaimed by compact(). New entries start above it, so handles to reclaimed
+        # entries can never become valid again.
+        self._generation_floor: int = 0
 
     @property
     def num_entries(self) -> int:
@@ -39,36 +50,49 @@ class HandleManager:
     def num_active_handles(self) -> int:
         return self._num_active_handles
 
+    @property
+    def num_free_entries(self) -> int:
+        return len(self._free_indices)
+
     def issue_handle(self) -> Handle:
         """
         Issue a new handle for this manager.
+        Inactive entries are reused before the entries list is grown.
         :return: The newly issued handle
         """
 
-        index: int = self._num_active_handles
-        # Grow entries list if necessary
-        if len(self._entries) == index:
-            handle_entry: HandleEntry = HandleEntry()
-            self._entries.append(handle_entry)
-
-        self._entries[index].active = True
-        self._entries[index].generation += 1
-        self._num_active_handles += 1
-        handle: Handle = Handle(index, self._entries[index].generation)
+        with self._lock:
+            if self._free_indices:
+                index: int = self._free_indices.pop()
+            else:
+                # Grow entries list only when there is no free entry to reuse
+                index: int = len(self._entries)
+                handle_entry: HandleEntry = HandleEntry()
+                handle_entry.generation = self._generation_floor
+                self._entries.append(handle_entry)
+
+            entry: HandleEntry = self._entries[index]
+            entry.active = True
+            entry.generation += 1
+            self._num_active_handles += 1
+            handle: Handle = Handle(index, entry.generation)
 
         return handle
 
     def remove_handle(self, handle: Handle) -> None:
         """
         Removes control of the given handle from this manager.
+        The entry is returned to the free list, to be reissued with a new generation.
         :param handle: The handle to be removed
         :return: None
         """
 
-        self.validate_handle(handle)
-        index: int = handle.index
-        self._entries[index].active = False
-        self._num_active_handles -= 1
+        with self._lock:
+            self.validate_handle(handle)
+            index: int = handle.index
+            self._entries[index].active = False
+            self._free_indices.append(index)
+            self._num_active_handles -= 1
 
     def remove_all_handles(self) -> None:
         """
@@ -76,9 +100,46 @@ class HandleManager:
         :return: None
         """
 
-        self._num_active_handles = 0
-        for entry in self._entries:
-            entry.active = False
+        with self._lock:
+            self._num_active_handles = 0
+            for entry in self._entries:
+                entry.active = False
+            # Reissue from the lowest index first
+            self._free_indices = list(reversed(range(len(self._entries))))
+
+    def compact(self) -> int:
+        """
+        Reclaims the inactive entries at the end of the entries list.
+        :return: The number of entries reclaimed
+        """
+
+        with self._lock:
+            num_entries: int = len(self._entries)
+            num_kept_entries: int = num_entries
+            while num_kept_entries > 0 and not self._entries[num_kept_entries - 1].active:
+                num_kept_entries -= 1
+                self._generation_floor = max(self._generation_floor, self._entries[num_kept_entries].generation)
+
+            if num_kept_entries == num_entries:
+                return 0
+
+            del self._entries[num_kept_entries:]
+            self._free_indices = [index for index in self._free_indices if index < num_kept_entries]
+            return num_entries - num_kept_entries
+
+    def is_valid(self, handle: Handle) -> bool:
+        """
+        Checks whether the given handle refers to an active entry of this manager, without raising.
+        :param handle: The handle to check
+        :return: True if validate_handle would succeed for this handle
+        """
+
+        index: int = handle.index
+        if index < 0 or index >= len(self._entries):
+            return False
+
+        entry: HandleEntry = self._entries[index]
+        return entry.active and entry.generation == handle.generation
 
     def validate_handle(self, handle: Handle) -> None:
         handle_is_valid: bool = handle != INVALID_HANDLE
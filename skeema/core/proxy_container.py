@@ -1,14 +1,15 @@
 from __future__ import annotations
 
+from contextlib import nullcontext
+from threading import Lock
 from typing import TYPE_CHECKING
 
 from weakref import proxy
 
-from .handle import HandleValidationException
 from .handle_manager import HandleManager
 
 if TYPE_CHECKING:
-    from typing import Any, List
+    from typing import Any, ContextManager, Iterable, List
 
     from .handle import Handle
 
@@ -18,34 +19,74 @@ if TYPE_CHECKING:
 class ProxyContainer:
     """
     Handle Managed Container
+
+    A thread safe container guards its proxy list with a lock, and creates a thread safe handle manager unless one is
+    given.
     """
 
-    def __init__(self) -> None:
-        self._handle_manager: HandleManager = HandleManager()
+    def __init__(self, handle_manager: HandleManager = None, thread_safe: bool = False) -> None:
+        if handle_manager is None:
+            handle_manager = HandleManager(thread_safe)
+        self._handle_manager: HandleManager = handle_manager
         self._object_proxies: ProxyList = []
+        self._lock: ContextManager = Lock() if thread_safe else nullcontext()
+
+    @property
+    def num_slots(self) -> int:
+        return len(self._object_proxies)
 
     def add_object(self, obj: Any) -> Handle:
-        handle: Handle = self._handle_manager.issue_handle()
+        with self._lock:
+            handle: Handle = self._handle_manager.issue_handle()
 
-        # Grow object proxies list if needed
-        if len(self._object_proxies) == handle.index:
-            self._object_proxies.append(None)
+            # Grow object proxies list if needed; reused indices already have a slot
+            num_missing_slots: int = handle.index + 1 - len(self._object_proxies)
+            if num_missing_slots > 0:
+                self._object_proxies.extend([None] * num_missing_slots)
 
-        self._object_proxies[handle.index] = proxy(obj)
+            self._object_proxies[handle.index] = proxy(obj)
 
         return handle
 
+    def is_valid(self, handle: Handle) -> bool:
+        return self._handle_manager.is_valid(handle)
+
     def get(self, handle: Handle) -> proxy:
-        try:
-            self._handle_manager.validate_handle(handle)
-        except HandleValidationException:
-            return None
-        return self._object_proxies[handle.index]
+        with self._lock:
+            if not self._handle_manager.is_valid(handle):
+                return None
+            return self._object_proxies[handle.index]
+
+    def get_many(self, handles: Iterable[Handle]) -> ProxyList:
+        """
+        Look up the objects for a batch of handles in a single pass.
+        :param handles: The handles to look up
+        :return: The object proxies, in the same order as the handles, with None for each invalid handle
+        """
+
+        is_valid = self._handle_manager.is_valid
+        object_proxies: ProxyList = self._object_proxies
+        with self._lock:
+            return [object_proxies[handle.index] if is_valid(handle) else None for handle in handles]
 
     def remove(self, handle: Handle) -> None:
-        self._object_proxies[handle.index] = None
-        self._handle_manager.remove_handle(handle)
+        with self._lock:
+            # Validate before touching the slot, which may have been reissued to another object
+            self._handle_manager.remove_handle(handle)
+            self._object_proxies[handle.index] = None
+
+    def compact(self) -> int:
+        """
+        Reclaims the free slots at the end of the container.
+        :return: The number of slots reclaimed
+        """
+
+        with self._lock:
+            num_reclaimed_slots: int = self._handle_manager.compact()
+            del self._object_proxies[self._handle_manager.num_entries:]
+        return num_reclaimed_slots
 
     def clear(self) -> None:
-        self._handle_manager.remove_all_handles()
-        self._object_proxies.clear()
+        with self._lock:
+            self._handle_manager.remove_all_handles()
+            self._object_proxies.clear()
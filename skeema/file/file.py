@@ -1,19 +1,27 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import TYPE_CHECKING
 
-from urllib.parse import urlparse
+from urllib.parse import urldefrag, urljoin, urlparse
+import glob
+import gzip
 import json
 import os
-
-import requests
+import threading
+import zipfile
 
 from skeema.core.dependency import Dependency
 from skeema.core.container import Container
+from skeema.core.handle import INVALID_HANDLE
+from skeema.file.http_cache import HttpCache
 
 if TYPE_CHECKING:
-    from typing import Any
+    from concurrent.futures import Future
+    from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
     from skeema.core import Handle
+    from skeema.core.dependency import DependencyStore
+    from skeema.file.file_cache import FileCache, Validator
 
 
 class File(Dependency):
@@ -21,8 +29,21 @@ class File(Dependency):
         self._manager: FileManager = manager
         self._path: str = path
         self._content: str = ''
+        self._loaded: bool = False
         super().__init__()
 
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def content(self) -> Any:
+        return self._content
+
     def _populate_dependency_node(self) -> None:
         pass
 
@@ -32,80 +53,438 @@ class File(Dependency):
     def _postload(self):
         pass
 
-    def load(self):
+    def _get_decoded_state(self) -> Any:
+        return self._content
+
+    def _set_decoded_state(self, state: Any) -> None:
+        self._content = state
+
+    @staticmethod
+    def decode(text: str) -> Any:
+        """
+        Decodes the text of a file. Decoding does not touch the file object, so it can run in another process.
+        :return: The decoded state of the file
+        """
+
+        return text
+
+    def fetch(self):
+        """
+        Reads and decodes the file, without loading its dependencies.
+        Unchanged local files are taken from the file cache of the manager, if it has one.
+        Fetching touches only this file, so files can be fetched concurrently.
+        """
+
+        file_cache: FileCache = self._manager.file_cache
+        validator: Validator = None
+        if file_cache is not None and FileManager.is_cacheable(self._path):
+            validator = file_cache.validator(self._path)
+            state: Any = file_cache.get(self._path, validator)
+            if state is not None:
+                self._set_decoded_state(state)
+                return
+
         print(f'LOADING {self._path}')
 
         self._preload()
 
-        with open(self._path, 'r') as file:
-            self._content = file.read()
+        self._set_decoded_state(self.decode(self._manager.read(self._path)))
 
         self._postload()
 
+        if validator is not None:
+            file_cache.put(self._path, validator, self._get_decoded_state())
+
+    def populate_dependency_node(self) -> List[File]:
+        """
+        Adds the files referenced by the fetched content as dependencies.
+        :return: The dependencies
+        """
+
         self._populate_dependency_node()
-        child_dependency_nodes = self.dependency_node.resolve_dependencies()[:-1]
-        for child_dependency_node in child_dependency_nodes:
-            handle: Handle = child_dependency_node.handle
-            dependency: File = self._manager.get_file_from_handle(handle)
-            dependency.load()
+        self._loaded = True
+        handles: List[Handle] = [node.handle for node in self.dependency_node.dependency_nodes]
+        return self._manager.get_files_from_handles(handles)
+
+    def load(self):
+        """
+        Loads the file and every file it references. Each file is read, parsed and scanned once, however many files
+        reference it.
+        """
+
+        pending: List[File] = [self]
+        while pending:
+            file: File = pending.pop()
+            if file.loaded:
+                continue
+
+            file.fetch()
+            dependencies: List[File] = file.populate_dependency_node()
+            pending.extend(reversed(dependencies))
 
 
 class JsonFile(File):
+    REFERENCE_KEY = '$ref'
+
+    def __init__(self, manager: FileManager, path: str):
+        self._references: List[str] = []
+        super().__init__(manager, path)
+
+    @property
+    def references(self) -> List[str]:
+        """
+        :return: The $ref values of the decoded content, in the order they were decoded
+        """
+
+        return self._references
+
+    def _get_decoded_state(self) -> Any:
+        return self._content, self._references
+
+    def _set_decoded_state(self, state: Any) -> None:
+        self._content, self._references = state
+
     def _populate_dependency_node(self) -> None:
-        dependencies = JsonFile.search_definition(self._content, '$ref')
-        for dependency_path in dependencies:
+        for dependency_path in self._references:
             url = urlparse(dependency_path)
             if url.path:
-                if dependency_path.startswith('./'):
-                    dependency_path = dependency_path.replace('./', f'{os.path.dirname(self._path)}\\', 1)
+                if FileManager.is_remote(self._path) or FileManager.is_remote(dependency_path):
+                    dependency_path = urljoin(self._path, dependency_path)
+                elif not os.path.isabs(url.path):
+                    # Resolve against the referring file and normalize, so a file reached through different relative
+                    # paths is created once
+                    dependency_path = os.path.normpath(os.path.join(os.path.dirname(self._path), url.path))
                 dependency = self._manager.create_file(dependency_path)
                 self.add_dependency(dependency)
 
-    def _postload(self):
-        self._content = json.loads(self._content)
-
     @staticmethod
-    def search_definition(source: Any, filter_key: str) -> [str]:
-        if isinstance(source, dict):
-            for key, value in source.items():
-                if filter_key == key:
-                    yield value
+    def decode(text: str) -> Tuple[Any, List[str]]:
+        """
+        :return: The decoded content and its $ref values
+        """
+
+        references: List[str] = []
 
-                # Parse dict
-                elif isinstance(value, dict):
-                    for d in JsonFile.search_definition(value, filter_key):
-                        yield d
+        # Collect references while decoding, so the document is only traversed once
+        def object_pairs_hook(pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+            obj: Dict[str, Any] = dict(pairs)
+            reference: Any = obj.get(JsonFile.REFERENCE_KEY)
+            if isinstance(reference, str):
+                references.append(reference)
+            return obj
 
-                # Parse list
-                elif isinstance(value, list) or isinstance(value, tuple):
-                    for v in value:
-                        for d in JsonFile.search_definition(v, filter_key):
-                            yield d
+        return json.loads(text, object_pairs_hook=object_pairs_hook), references
+
+
+def _read_and_decode(file_class: Type[File], path: str) -> Any:
+    open_file = gzip.open if path.endswith(FileManager.GZIP_EXTENSION) else open
+    with open_file(path, 'rt') as file:
+        return file_class.decode(file.read())
 
 
 class FileManager:
-    def __init__(self):
+    """
+    File Manager
+
+    In concurrent mode, files are read and decoded on a thread pool. Each newly referenced file is fetched as soon as
+    the file referencing it has been decoded, while dependencies are registered, and cycles detected, on the loading
+    thread.
+
+    Remote http and https files are fetched through the http cache. Local files are taken from the file cache when
+    one is given and the file is unchanged, so a file cache shared between managers avoids decoding unchanged files
+    again on every load.
+
+    Files inside a zip archive are addressed by joining the archive path and the member name, as if the archive was a
+    directory, so relative references resolve inside the archive. Gzip compressed files are decompressed when read.
+
+    Loading a directory decodes its files on a process pool, then registers them in one batch before adding the
+    dependencies between them.
+    """
+
+    REMOTE_SCHEMES = ('http', 'https')
+    ARCHIVE_EXTENSION = '.zip'
+    GZIP_EXTENSION = '.gz'
+    DECODE_TASKS_PER_WORKER = 4
+
+    def __init__(
+            self,
+            concurrent: bool = False,
+            max_workers: int = None,
+            http_cache: HttpCache = None,
+            file_cache: FileCache = None
+    ):
         self._container: Container = Container()
+        self._concurrent: bool = concurrent
+        self._max_workers: int = max_workers
+        self._http_cache: HttpCache = http_cache if http_cache is not None else HttpCache()
+        self._file_cache: FileCache = file_cache
+        self._archives: Dict[str, zipfile.ZipFile] = {}
+        self._archives_lock: threading.Lock = threading.Lock()
+
+    @property
+    def http_cache(self) -> HttpCache:
+        return self._http_cache
+
+    @property
+    def file_cache(self) -> FileCache:
+        return self._file_cache
+
+    @staticmethod
+    def is_remote(path: str) -> bool:
+        return urlparse(path).scheme in FileManager.REMOTE_SCHEMES
+
+    @staticmethod
+    def normalize_path(path: str) -> str:
+        """
+        :return: The key of the file at the path, without any fragment. Local paths are normalized, so each file has
+                 one key however it is reached, e.g. ./schemas/a.json and schemas/a.json.
+        """
+
+        path = urldefrag(path).url
+        if FileManager.is_remote(path):
+            return path
+        return os.path.normpath(path)
+
+    @staticmethod
+    def split_archive_path(path: str) -> Optional[Tuple[str, str]]:
+        """
+        :return: The path of the archive and the name of the member, or None if the path is not inside an archive
+        """
+
+        path = os.path.normpath(path)
+        index: int = path.find(FileManager.ARCHIVE_EXTENSION + os.sep)
+        if index < 0:
+            return None
+
+        archive_end: int = index + len(FileManager.ARCHIVE_EXTENSION)
+        return path[:archive_end], path[archive_end + 1:].replace(os.sep, '/')
+
+    @staticmethod
+    def is_cacheable(path: str) -> bool:
+        """
+        :return: True if the path is a file on disk, whose content can be kept in the file cache
+        """
+
+        return not FileManager.is_remote(path) and FileManager.split_archive_path(path) is None
+
+    def read(self, path: str) -> str:
+        """
+        :return: The content of the local, archived or remote file. Gzip compressed files are decompressed.
+        """
+
+        if FileManager.is_remote(path):
+            return self._http_cache.fetch(path)
+
+        archive_path: Optional[Tuple[str, str]] = FileManager.split_archive_path(path)
+        if archive_path is not None:
+            # Only the referenced member is decompressed
+            data: bytes = self._get_archive(archive_path[0]).read(archive_path[1])
+            if path.endswith(FileManager.GZIP_EXTENSION):
+                data = gzip.decompress(data)
+            return data.decode('utf-8')
+
+        if path.endswith(FileManager.GZIP_EXTENSION):
+            with gzip.open(path, 'rt') as file:
+                return file.read()
+
+        with open(path, 'r') as file:
+            return file.read()
+
+    def _get_archive(self, path: str) -> zipfile.ZipFile:
+        # Each archive is opened once, and its index read once, however many members are read
+        with self._archives_lock:
+            archive: zipfile.ZipFile = self._archives.get(path)
+            if archive is None:
+                archive = self._archives[path] = zipfile.ZipFile(path)
+            return archive
+
+    def close(self) -> None:
+        """
+        Closes the archives opened to read archived files.
+        """
+
+        with self._archives_lock:
+            for archive in self._archives.values():
+                archive.close()
+            self._archives.clear()
 
     def create_file(self, path) -> File:
+        path = FileManager.normalize_path(path)
+        # Files are unique per path
+        handle: Handle = self._container.get_object_handle(path)
+        if handle != INVALID_HANDLE:
+            return self._container.get_object(handle)
+
         file: File = self._create_file(path)
         self._container.add_object(path, file, path)
         return file
 
+    def create_files(self, paths: Iterable[str]) -> List[File]:
+        """
+        Creates the files of a batch of paths, registering the new ones in one batch.
+        :return: The file of each path
+        """
+
+        files: List[File] = []
+        new_files: Dict[str, File] = {}
+        for path in paths:
+            path = FileManager.normalize_path(path)
+            # Files are unique per path
+            file: File = new_files.get(path)
+            if file is None:
+                handle: Handle = self._container.get_object_handle(path)
+                if handle != INVALID_HANDLE:
+                    file = self._container.get_object(handle)
+                else:
+                    file = new_files[path] = self._create_file(path)
+            files.append(file)
+
+        self._container.add_objects((path, file, path) for path, file in new_files.items())
+        return files
+
     def _create_file(self, path) -> File:
         pass
 
+    @property
+    def files(self) -> List[File]:
+        return self._container.objects
+
+    def get_file(self, path: str) -> File:
+        handle: Handle = self._container.get_object_handle(FileManager.normalize_path(path))
+        return self._container.get_object(handle)
+
     def get_file_from_handle(self, handle: Handle):
         return self._container.get_object(handle)
 
+    def get_files_from_handles(self, handles: Iterable[Handle]) -> List[File]:
+        return self._container.get_objects(handles)
+
     def load(self, path: str):
-        url = urlparse(path)
-        if url.scheme == 'http':
-            requests.get(path)
+        file = self.create_file(path)
+        if self._concurrent:
+            self._load_concurrently(file)
         else:
-            file = self.create_file(path)
             file.load()
-            return file
+        return file
+
+    def reload(self, paths: Iterable[str]) -> List[File]:
+        """
+        Loads the files with the given paths again, after they have changed. Their references are replaced with the
+        references of the new content, and newly referenced files are loaded.
+
+        Every file is fetched before any references are replaced. If one fails to read or decode, e.g. because it was
+        saved half written, every file keeps its previous content and references and the error is raised.
+        :return: The reloaded files and every file that depends on them, ordered so each file comes after its
+                 dependencies
+        """
+
+        changed_files: List[File] = [file for file in (self.get_file(path) for path in paths) if file is not None]
+        previous_states: List[Any] = [file._get_decoded_state() for file in changed_files]
+        try:
+            for file in changed_files:
+                file.fetch()
+        except Exception:
+            for file, state in zip(changed_files, previous_states):
+                file._set_decoded_state(state)
+            raise
+
+        referenced_files: List[File] = []
+        for file in changed_files:
+            file.dependency_node.remove_dependencies()
+            referenced_files.extend(file.populate_dependency_node())
+
+        for file in referenced_files:
+            if self._concurrent:
+                self._load_concurrently(file)
+            else:
+                file.load()
+
+        dependency_store: DependencyStore = self._container.dependency_store
+        indices: List[int] = dependency_store.dependent_closure(file.dependency_node.index for file in changed_files)
+        return self.get_files_from_handles(dependency_store.handle(index) for index in indices)
+
+    def load_directory(self, path: str, pattern: str = '**/*.json') -> List[File]:
+        """
+        Loads every file in the directory matching the pattern, and every file they reference.
+        :param path: The directory to load
+        :param pattern: The glob pattern of the files to load, relative to the directory
+        :return: The files matching the pattern
+        """
+
+        paths: List[str] = sorted(
+            os.path.normpath(file_path) for file_path in glob.glob(os.path.join(path, pattern), recursive=True)
+            if os.path.isfile(file_path)
+        )
+        files: List[File] = self.create_files(paths)
+
+        unloaded_files: List[File] = [file for file in dict.fromkeys(files) if not file.loaded]
+        self._decode_files(unloaded_files)
+
+        # Add the dependencies once every file is registered, then load files referenced from outside the directory
+        referenced_files: List[File] = []
+        for file in unloaded_files:
+            referenced_files.extend(dependency for dependency in file.populate_dependency_node() if not dependency.loaded)
+
+        for file in referenced_files:
+            if self._concurrent:
+                self._load_concurrently(file)
+            else:
+                file.load()
+
+        return files
+
+    def _decode_files(self, files: List[File]) -> None:
+        file_cache: FileCache = self._file_cache
+        validators: Dict[str, Validator] = {}
+        files_to_decode: List[File] = []
+        for file in files:
+            if file_cache is not None:
+                validators[file.path] = file_cache.validator(file.path)
+                state: Any = file_cache.get(file.path, validators[file.path])
+                if state is not None:
+                    file._set_decoded_state(state)
+                    continue
+
+            file._preload()
+            files_to_decode.append(file)
+
+        if not files_to_decode:
+            return
+
+        max_workers: int = self._max_workers or os.cpu_count() or 1
+        chunk_size: int = max(1, len(files_to_decode) // (max_workers * FileManager.DECODE_TASKS_PER_WORKER))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            states: Iterator[Any] = executor.map(
+                _read_and_decode,
+                [type(file) for file in files_to_decode],
+                [file.path for file in files_to_decode],
+                chunksize=chunk_size
+            )
+
+            for file, state in zip(files_to_decode, states):
+                file._set_decoded_state(state)
+                file._postload()
+                if file_cache is not None:
+                    file_cache.put(file.path, validators[file.path], file._get_decoded_state())
+
+    def _load_concurrently(self, root: File) -> None:
+        if root.loaded:
+            return
+
+        scheduled: Set[str] = {root.path}
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            pending: Dict[Future, File] = {executor.submit(root.fetch): root}
+            while pending:
+                done, _not_done = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file: File = pending.pop(future)
+                    # Raise any error from reading or decoding the file
+                    future.result()
+
+                    for dependency in file.populate_dependency_node():
+                        if not dependency.loaded and dependency.path not in scheduled:
+                            scheduled.add(dependency.path)
+                            pending[executor.submit(dependency.fetch)] = dependency
 
 
 class JsonFileManager(FileManager):
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import hashlib
+import os
+import threading
+
+if TYPE_CHECKING:
+    from typing import Any, Optional, Tuple
+
+    Validator = Tuple[int, int, Optional[str]]
+    FileCacheEntries = OrderedDict[str, Tuple[Validator, Any]]
+
+
+class FileCache:
+    """
+    File Cache
+
+    Keeps the decoded content of local files, keyed by path, so unchanged files are not read and decoded again. An
+    entry is valid while the modification time and size of the file, and optionally the hash of its content, are
+    unchanged. The least recently used entries are evicted once the cache holds max_entries files.
+
+    The cache can be shared between file managers. Cached content is shared too, and must not be mutated.
+    """
+
+    DEFAULT_MAX_ENTRIES = 4096
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, hash_contents: bool = False):
+        self._max_entries: int = max_entries
+        self._hash_contents: bool = hash_contents
+        self._entries: FileCacheEntries = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._hits: int = 0
+        self._misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def validator(self, path: str) -> Validator:
+        """
+        :return: The modification time in nanoseconds, the size and, if enabled, the content hash of the file
+        :raises OSError: If the file cannot be accessed
+        """
+
+        stat: os.stat_result = os.stat(path)
+        content_hash: Optional[str] = None
+        if self._hash_contents:
+            with open(path, 'rb') as file:
+                content_hash = hashlib.sha256(file.read()).hexdigest()
+
+        return stat.st_mtime_ns, stat.st_size, content_hash
+
+    def get(self, path: str, validator: Validator) -> Any:
+        """
+        :return: The cached content of the file, or None if it is not cached or the file has changed
+        """
+
+        with self._lock:
+            entry: Tuple[Validator, Any] = self._entries.get(path)
+            if entry is None or entry[0] != validator:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(path)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, path: str, validator: Validator, content: Any) -> None:
+        """
+        Caches the content of the file.
+        The validator should be taken before the file is read, so a change made while reading invalidates the entry.
+        """
+
+        with self._lock:
+            self._entries[path] = (validator, content)
+            self._entries.move_to_end(path)
+
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
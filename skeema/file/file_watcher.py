@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import os
+
+from skeema.core.dependency import CircularDependencyException
+from skeema.file.file import FileManager
+
+if TYPE_CHECKING:
+    from threading import Event
+    from typing import Callable, Dict, List, Optional, Tuple
+
+    from skeema.file.file import File
+
+    FileStat = Tuple[int, int]
+
+
+class FileWatcher:
+    """
+    File Watcher
+
+    Polls the local files of a file manager for changes to their modification time or size, without any platform
+    specific notification mechanism. Changed files are reloaded, and the reloaded files and their dependents are
+    reported, so the work done for a change depends on the files it affects rather than on every file loaded.
+
+    Files that are deleted are ignored until they are created again. Files that fail to reload, e.g. because they were
+    saved half written, keep their previous content and are reloaded again on the next poll.
+    """
+
+    # Errors from reading a changed file, decoding it, or adding its references
+    RELOAD_ERRORS = (OSError, ValueError, CircularDependencyException)
+
+    def __init__(self, file_manager: FileManager, interval: float = 1.0):
+        self._file_manager: FileManager = file_manager
+        self._interval: float = interval
+        self._stats: Dict[str, FileStat] = {}
+        self.snapshot()
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @staticmethod
+    def _stat(path: str) -> FileStat:
+        stat: os.stat_result = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def snapshot(self) -> None:
+        """
+        Records the current state of every loaded local file, so later polls only report changes made after it.
+        """
+
+        self._stats = {}
+        for file in self._file_manager.files:
+            if file.loaded and FileManager.is_cacheable(file.path):
+                try:
+                    self._stats[file.path] = FileWatcher._stat(file.path)
+                except OSError:
+                    pass
+
+    def changed_paths(self) -> List[str]:
+        """
+        :return: The paths of the local files that changed since the last snapshot, or that are not loaded yet because
+                 they failed to load
+        """
+
+        changed_paths: List[str] = []
+        for file in self._file_manager.files:
+            if not FileManager.is_cacheable(file.path):
+                continue
+
+            try:
+                stat: FileStat = FileWatcher._stat(file.path)
+            except OSError:
+                continue
+
+            if not file.loaded or self._stats.get(file.path) != stat:
+                changed_paths.append(file.path)
+
+        return changed_paths
+
+    def poll(self) -> List[File]:
+        """
+        Reloads the files that changed since the last poll.
+        :return: The reloaded files and their dependents, ordered so each file comes after its dependencies
+        """
+
+        changed_paths: List[str] = self.changed_paths()
+        if not changed_paths:
+            return []
+
+        return self.reload(changed_paths)
+
+    def reload(self, paths: List[str]) -> List[File]:
+        """
+        Reloads the files with the given paths and records their state. The state is taken before the files are read,
+        so a file changed while it is reloaded is reported by the next poll. If reloading fails, the state is not
+        recorded and the files are reported again by the next poll.
+        :return: The reloaded files and their dependents, ordered so each file comes after its dependencies
+        """
+
+        stats: Dict[str, FileStat] = {}
+        for path in paths:
+            try:
+                stats[path] = FileWatcher._stat(path)
+            except OSError:
+                pass
+
+        affected_files: List[File] = self._file_manager.reload(paths)
+        self._stats.update(stats)
+
+        # Record files loaded for the first time by the reload, i.e. newly referenced files
+        for file in self._file_manager.files:
+            if file.path not in self._stats and file.loaded and FileManager.is_cacheable(file.path):
+                try:
+                    self._stats[file.path] = FileWatcher._stat(file.path)
+                except OSError:
+                    pass
+
+        return affected_files
+
+    def watch(
+            self,
+            on_change: Callable[[List[File]], None],
+            stop: Event,
+            on_error: Optional[Callable[[Exception], None]] = None
+    ) -> None:
+        """
+        Polls for changes until stopped, calling on_change with the affected files of each change. A file that fails to
+        reload does not stop watching, and is reloaded again by the next poll.
+        :param on_change: Called with the result of each poll that found changes
+        :param stop: Stops watching once set
+        :param on_error: Called with the error of each poll that failed to reload the changed files
+        """
+
+        while not stop.is_set():
+            try:
+                affected_files: List[File] = self.poll()
+            except FileWatcher.RELOAD_ERRORS as error:
+                if on_error is not None:
+                    on_error(error)
+            else:
+                if affected_files:
+                    on_change(affected_files)
+            stop.wait(self._interval)
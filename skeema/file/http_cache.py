@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from urllib.parse import urldefrag
+
+import requests
+
+if TYPE_CHECKING:
+    from typing import Dict, Optional
+
+
+class OfflineCacheMissException(Exception):
+    def __init__(self, url: str):
+        msg = f"Cannot fetch {url} in offline mode. It is not in the cache."
+        super().__init__(msg)
+
+
+class HttpCache:
+    """
+    Http Cache
+
+    Fetches remote files over a shared session and keeps their bodies in a cache directory, keyed by URL. A cached
+    body is revalidated with its ETag and Last-Modified validators, so unchanged files are not downloaded again. In
+    offline mode, files are served from the cache only.
+
+    The fragment of a url is not part of the file, so urls differing only in their fragment share one request and one
+    cache entry. Requests time out after the given number of seconds, so an unresponsive host cannot stall loading.
+    """
+
+    DEFAULT_TIMEOUT = 30.0
+
+    def __init__(
+            self,
+            cache_directory: str = None,
+            session: requests.Session = None,
+            offline: bool = False,
+            timeout: float = DEFAULT_TIMEOUT
+    ):
+        self._cache_directory: Optional[str] = cache_directory
+        self._session: requests.Session = session if session is not None else requests.Session()
+        self._offline: bool = offline
+        self._timeout: float = timeout
+        self._lock: threading.Lock = threading.Lock()
+        self._num_requests: int = 0
+        self._num_downloads: int = 0
+
+        if cache_directory is not None:
+            os.makedirs(cache_directory, exist_ok=True)
+
+    @property
+    def session(self) -> requests.Session:
+        return self._session
+
+    @property
+    def offline(self) -> bool:
+        return self._offline
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+    @property
+    def num_requests(self) -> int:
+        """
+        :return: The number of requests sent, including revalidations
+        """
+
+        return self._num_requests
+
+    @property
+    def num_downloads(self) -> int:
+        """
+        :return: The number of bodies downloaded, excluding revalidated bodies served from the cache
+        """
+
+        return self._num_downloads
+
+    def fetch(self, url: str) -> str:
+        """
+        :return: The body of the remote file
+        :raises OfflineCacheMissException: In offline mode, if the file is not in the cache
+        :raises requests.HTTPError: If the server responds with an error
+        :raises requests.Timeout: If the server does not respond within the timeout
+        """
+
+        url = urldefrag(url).url
+        entry: Optional[Dict[str, str]] = self._read_entry(url)
+        if self._offline:
+            if entry is None:
+                raise OfflineCacheMissException(url)
+            return entry['body']
+
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response: requests.Response = self._session.get(url, headers=headers, timeout=self._timeout)
+        with self._lock:
+            self._num_requests += 1
+
+        if response.status_code == 304 and entry is not None:
+            return entry['body']
+
+        response.raise_for_status()
+        with self._lock:
+            self._num_downloads += 1
+
+        body: str = response.text
+        self._write_entry(url, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'body': body,
+        })
+        return body
+
+    def _entry_path(self, url: str) -> str:
+        key: str = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self._cache_directory, f'{key}.json')
+
+    def _read_entry(self, url: str) -> Optional[Dict[str, str]]:
+        if self._cache_directory is None:
+            return None
+
+        try:
+            with open(self._entry_path(url), 'r', encoding='utf-8') as file:
+                entry: Dict[str, str] = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        # Guard against hash collisions
+        return entry if entry.get('url') == url else None
+
+    def _write_entry(self, url: str, entry: Dict[str, str]) -> None:
+        if self._cache_directory is None:
+            return
+
+        # Write to a temporary file first, so a concurrent reader never sees a partial entry
+        descriptor, temporary_path = tempfile.mkstemp(dir=self._cache_directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                json.dump(entry, file)
+            os.replace(temporary_path, self._entry_path(url))
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
@@ -1,14 +1,39 @@
 class CompilationContext:
-    def __init__(self):
+    def __init__(self, profile=False):
         self._representations = {}
+        # When profiling, the time in seconds spent compiling each resource, by name
+        self._profile = profile
+        self._compile_times = {}
 
     @property
     def representations(self):
         return self._representations.values()
 
+    @property
+    def profile(self):
+        return self._profile
+
+    @property
+    def compile_times(self):
+        return self._compile_times
+
     def register_representation(self, name, representation):
         self._representations[name] = representation
 
+    def remove_representation(self, name):
+        self._representations.pop(name, None)
+
+    def remove_compile_time(self, name):
+        self._compile_times.pop(name, None)
+
+    def record_compile_time(self, name, seconds):
+        self._compile_times[name] = seconds
+
+    def merge(self, other):
+        for name, representation in other._representations.items():
+            self.register_representation(name, representation)
+        self._compile_times.update(other._compile_times)
+
     def get_representation(self, name):
         return self._representations.get(name)
 
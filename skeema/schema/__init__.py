@@ -1,2 +1,7 @@
 from .schema import Schema
 from .schema_manager import SchemaManager
+from .compile_scheduler import CompileScheduler
+from .compile_cache import CompileCache
+from .keyword import Keyword, KeywordCompilationException
+from .keyword_registry import KeywordRegistry
+from .schema_watcher import SchemaWatcher
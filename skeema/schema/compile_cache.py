@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, Optional
+
+    from skeema.intermediate import Representation
+    from skeema.types import KeyValueDef
+
+
+class CompileCache:
+    """
+    Compile Cache
+
+    Keeps the representations compiled from schemas in a cache directory, addressed by a hash of the schema's class
+    name and definition, the hashes of its dependencies and the keywords of its compiler. A schema with a cached
+    representation is not compiled again, in this process or any later one, until it, one of its dependencies or the
+    keywords change.
+
+    The cache is bounded by the total size of its entries, evicting the least recently used entries first.
+    """
+
+    ENTRY_EXTENSION = '.representation'
+    # Bump when the compiled representations change, so entries written by older versions are not used
+    FORMAT_VERSION = 1
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, cache_directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._cache_directory: str = cache_directory
+        self._max_bytes: int = max_bytes
+        self._lock: threading.Lock = threading.Lock()
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+
+        os.makedirs(cache_directory, exist_ok=True)
+
+        # Size of each entry by key, in least recently used order
+        self._entry_sizes: Dict[str, int] = {}
+        entries = sorted(
+            (entry for entry in os.scandir(cache_directory) if entry.name.endswith(CompileCache.ENTRY_EXTENSION)),
+            key=lambda entry: entry.stat().st_mtime_ns
+        )
+        for entry in entries:
+            self._entry_sizes[entry.name[:-len(CompileCache.ENTRY_EXTENSION)]] = entry.stat().st_size
+        self._size: int = sum(self._entry_sizes.values())
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    @property
+    def size(self) -> int:
+        """
+        :return: The total size of the cached entries in bytes
+        """
+
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entry_sizes)
+
+    @staticmethod
+    def key(
+            class_name: str,
+            key_value_definition: KeyValueDef,
+            dependency_keys: Iterable[str],
+            compiler_fingerprint: str = ''
+    ) -> str:
+        """
+        :param compiler_fingerprint: The fingerprint of the keywords compiling the schema, so representations compiled
+                                     with other keywords are not used
+        :return: The content address of a schema, from its canonical definition and the keys of its dependencies
+        """
+
+        digest = hashlib.sha256()
+        digest.update(f'{CompileCache.FORMAT_VERSION}\0{compiler_fingerprint}\0{class_name}\0'.encode('utf-8'))
+        digest.update(json.dumps(key_value_definition, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8'))
+        for dependency_key in dependency_keys:
+            digest.update(f'\0{dependency_key}'.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._cache_directory, f'{key}{CompileCache.ENTRY_EXTENSION}')
+
+    def get(self, key: str) -> Optional[Representation]:
+        """
+        :return: The cached representation, or None if it is not cached
+        """
+
+        with self._lock:
+            if key not in self._entry_sizes:
+                self._misses += 1
+                return None
+
+            try:
+                with open(self._entry_path(key), 'rb') as file:
+                    representation: Representation = pickle.load(file)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                # The entry was removed or damaged by another process
+                self._size -= self._entry_sizes.pop(key)
+                self._misses += 1
+                return None
+
+            # Mark the entry as recently used, here and for later processes
+            self._entry_sizes[key] = self._entry_sizes.pop(key)
+            os.utime(self._entry_path(key))
+            self._hits += 1
+            return representation
+
+    def put(self, key: str, representation: Representation) -> None:
+        data: bytes = pickle.dumps(representation)
+        with self._lock:
+            if key in self._entry_sizes:
+                self._size -= self._entry_sizes.pop(key)
+
+            # Write to a temporary file first, so a concurrent reader never sees a partial entry
+            descriptor, temporary_path = tempfile.mkstemp(dir=self._cache_directory, suffix='.tmp')
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temporary_path, self._entry_path(key))
+
+            self._entry_sizes[key] = len(data)
+            self._size += len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self._max_bytes and self._entry_sizes:
+            key: str = next(iter(self._entry_sizes))
+            self._size -= self._entry_sizes.pop(key)
+            self._evictions += 1
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in self._entry_sizes:
+                try:
+                    os.remove(self._entry_path(key))
+                except OSError:
+                    pass
+            self._entry_sizes.clear()
+            self._size = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from skeema.intermediate import CompilationContext
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from typing import Dict, Iterable, List
+
+    from skeema.core import Handle
+
+    from .schema import Schema
+    from .schema_manager import SchemaManager
+
+    SchemaList = List[Schema]
+    HandleToLevelMap = Dict[Handle, int]
+
+
+class CompileScheduler:
+    """
+    Compile Scheduler
+
+    Compiles the schemas of a manager level by level. A schema's level is one more than the highest level of its
+    uncompiled dependencies, so the schemas of a level do not depend on each other and are dispatched to the executor
+    together. Each schema compiles into its own compilation context, and the results are merged into the final context
+    in the same order as a serial compile, so the output matches Schema.compile exactly.
+
+    Schemas reference their manager, so they cannot be sent to a process pool. Use a thread pool, or any executor which
+    runs tasks in this process.
+    """
+
+    def __init__(self, manager: SchemaManager, executor: Executor = None, max_workers: int = None) -> None:
+        self._manager: SchemaManager = manager
+        self._executor: Executor = executor
+        self._max_workers: int = max_workers
+
+    def compile(self, roots: Iterable[Schema] = None, compilation_context: CompilationContext = None) -> CompilationContext:
+        """
+        Compiles the given schemas and their dependencies.
+        :param roots: The schemas to compile. Defaults to every schema in the manager.
+        :param compilation_context: The context to compile into
+        :return: The compilation context
+        """
+
+        if compilation_context is None:
+            compilation_context = CompilationContext()
+        if roots is None:
+            roots = self._manager.schemas
+        roots = list(roots)
+
+        self._populate(roots, compilation_context)
+        schemas: SchemaList = self._serial_order(roots)
+        levels: List[SchemaList] = self._levels(schemas)
+
+        if self._executor is not None:
+            self._compile_levels(self._executor, levels, schemas, compilation_context)
+        else:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                self._compile_levels(executor, levels, schemas, compilation_context)
+
+        return compilation_context
+
+    def _populate(self, roots: SchemaList, compilation_context: CompilationContext) -> None:
+        # Populate depth first, in the order a serial compile would, so the whole graph is known before compiling
+        stack: SchemaList = list(reversed(roots))
+        while stack:
+            schema: Schema = stack.pop()
+            if schema.compiled or schema.populated:
+                continue
+            schema.populate(compilation_context)
+            handles: List[Handle] = [node.handle for node in schema.dependency_node.dependency_nodes]
+            stack.extend(reversed(self._manager.get_schemas_from_handles(handles)))
+
+    def _serial_order(self, roots: SchemaList) -> SchemaList:
+        # The order in which a serial compile of the roots compiles the uncompiled schemas
+        schemas: SchemaList = []
+        seen: set = set()
+        for root in roots:
+            handles: List[Handle] = [node.handle for node in root.dependency_node.resolve_dependencies()]
+            for handle, schema in zip(handles, self._manager.get_schemas_from_handles(handles)):
+                if handle not in seen and not schema.compiled:
+                    seen.add(handle)
+                    schemas.append(schema)
+        return schemas
+
+    @staticmethod
+    def _levels(schemas: SchemaList) -> List[SchemaList]:
+        # Dependencies come before dependents in the serial order, so levels are computed in a single pass
+        schema_levels: HandleToLevelMap = {}
+        levels: List[SchemaList] = []
+        for schema in schemas:
+            dependency_levels: List[int] = [
+                schema_levels[node.handle]
+                for node in schema.dependency_node.dependency_nodes
+                if node.handle in schema_levels
+            ]
+            level: int = max(dependency_levels) + 1 if dependency_levels else 0
+            schema_levels[schema.dependency_node.handle] = level
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(schema)
+        return levels
+
+    @staticmethod
+    def _compile_levels(
+            executor: Executor,
+            levels: List[SchemaList],
+            schemas: SchemaList,
+            compilation_context: CompilationContext
+    ) -> None:
+        schema_contexts: Dict[Handle, CompilationContext] = {}
+
+        def compile_schema(schema: Schema) -> CompilationContext:
+            schema_context: CompilationContext = CompilationContext(compilation_context.profile)
+            schema._compile_representation(schema_context)
+            return schema_context
+
+        for level in levels:
+            futures = [(schema, executor.submit(compile_schema, schema)) for schema in level]
+            for schema, future in futures:
+                schema_contexts[schema.dependency_node.handle] = future.result()
+            # Dependents in later levels check that their dependencies are compiled
+            for schema in level:
+                schema._set_compiled()
+
+        for schema in schemas:
+            compilation_context.merge(schema_contexts[schema.dependency_node.handle])
@@ -2,27 +2,47 @@ from abc import abstractmethod, ABCMeta
 
 from skeema.intermediate import ClassContext, Representation
 
+from .keyword import KeywordCompilationException
+from .keyword_registry import KeywordRegistry
+
 
 class Compiler(metaclass=ABCMeta):
+    """
+    Compiles schemas into representations, dispatching each key of a schema definition to its keyword.
+
+    The keywords are created once per compiler, from get_compilation_keys. More keywords can be registered with
+    register_keyword.
+    """
+
+    def __init__(self):
+        self._keyword_registry = KeywordRegistry(self.get_compilation_keys())
+
     @abstractmethod
     def get_compilation_keys(self):
         pass
 
+    @property
+    def keyword_registry(self):
+        return self._keyword_registry
+
+    @property
+    def fingerprint(self):
+        return self._keyword_registry.fingerprint
+
+    def register_keyword(self, keyword):
+        self._keyword_registry.register(keyword)
+
     def compile(self, schema, compilation_context):
         class_name = schema.class_name
         class_context = ClassContext(class_name)
-        compilation_keys = self.get_compilation_keys()
-        compiled_keys = dict()
-        for compilation_key in compilation_keys:
-            compiled = compilation_key.compile(schema, class_context, compilation_context)
-            if compiled:
-                compiled_keys[compilation_key.key] = compilation_key
-            else:
-                if compilation_key.error_message is not None:
-                    print(
-                        f"Warning during schema compilation for {schema.class_name} - "
-                        f"compilation key \"{compilation_key.key}\" failed to compile:\n"
-                        f"{compilation_key.error_message}")
+        for keyword, data in self._keyword_registry.dispatch(schema.key_value_definition):
+            try:
+                keyword.compile(schema, data, class_context, compilation_context)
+            except KeywordCompilationException as exception:
+                print(
+                    f"Warning during schema compilation for {schema.class_name} - "
+                    f"compilation key \"{keyword.key}\" failed to compile:\n"
+                    f"{exception.error_message}")
 
         constructor_parameters = class_context.constructor_parameters
         data_members = class_context.data_members
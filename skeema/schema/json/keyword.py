@@ -1,65 +1,36 @@
 import sys
-from abc import abstractmethod, ABCMeta
 
 from skeema.intermediate.parameter import Parameter
 from skeema.intermediate.data_member import DataMember
+from skeema.schema.keyword import Keyword, KeywordCompilationException
 from skeema.util import to_camel_case
 
 
-class Keyword(metaclass=ABCMeta):
-    def __init__(self):
-        self.data = None
-        self.error_message = None
-
-    @property
-    @abstractmethod
-    def key(self):
-        pass
-
-    def compile(self, schema, class_context, compilation_context):
-        self._precompile(schema)
-        if self.data:
-            compiled = self._compile(schema, class_context, compilation_context)
-            return compiled
-        else:
-            return False
-
-    def _precompile(self, schema):
-        data = schema.key_value_definition
-        if self.key in data:
-            self.data = data[self.key]
-
-    @abstractmethod
-    def _compile(self, schema, class_context, compilation_context):
-        pass
-
-
 class Type(Keyword):
     @property
     def key(self):
         return "type"
 
-    def _compile(self, schema, class_context, compilation_context):
-        class_type = self.data
+    def _compile(self, schema, data, class_context, compilation_context):
+        class_type = data
         class_context.class_type = class_type
 
         is_array = False
 
-        if class_type is 'object':
+        if class_type == 'object':
             class_context.base_classes.append('Object')
             return True
 
-        if class_type is 'null':
+        if class_type == 'null':
             return True
 
-        if class_type is 'array':
+        if class_type == 'array':
             is_array = True
             items = schema.key_value_definition['items']
             if type(items) is dict:
                 class_type = items['type']
             else:
-                self.error_message = 'Invalid array type'
-                return False
+                raise KeywordCompilationException('Invalid array type')
 
         klass_name = to_camel_case(class_type)
 
@@ -97,18 +68,18 @@ class Properties(Keyword):
     def key(self):
         return "properties"
 
-    def _compile(self, schema, class_context, compilation_context):
+    def _compile(self, schema, data, class_context, compilation_context):
         if class_context.class_type is None:
-            self.error_message = f"Schemas defining properties must be of type 'object'. " \
-                                 f"No type found."
-            return False
+            raise KeywordCompilationException(
+                "Schemas defining properties must be of type 'object'. No type found."
+            )
 
         if class_context.class_type != 'object':
-            self.error_message = f"Schemas defining properties must be of type 'object'. " \
-                                 f"Found type {class_context.class_type}."
-            return False
+            raise KeywordCompilationException(
+                f"Schemas defining properties must be of type 'object'. Found type {class_context.class_type}."
+            )
 
-        properties = self.data
+        properties = data
 
         for property_name in properties:
             data_member_values = dict()
@@ -125,8 +96,7 @@ class Properties(Keyword):
 
             if "$ref" in property:
                 reference = property["$ref"]
-                dependency_url = schema._resolve_dependency_url(reference)
-                dependency = schema._manager.get_schema(dependency_url)
+                dependency = schema._resolve_dependency(reference)
                 assert dependency.compiled is True
                 type_name = dependency.class_name
                 data_member_values['klass'] = type_name
@@ -158,29 +128,23 @@ class Properties(Keyword):
 
 
 class AllOf(Keyword):
-    def __init__(self):
-        super().__init__()
-
     @property
     def key(self):
         return "allOf"
 
-    def _compile(self, schema, class_context, compilation_context):
-        all_of = self.data
+    def _compile(self, schema, data, class_context, compilation_context):
+        all_of = data
 
         return True
 
 
 class Required(Keyword):
-    def __init__(self):
-        super().__init__()
-
     @property
     def key(self):
         return "required"
 
-    def _compile(self, schema, class_context, compilation_context):
-        required = self.data
+    def _compile(self, schema, data, class_context, compilation_context):
+        required = data
 
         constructor_parameters = class_context.constructor_parameters
 
@@ -65,8 +65,7 @@ class Schema(Base):
 
                 if "$ref" in property_definition:
                     reference_url = property_definition["$ref"]
-                    dependency_url = self._resolve_dependency_url(reference_url)
-                    schema = self._manager.get_schema(dependency_url)
+                    schema = self._resolve_dependency(reference_url)
                     class_name = schema.class_name
                 else:
                     class_name = to_camel_case(f"{property_name}_class")
@@ -91,8 +90,7 @@ class Schema(Base):
 
         elif keyword == "$ref":
             reference_url = self._key_value_definition["$ref"]
-            dependency_url = self._resolve_dependency_url(reference_url)
-            dependency = self._manager.get_schema(dependency_url)
+            dependency = self._resolve_dependency(reference_url)
             self.add_dependency(dependency)
 
         elif keyword == "allOf":
@@ -108,8 +106,7 @@ class Schema(Base):
                 if "$ref" in raw_schema:
                     # Find the schema in the manager
                     reference_url = raw_schema["$ref"]
-                    dependency_url = self._resolve_dependency_url(reference_url)
-                    dependency = self._manager.get_schema(dependency_url)
+                    dependency = self._resolve_dependency(reference_url)
                     # Update the combined class with the schema properties
                     property_names = dependency.properties
                     combined_class_definition["properties"].update(property_names)
@@ -0,0 +1,37 @@
+from abc import abstractmethod, ABCMeta
+
+
+class KeywordCompilationException(Exception):
+    def __init__(self, error_message):
+        self.error_message = error_message
+        super().__init__(error_message)
+
+
+class Keyword(metaclass=ABCMeta):
+    """
+    Compiles one key of a schema definition into the class context.
+
+    A keyword is shared by every schema it compiles, possibly from several threads, so the data of the key is passed
+    to it on each compile rather than stored on it.
+    """
+
+    @property
+    @abstractmethod
+    def key(self):
+        pass
+
+    def compile(self, schema, data, class_context, compilation_context):
+        """
+        :param data: The value of the key in the schema definition
+        :return: False if there is no data to compile
+        :raises KeywordCompilationException: If the data cannot be compiled
+        """
+
+        if data:
+            return self._compile(schema, data, class_context, compilation_context)
+        else:
+            return False
+
+    @abstractmethod
+    def _compile(self, schema, data, class_context, compilation_context):
+        pass
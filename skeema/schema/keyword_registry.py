@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, List, Tuple
+
+    from skeema.types import KeyValueDef
+
+    from .keyword import Keyword
+
+
+class KeywordRegistry:
+    """
+    Keyword Registry
+
+    Maps each key of a schema definition to the keyword handling it. Keywords run in the order they were registered,
+    as later keywords can build on the class context of earlier ones. Only the keywords whose keys are present in a
+    definition are dispatched.
+
+    Keywords are shared by every schema compiled with the registry, so they must not keep per compile state.
+    """
+
+    def __init__(self, keywords: Iterable[Keyword] = ()) -> None:
+        # Keyword and registration order, by key
+        self._handlers: Dict[str, Tuple[int, Keyword]] = {}
+        self._next_order: int = 0
+        # Key and keyword of each handler in registration order, rebuilt when the handlers change
+        self._dispatch_table: List[Tuple[str, Keyword]] = []
+        self._fingerprint: str = ''
+        for keyword in keywords:
+            self.register(keyword)
+
+    @property
+    def keywords(self) -> List[Keyword]:
+        return [keyword for _key, keyword in self._dispatch_table]
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        :return: The class names of the keywords in registration order, which change whenever the keywords do
+        """
+
+        return self._fingerprint
+
+    def _build_dispatch_table(self) -> None:
+        handlers: List[Tuple[int, Keyword]] = sorted(self._handlers.values(), key=lambda handler: handler[0])
+        self._dispatch_table = [(keyword.key, keyword) for _order, keyword in handlers]
+        self._fingerprint = '\0'.join(
+            f'{type(keyword).__module__}.{type(keyword).__qualname__}' for _key, keyword in self._dispatch_table
+        )
+
+    def register(self, keyword: Keyword) -> None:
+        """
+        Registers a keyword, after the keywords registered so far. A keyword registered for a key that already has one
+        replaces it, keeping its order.
+        """
+
+        handler: Tuple[int, Keyword] = self._handlers.get(keyword.key)
+        if handler is not None:
+            self._handlers[keyword.key] = (handler[0], keyword)
+        else:
+            self._handlers[keyword.key] = (self._next_order, keyword)
+            self._next_order += 1
+        self._build_dispatch_table()
+
+    def unregister(self, key: str) -> bool:
+        """
+        :return: True if a keyword was registered for the key
+        """
+
+        if self._handlers.pop(key, None) is None:
+            return False
+
+        self._build_dispatch_table()
+        return True
+
+    def get(self, key: str) -> Keyword:
+        handler: Tuple[int, Keyword] = self._handlers.get(key)
+        return handler[1] if handler is not None else None
+
+    def dispatch(self, key_value_definition: KeyValueDef) -> List[Tuple[Keyword, Any]]:
+        """
+        :return: The keyword and data of each key in the definition that has a keyword, in registration order
+        """
+
+        return [(keyword, key_value_definition[key]) for key, keyword in self._dispatch_table if key in key_value_definition]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from urllib.parse import unquote, urldefrag, urljoin, urlparse
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Optional, Tuple
+
+    from skeema.types import KeyValueDef
+
+
+class Resolver:
+    """
+    Resolver
+
+    Resolves $ref values to canonical urls, and indexes every subschema of the registered documents by the canonical
+    url of its JSON pointer, e.g. schemas/person.json#/definitions/address/properties/city.
+
+    A canonical url has no empty fragment, and its JSON pointer has its percent-encoding decoded. Resolved urls are
+    cached per base url and reference, and subschemas are looked up without walking their documents again.
+    """
+
+    def __init__(self) -> None:
+        self._resolved_urls: Dict[Tuple[str, str], str] = {}
+        # Subschemas by canonical url
+        self._subschemas: Dict[str, KeyValueDef] = {}
+        # Canonical urls of the subschemas of each document
+        self._document_urls: Dict[str, List[str]] = {}
+
+    @staticmethod
+    def escape_token(token: str) -> str:
+        return token.replace('~', '~0').replace('/', '~1')
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """
+        :return: The canonical form of the url
+        """
+
+        document_url, fragment = urldefrag(url)
+        if not fragment:
+            return document_url
+        return f'{document_url}#{unquote(fragment)}'
+
+    def resolve_url(self, base_url: str, reference: str) -> str:
+        """
+        :return: The canonical url of the reference, relative to the base url unless it is absolute
+        """
+
+        key: Tuple[str, str] = (base_url, reference)
+        url: Optional[str] = self._resolved_urls.get(key)
+        if url is None:
+            if urlparse(reference).netloc:
+                url = Resolver.normalize_url(reference)
+            else:
+                url = Resolver.normalize_url(urljoin(base_url, reference))
+            self._resolved_urls[key] = url
+        return url
+
+    def register_document(self, url: str, key_value_definition: KeyValueDef) -> None:
+        """
+        Indexes every subschema of the document, replacing the index of a previously registered document at the url.
+        """
+
+        document_url: str = Resolver.normalize_url(url)
+        self.unregister_document(document_url)
+
+        urls: List[str] = []
+        pending: List[Tuple[str, Any]] = [('', key_value_definition)]
+        while pending:
+            pointer, value = pending.pop()
+            if isinstance(value, dict):
+                url = f'{document_url}#{pointer}' if pointer else document_url
+                self._subschemas[url] = value
+                urls.append(url)
+                pending.extend((f'{pointer}/{Resolver.escape_token(key)}', child) for key, child in value.items())
+            elif isinstance(value, list):
+                pending.extend((f'{pointer}/{index}', child) for index, child in enumerate(value))
+
+        self._document_urls[document_url] = urls
+
+    def unregister_document(self, url: str) -> None:
+        for subschema_url in self._document_urls.pop(Resolver.normalize_url(url), []):
+            self._subschemas.pop(subschema_url, None)
+
+    def get(self, url: str) -> Optional[KeyValueDef]:
+        """
+        :return: The subschema at the canonical url, or None if no registered document contains it
+        """
+
+        return self._subschemas.get(url)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._subschemas
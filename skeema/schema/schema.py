@@ -1,19 +1,20 @@
 from __future__ import annotations
 
 from abc import abstractmethod, ABCMeta
-from urllib.parse import urlparse, urljoin
+from time import perf_counter
 from typing import TYPE_CHECKING
 
 from skeema.core import Compilable
 
+from .compile_cache import CompileCache
 from .compiler import Compiler
 
 if TYPE_CHECKING:
-    from typing import Dict
+    from typing import Dict, List, Optional
 
     from skeema.core import Handle
     from skeema.types import KeyValueDef
-    from skeema.intermediate import CompilationContext
+    from skeema.intermediate import CompilationContext, Representation
 
     from .schema_manager import SchemaManager
 
@@ -48,6 +49,14 @@ class Schema(Compilable, metaclass=ABCMeta):
         # Mapping of properties to class names - used during compilation
         self._property_map: PropertyNameToClassMap = dict()
 
+        # Whether the dependency node has been populated with this schema's dependencies
+        self._populated: bool = False
+
+        # Content address in the compile cache, computed when first needed
+        self._compile_key: Optional[str] = None
+        # Compiler fingerprint the compile key was computed with
+        self._compile_key_fingerprint: Optional[str] = None
+
     @property
     def key_value_definition(self) -> KeyValueDef:
         return self._key_value_definition
@@ -65,26 +74,104 @@ class Schema(Compilable, metaclass=ABCMeta):
         return self._property_map
 
     def _resolve_dependency_url(self, dependency_url_string: str) -> str:
-        dependency_url = urlparse(dependency_url_string)
-        if dependency_url.netloc:
-            return dependency_url_string
+        return self._manager.resolver.resolve_url(self._url, dependency_url_string)
 
-        # TODO
-        # Right now we assume the dependency is defined relative to this one.
+    def _resolve_dependency(self, dependency_url_string: str) -> Schema:
+        return self._manager.resolve_schema(self._url, dependency_url_string)
 
-        return urljoin(self._url, dependency_url_string)
+    @property
+    def compile_key(self) -> str:
+        """
+        The content address of the compiled schema, from its class name, its definition, the compile keys of its
+        dependencies and the fingerprint of its compiler. The dependencies must be populated.
+        """
+
+        fingerprint: str = self.compiler.fingerprint
+        if self._compile_key is None or self._compile_key_fingerprint != fingerprint:
+            handles: List[Handle] = [node.handle for node in self.dependency_node.dependency_nodes]
+            dependencies: List[Schema] = self._manager.get_schemas_from_handles(handles)
+            self._compile_key = CompileCache.key(
+                self._class_name,
+                self._key_value_definition,
+                (dependency.compile_key for dependency in dependencies),
+                fingerprint
+            )
+            self._compile_key_fingerprint = fingerprint
+        return self._compile_key
+
+    @property
+    def populated(self) -> bool:
+        return self._populated
 
     @abstractmethod
     def _populate_dependency_node(self) -> None:
         pass
 
-    def _compile(self, compilation_context: CompilationContext) -> None:
+    def populate(self, compilation_context: CompilationContext) -> None:
+        """
+        Runs the precompile step and populates the dependency node, without compiling anything.
+        Does nothing if the schema has already been populated.
+        """
+
+        if self._populated:
+            return
+        self._precompile(compilation_context)
         self._populate_dependency_node()
+        self._populated = True
+
+    def _invalidate(self) -> None:
+        """
+        Marks the schema as uncompiled and unpopulated, and removes its dependencies, so the next compile populates
+        and compiles it again.
+        """
+
+        self.dependency_node.remove_dependencies()
+        self._property_map = dict()
+        self._populated = False
+        self._compile_key = None
+        self._set_uncompiled()
+
+    def _set_key_value_definition(self, key_value_definition: KeyValueDef) -> None:
+        self._key_value_definition = key_value_definition
+        self._invalidate()
+
+    def _compile(self, compilation_context: CompilationContext) -> None:
+        if not self._populated:
+            self._populate_dependency_node()
+            self._populated = True
 
         child_dependency_nodes = self.dependency_node.resolve_dependencies()[:-1]
-        for child_dependency_node in child_dependency_nodes:
-            handle: Handle = child_dependency_node.handle
-            dependency: Schema = self._manager.get_schema_from_handle(handle)
+        handles: List[Handle] = [child_dependency_node.handle for child_dependency_node in child_dependency_nodes]
+        for dependency in self._manager.get_schemas_from_handles(handles):
             dependency.compile(compilation_context)
 
+        self._compile_representation(compilation_context)
+
+    def _compile_representation(self, compilation_context: CompilationContext) -> None:
+        """
+        Compiles only this schema into the compilation context. All dependencies must already be compiled.
+        When the context is profiling, the compile time is recorded under the schema url.
+        """
+
+        if not compilation_context.profile:
+            self._compile_cached_representation(compilation_context)
+            return
+
+        start: float = perf_counter()
+        self._compile_cached_representation(compilation_context)
+        compilation_context.record_compile_time(self._url, perf_counter() - start)
+
+    def _compile_cached_representation(self, compilation_context: CompilationContext) -> None:
+        compile_cache: CompileCache = self._manager.compile_cache
+        if compile_cache is None:
+            self.compiler.compile(self, compilation_context)
+            return
+
+        compile_key: str = self.compile_key
+        representation: Representation = compile_cache.get(compile_key)
+        if representation is not None:
+            compilation_context.register_representation(self._class_name, representation)
+            return
+
         self.compiler.compile(self, compilation_context)
+        compile_cache.put(compile_key, compilation_context.get_representation(self._class_name))
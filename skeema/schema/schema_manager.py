@@ -2,20 +2,56 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 from abc import abstractmethod, ABCMeta
+from urllib.parse import unquote, urldefrag
 
 from skeema.core.container import Container
+from skeema.core.dependency import DependencyAnalysis, DependencyGraph
 from skeema.core.handle import INVALID_HANDLE
+from skeema.intermediate import CompilationContext
+from skeema.util import to_camel_case
+
+from .resolver import Resolver
 
 if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Set
+
+    from skeema.core.dependency import DependencyStore
     from skeema.core.handle import Handle
     from skeema.types import KeyValueDef
 
+    from .compile_cache import CompileCache
     from .schema import Schema
 
 
 class SchemaManager(metaclass=ABCMeta):
-    def __init__(self) -> None:
+    """
+    Schema Manager
+
+    With a compile cache, schemas whose definitions and dependencies are unchanged since they were cached take their
+    compiled representations from the cache instead of compiling again.
+
+    Schemas added with a document url, i.e. without a fragment, are indexed by the resolver, so a reference to any of
+    their subschemas resolves to a schema, which is created on first use.
+    """
+
+    def __init__(self, compile_cache: CompileCache = None) -> None:
         self._container: Container = Container()
+        self._compile_cache: CompileCache = compile_cache
+        self._resolver: Resolver = Resolver()
+        # Urls of the schemas with a fragment, e.g. inline definitions and properties, by the url of their document
+        self._nested_schema_urls: Dict[str, Set[str]] = {}
+
+    @property
+    def compile_cache(self) -> CompileCache:
+        return self._compile_cache
+
+    @property
+    def resolver(self) -> Resolver:
+        return self._resolver
+
+    @property
+    def schemas(self) -> List[Schema]:
+        return self._container.objects
 
     def create_schema(self, url: str, class_name: str, key_value_definition: KeyValueDef) -> Schema:
         if self.get_schema_handle(url) is not INVALID_HANDLE:
@@ -32,15 +68,172 @@ class SchemaManager(metaclass=ABCMeta):
 
     def add_schema(self, schema: Schema) -> Handle:
         handle: Handle = self._container.add_object(schema.url, schema, schema.url)
+        if handle != INVALID_HANDLE:
+            document_url, fragment = urldefrag(schema.url)
+            if fragment:
+                self._nested_schema_urls.setdefault(document_url, set()).add(schema.url)
+            else:
+                self._resolver.register_document(schema.url, schema.key_value_definition)
         return handle
 
+    def remove_schema(self, url: str) -> bool:
+        if not self._container.remove_object(url):
+            return False
+
+        document_url, fragment = urldefrag(url)
+        if fragment:
+            nested_schema_urls: Set[str] = self._nested_schema_urls.get(document_url)
+            nested_schema_urls.discard(url)
+            if not nested_schema_urls:
+                del self._nested_schema_urls[document_url]
+        else:
+            self._resolver.unregister_document(url)
+        return True
+
+    def compact(self) -> int:
+        return self._container.compact()
+
     def get_schema_handle(self, url: str) -> Handle:
         return self._container.get_object_handle(url)
 
     def get_schema_from_handle(self, handle: Handle) -> Schema:
         return self._container.get_object(handle)
 
+    def get_schemas_from_handles(self, handles: Iterable[Handle]) -> List[Schema]:
+        return self._container.get_objects(handles)
+
     def get_schema(self, url: str) -> Schema:
         handle: Handle = self.get_schema_handle(url)
         schema: Schema = self.get_schema_from_handle(handle)
         return schema
+
+    def resolve_schema(self, base_url: str, reference: str) -> Schema:
+        """
+        Finds the schema a reference points to, creating it if the reference points into an indexed document.
+        :param base_url: The url of the schema making the reference
+        :param reference: The reference, e.g. the value of a $ref
+        :return: The schema, or None if the reference cannot be resolved
+        """
+
+        url: str = self._resolver.resolve_url(base_url, reference)
+        schema: Schema = self.get_schema(url)
+        if schema is not None:
+            return schema
+
+        key_value_definition: KeyValueDef = self._resolver.get(url)
+        if key_value_definition is None:
+            return None
+
+        token: str = unquote(urldefrag(url).fragment.rsplit('/', 1)[-1]).replace('~1', '/').replace('~0', '~')
+        if not token.isidentifier():
+            token = f'schema_{token}'
+        return self.create_schema(url, to_camel_case(token), key_value_definition)
+
+    def get_dependent_schemas(self, schemas: Iterable[Schema]) -> List[Schema]:
+        """
+        Finds the given schemas and every schema that depends on them, directly or transitively, using the reverse
+        edges of the dependency store.
+        :return: The schemas, ordered so each schema comes after its dependencies
+        """
+
+        dependency_store: DependencyStore = self._container.dependency_store
+        indices: List[int] = dependency_store.dependent_closure(schema.dependency_node.index for schema in schemas)
+        return self.get_schemas_from_handles(dependency_store.handle(index) for index in indices)
+
+    def invalidate(self, url: str, compilation_context: CompilationContext = None) -> List[Schema]:
+        """
+        Marks the schema and every schema that depends on it as uncompiled, so the next compile redoes only them.
+        :param url: The url of the schema
+        :param compilation_context: A context the schemas were compiled into. Their representations and compile times
+                                    are removed from it.
+        :return: The invalidated schemas, ordered so each schema comes after its dependencies
+        """
+
+        schema: Schema = self.get_schema(url)
+        if schema is None:
+            return []
+
+        invalidated_schemas: List[Schema] = self.get_dependent_schemas([schema])
+        for invalidated_schema in invalidated_schemas:
+            invalidated_schema._invalidate()
+            if compilation_context is not None:
+                compilation_context.remove_representation(invalidated_schema.class_name)
+                compilation_context.remove_compile_time(invalidated_schema.url)
+
+        return invalidated_schemas
+
+    def reload_schemas(self, key_value_definitions: Dict[str, KeyValueDef]) -> CompilationContext:
+        """
+        Replaces the definitions of changed schemas, then compiles only them and the schemas that depend on them.
+
+        The schemas created from the old definitions, such as inline definitions and properties, are removed and
+        created again from the new definitions.
+
+        :param key_value_definitions: The new definition of each changed schema, by url
+        :return: A context holding the representations of the recompiled schemas only
+        """
+
+        changed_schemas: List[Schema] = [
+            schema for schema in (self.get_schema(url) for url in key_value_definitions) if schema is not None
+        ]
+        nested_urls: Set[str] = set()
+        for schema in changed_schemas:
+            nested_urls.update(self._nested_schema_urls.get(schema.url, ()))
+        nested_schemas: List[Schema] = [self.get_schema(url) for url in nested_urls]
+
+        affected_schemas: List[Schema] = [
+            schema for schema in self.get_dependent_schemas(changed_schemas + nested_schemas)
+            if schema.url not in nested_urls
+        ]
+        for schema in affected_schemas:
+            schema._invalidate()
+        for schema in changed_schemas:
+            schema._set_key_value_definition(key_value_definitions[schema.url])
+            if not urldefrag(schema.url).fragment:
+                self._resolver.register_document(schema.url, schema.key_value_definition)
+        for url in nested_urls:
+            self.remove_schema(url)
+
+        compilation_context: CompilationContext = CompilationContext()
+        for schema in affected_schemas:
+            schema.compile(compilation_context)
+        return compilation_context
+
+    def find_circular_dependencies(self) -> List[List[str]]:
+        """
+        Populates the dependencies of every schema with cycle detection turned off, then reports every circular
+        dependency at once instead of failing on the first one.
+
+        Cycle detection is turned back on if no cycles are found. Otherwise the schemas in the reported cycles cannot
+        be compiled, and the manager should be rebuilt once they are fixed.
+
+        :return: The debug names of the schemas in each cycle
+        """
+
+        dependency_store: DependencyStore = self._container.dependency_store
+        dependency_store.detect_cycles = False
+
+        compilation_context: CompilationContext = CompilationContext()
+        # Populating a schema can create new schemas, which must be populated as well
+        unpopulated_schemas: List[Schema] = self.schemas
+        while unpopulated_schemas:
+            for schema in unpopulated_schemas:
+                schema.populate(compilation_context)
+            unpopulated_schemas = [schema for schema in self.schemas if not schema.populated]
+
+        cycles = DependencyGraph.find_cycles(dependency_store)
+        if not cycles:
+            dependency_store.detect_cycles = True
+
+        return [[node.debug_name for node in cycle] for cycle in cycles]
+
+    def analyze_dependencies(self, compilation_context: CompilationContext = None) -> DependencyAnalysis:
+        """
+        Analyzes the dependency graph of the schemas populated so far.
+        :param compilation_context: A profiling context used to compile the schemas. If given, each schema is weighted
+                                    by its measured compile time.
+        :return: The analysis
+        """
+
+        weights = compilation_context.compile_times if compilation_context is not None else None
+        return DependencyAnalysis(self._container.dependency_store, weights)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from skeema.file.file_watcher import FileWatcher
+from skeema.intermediate.compiler.compiler import Compiler as ClassCompiler
+
+if TYPE_CHECKING:
+    from threading import Event
+    from typing import Callable, Dict, List, Optional
+
+    from skeema.file.file import FileManager
+    from skeema.intermediate import CompilationContext
+    from skeema.types import KeyValueDef
+
+    from .schema_manager import SchemaManager
+
+
+class SchemaWatcher:
+    """
+    Schema Watcher
+
+    Watches the files of the schemas in a schema manager, where each schema url is the path of its file. When files
+    change, they are reloaded, and only the changed schemas and the schemas depending on them are compiled again and
+    have their classes rebuilt.
+    """
+
+    def __init__(self, file_manager: FileManager, schema_manager: SchemaManager, interval: float = 1.0):
+        self._file_watcher: FileWatcher = FileWatcher(file_manager, interval)
+        self._file_manager: FileManager = file_manager
+        self._schema_manager: SchemaManager = schema_manager
+
+    @property
+    def file_watcher(self) -> FileWatcher:
+        return self._file_watcher
+
+    def poll(self) -> Optional[CompilationContext]:
+        """
+        Reloads the changed files and recompiles the affected schemas.
+        :return: A context holding the representations of the recompiled schemas, or None if nothing changed
+        """
+
+        changed_paths: List[str] = self._file_watcher.changed_paths()
+        if not changed_paths:
+            return None
+
+        self._file_watcher.reload(changed_paths)
+        key_value_definitions: Dict[str, KeyValueDef] = {
+            path: self._file_manager.get_file(path).content for path in changed_paths
+            if self._schema_manager.get_schema(path) is not None
+        }
+
+        compilation_context: CompilationContext = self._schema_manager.reload_schemas(key_value_definitions)
+        ClassCompiler().compile(compilation_context)
+        return compilation_context
+
+    def watch(
+            self,
+            on_change: Callable[[CompilationContext], None],
+            stop: Event,
+            on_error: Optional[Callable[[Exception], None]] = None
+    ) -> None:
+        """
+        Polls for changes until stopped, calling on_change with the context of each recompile. A file that fails to
+        reload does not stop watching, and is reloaded again by the next poll.
+        :param on_change: Called with the result of each poll that found changes
+        :param stop: Stops watching once set
+        :param on_error: Called with the error of each poll that failed to reload the changed files
+        """
+
+        while not stop.is_set():
+            try:
+                compilation_context: Optional[CompilationContext] = self.poll()
+            except FileWatcher.RELOAD_ERRORS as error:
+                if on_error is not None:
+                    on_error(error)
+            else:
+                if compilation_context is not None:
+                    on_change(compilation_context)
+            stop.wait(self._file_watcher.interval)
@@ -1,4 +1,7 @@
 import pytest
+import json
+import os
+import sys
 
 
 def uid(v):
@@ -28,3 +31,31 @@ def id3():
 @pytest.fixture
 def id4():
     return uid(4)
+
+
+@pytest.fixture(name="contention")
+def increase_thread_contention():
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(switch_interval)
+
+
+@pytest.fixture(name="write_json")
+def fixture_write_json(tmp_path):
+    mtimes = {}
+
+    def write_json(name, content, mtime_ns=None):
+        """
+        Writes the content as JSON to the path relative to tmp_path. Unless given, the modification time is advanced
+        explicitly on every write, as writes can land within the file system's time resolution.
+        """
+
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(content))
+        mtimes[name] = mtime_ns if mtime_ns is not None else mtimes.get(name, 1_000_000_000) + 1_000_000_000
+        os.utime(path, ns=(mtimes[name], mtimes[name]))
+        return str(path)
+
+    return write_json
@@ -1,3 +1,5 @@
+import random
+
 import pytest
 
 from skeema.core.dependency import (
@@ -62,6 +64,48 @@ class TestDependency:
             with pytest.raises(CircularDependencyException):
                 d0.add_dependency(d0)
 
+        def test_does_not_add_dependency_that_creates_a_cycle(self, container, id0, id1):
+            d0 = create_dependency(container, id0)
+            d1 = create_dependency(container, id1)
+            d0.add_dependency(d1)
+
+            with pytest.raises(CircularDependencyException):
+                d1.add_dependency(d0)
+
+            assert d1.dependency_node.dependency_nodes == []
+            assert d0.dependency_node.dependent_nodes == []
+
+        def test_keeps_dependencies_ordered_before_dependents(self, container):
+            num_dependencies = 60
+            dependencies = [create_dependency(container, f"id{i}") for i in range(num_dependencies)]
+            edges = set()
+
+            def reaches(source, target):
+                stack = [source]
+                seen = set()
+                while stack:
+                    current = stack.pop()
+                    if current == target:
+                        return True
+                    if current not in seen:
+                        seen.add(current)
+                        stack.extend(b for a, b in edges if a == current)
+                return False
+
+            rng = random.Random(0)
+            for _ in range(400):
+                a, b = rng.randrange(num_dependencies), rng.randrange(num_dependencies)
+                creates_cycle = a == b or reaches(b, a)
+                if creates_cycle:
+                    with pytest.raises(CircularDependencyException):
+                        dependencies[a].add_dependency(dependencies[b])
+                else:
+                    dependencies[a].add_dependency(dependencies[b])
+                    edges.add((a, b))
+
+            for a, b in edges:
+                assert dependencies[b].dependency_node.order < dependencies[a].dependency_node.order
+
     class TestResolveDependencies:
         def test_returns_a_list_of_the_graph_dependency_nodes_in_the_correct_order(self, container, id0, id1, id2, id3, id4):
             d0 = create_dependency(container, id0)
@@ -96,3 +140,34 @@ class TestDependency:
             ]
 
             assert dependency_nodes == expected_dependency_nodes
+
+        def test_resolves_chains_deeper_than_the_recursion_limit(self, container):
+            depth = 5000
+            dependencies = [create_dependency(container, f"id{i}") for i in range(depth)]
+            for dependency, child in zip(dependencies[1:], dependencies):
+                dependency.add_dependency(child)
+
+            dependency_nodes = dependencies[-1].dependency_node.resolve_dependencies()
+            assert dependency_nodes == [dependency.dependency_node for dependency in dependencies]
+
+        def test_resolves_each_shared_dependency_once(self, container, id0, id1, id2, id3):
+            d0 = create_dependency(container, id0)
+            d1 = create_dependency(container, id1)
+            d2 = create_dependency(container, id2)
+            d3 = create_dependency(container, id3)
+
+            d3.add_dependency(d1)
+            d3.add_dependency(d2)
+            d3.add_dependency(d0)
+            d1.add_dependency(d0)
+            d2.add_dependency(d0)
+
+            dependency_nodes = d3.dependency_node.resolve_dependencies()
+            expected_dependency_nodes = [
+                d0.dependency_node,
+                d1.dependency_node,
+                d2.dependency_node,
+                d3.dependency_node
+            ]
+
+            assert dependency_nodes == expected_dependency_nodes
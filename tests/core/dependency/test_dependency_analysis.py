@@ -0,0 +1,122 @@
+import json
+import tracemalloc
+
+import pytest
+
+from skeema.core.handle import Handle
+from skeema.core.dependency import DependencyAnalysis, DependencyStore, CircularDependencyException
+
+
+@pytest.fixture(name="store")
+def create_store():
+    #   n4
+    #  /  \
+    # n3  n2
+    #  \  /
+    #   n1
+    #   |
+    #   n0
+    store = DependencyStore()
+    n0, n1, n2, n3, n4 = [store.add_node(Handle(i, 1), f"n{i}") for i in range(5)]
+    n1.add_dependency(n0)
+    n2.add_dependency(n1)
+    n3.add_dependency(n1)
+    n4.add_dependency(n3)
+    n4.add_dependency(n2)
+    return store
+
+
+def metrics_by_name(analysis):
+    return {metrics['name']: metrics for metrics in analysis.metrics()}
+
+
+class TestDependencyAnalysis:
+    def test_reports_fan_in_and_fan_out(self, store):
+        metrics = metrics_by_name(DependencyAnalysis(store))
+        assert metrics['n1']['fan_in'] == 2
+        assert metrics['n1']['fan_out'] == 1
+        assert metrics['n4']['fan_in'] == 0
+        assert metrics['n4']['fan_out'] == 2
+
+    def test_reports_depth(self, store):
+        metrics = metrics_by_name(DependencyAnalysis(store))
+        assert [metrics[f"n{i}"]['depth'] for i in range(5)] == [0, 1, 2, 2, 3]
+
+    def test_reports_transitive_dependents(self, store):
+        analysis = DependencyAnalysis(store)
+        metrics = metrics_by_name(analysis)
+        assert [metrics[f"n{i}"]['dependents'] for i in range(5)] == [4, 3, 1, 1, 0]
+        assert [node.debug_name for node in analysis.most_invalidating(2)] == ['n0', 'n1']
+
+    def test_reports_critical_path(self, store):
+        analysis = DependencyAnalysis(store)
+        assert analysis.critical_path_length == 4
+        path = [node.debug_name for node in analysis.critical_path()]
+        assert path[:2] == ['n0', 'n1']
+        assert path[-1] == 'n4'
+
+    def test_weights_critical_path(self, store):
+        analysis = DependencyAnalysis(store, weights={'n2': 10.0})
+        assert analysis.critical_path_length == 13.0
+        assert [node.debug_name for node in analysis.critical_path()] == ['n0', 'n1', 'n2', 'n4']
+
+    def test_exports_json(self, store):
+        graph = json.loads(DependencyAnalysis(store).to_json())
+        assert len(graph['nodes']) == 5
+        assert {'from': 'n4', 'to': 'n3'} in graph['edges']
+        assert len(graph['edges']) == 5
+
+    def test_exports_dot(self, store):
+        dot = DependencyAnalysis(store).to_dot()
+        assert dot.startswith('digraph dependencies {')
+        assert '"n4" -> "n3"' in dot
+        assert dot.count('->') == 5
+
+    def test_exports_dot_labels_with_line_breaks(self, store):
+        dot = DependencyAnalysis(store).to_dot()
+        assert '"n0\\ndependents=4 depth=0"' in dot
+
+    def test_highlights_only_critical_path_edges_in_dot(self, store):
+        analysis = DependencyAnalysis(store, weights={'n2': 10.0})
+        dot = analysis.to_dot()
+        assert '"n4" -> "n2" [color=red];' in dot
+        assert '"n2" -> "n1" [color=red];' in dot
+        assert '"n4" -> "n3";' in dot
+
+    def test_counts_repeated_edges_once(self):
+        store = DependencyStore()
+        person, book = [store.add_node(Handle(i, 1), name) for i, name in enumerate(['person', 'book'])]
+        book.add_dependency(person)
+        book.add_dependency(person)
+        analysis = DependencyAnalysis(store)
+        metrics = metrics_by_name(analysis)
+        assert metrics['book']['fan_out'] == 1
+        assert metrics['person']['fan_in'] == 1
+        assert analysis.to_dot().count('->') == 1
+        assert len(json.loads(analysis.to_json())['edges']) == 1
+
+    def test_keeps_memory_linear_on_a_long_chain(self):
+        # Keeping the dependent bitset of every node would take n * n / 8 bytes, 8 MB for this chain
+        num_nodes = 8000
+        store = DependencyStore()
+        nodes = [store.add_node(Handle(i, 1), f"n{i}") for i in range(num_nodes)]
+        for dependent, dependency in zip(nodes[1:], nodes):
+            dependent.add_dependency(dependency)
+
+        tracemalloc.start()
+        try:
+            analysis = DependencyAnalysis(store)
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert metrics_by_name(analysis)['n0']['dependents'] == num_nodes - 1
+        assert peak < num_nodes * num_nodes / 8
+
+    def test_throws_circular_dependency_exception_with_cycle(self):
+        store = DependencyStore(detect_cycles=False)
+        n0, n1 = [store.add_node(Handle(i, 1), f"n{i}") for i in range(2)]
+        n0.add_dependency(n1)
+        n1.add_dependency(n0)
+        with pytest.raises(CircularDependencyException):
+            DependencyAnalysis(store)
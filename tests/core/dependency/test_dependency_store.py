@@ -0,0 +1,334 @@
+import pytest
+
+from skeema.core.handle import Handle
+from skeema.core.dependency import (
+    DependencyGraph,
+    DependencyStore,
+    CircularDependencyException,
+    ForeignDependencyException
+)
+
+
+@pytest.fixture(name="store")
+def create_store():
+    store = DependencyStore()
+    return store
+
+
+def add_nodes(store, count):
+    return [store.add_node(Handle(i, 1), f"node{i}") for i in range(count)]
+
+
+class TestDependencyStore:
+    class TestAddEdge:
+        def test_keeps_dependencies_in_insertion_order(self, store):
+            n0, n1, n2, n3 = add_nodes(store, 4)
+            n0.add_dependency(n3)
+            n0.add_dependency(n1)
+            n0.add_dependency(n2)
+            assert n0.dependency_nodes == [n3, n1, n2]
+            assert n1.dependent_nodes == [n0]
+
+        def test_throws_circular_dependency_exception_with_pending_edges(self, store):
+            n0, n1, n2 = add_nodes(store, 3)
+            n0.add_dependency(n1)
+            n1.add_dependency(n2)
+            with pytest.raises(CircularDependencyException):
+                n2.add_dependency(n0)
+
+        def test_throws_circular_dependency_exception_with_built_edges(self, store):
+            n0, n1, n2 = add_nodes(store, 3)
+            n0.add_dependency(n1)
+            n1.add_dependency(n2)
+            store.build()
+            with pytest.raises(CircularDependencyException):
+                n2.add_dependency(n0)
+
+        def test_throws_foreign_dependency_exception_with_node_of_another_store(self, store):
+            node = store.add_node(Handle(0, 1), "node")
+            foreign_node = DependencyStore().add_node(Handle(1, 1), "foreign")
+            with pytest.raises(ForeignDependencyException):
+                node.add_dependency(foreign_node)
+
+        def test_builds_automatically_once_pending_edges_outnumber_built_edges(self, store):
+            nodes = add_nodes(store, DependencyStore.MIN_PENDING_EDGES_TO_BUILD + 1)
+            for node in nodes[1:]:
+                node.add_dependency(nodes[0])
+            assert store.num_pending_edges == 0
+            assert store.num_edges == DependencyStore.MIN_PENDING_EDGES_TO_BUILD
+
+    class TestBuild:
+        def test_merges_pending_edges_with_built_edges(self, store):
+            n0, n1, n2, n3 = add_nodes(store, 4)
+            n0.add_dependency(n1)
+            n2.add_dependency(n1)
+            store.build()
+            n0.add_dependency(n2)
+            n3.add_dependency(n0)
+            assert store.num_pending_edges == 2
+
+            store.build()
+            assert store.num_pending_edges == 0
+            assert store.num_edges == 4
+            assert n0.dependency_nodes == [n1, n2]
+            assert n1.dependent_nodes == [n0, n2]
+            assert n3.dependency_nodes == [n0]
+
+        def test_includes_nodes_added_after_previous_build(self, store):
+            n0, n1 = add_nodes(store, 2)
+            store.build()
+            n2 = store.add_node(Handle(2, 1), "node2")
+            n2.add_dependency(n0)
+            store.build()
+            assert n2.dependency_nodes == [n0]
+
+    class TestRemoveNode:
+        def test_removes_edges_to_and_from_node(self, store):
+            n0, n1, n2 = add_nodes(store, 3)
+            n0.add_dependency(n1)
+            n1.add_dependency(n2)
+            n0.add_dependency(n2)
+            store.remove_node(n1.index)
+            assert n0.dependency_nodes == [n2]
+            assert n2.dependent_nodes == [n0]
+            assert store.num_edges == 1
+
+        def test_removes_pending_and_built_edges_without_building(self, store):
+            n0, n1, n2 = add_nodes(store, 3)
+            n0.add_dependency(n1)
+            store.build()
+            n1.add_dependency(n2)
+            store.remove_node(n1.index)
+            assert store.num_pending_edges == 0
+            assert store.num_edges == 0
+            assert n0.dependency_nodes == []
+            assert n2.dependent_nodes == []
+
+        def test_does_not_keep_edges_of_removed_node_when_index_is_reused(self, store):
+            n0, n1, n2 = add_nodes(store, 3)
+            n0.add_dependency(n1)
+            n1.add_dependency(n2)
+            store.build()
+            store.remove_node(n1.index)
+            n1 = store.add_node(Handle(n1.index, 2), "node1")
+            n2.add_dependency(n1)
+            assert n1.dependency_nodes == []
+            assert n1.dependent_nodes == [n2]
+            store.build()
+            assert n0.dependency_nodes == []
+            assert n1.dependency_nodes == []
+            assert n1.dependent_nodes == [n2]
+            assert store.num_edges == 1
+
+    class TestRemoveDependencies:
+        def test_removes_edges_from_node_only(self, store):
+            n0, n1, n2, n3 = add_nodes(store, 4)
+            n0.add_dependency(n1)
+            n0.add_dependency(n2)
+            n1.add_dependency(n2)
+            n3.add_dependency(n0)
+            store.remove_dependencies(n0.index)
+            assert n0.dependency_nodes == []
+            assert n1.dependent_nodes == []
+            assert n2.dependent_nodes == [n1]
+            assert n0.dependent_nodes == [n3]
+            assert store.num_edges == 2
+
+        def test_removes_built_edges_without_building(self, store):
+            n0, n1, n2, n3 = add_nodes(store, 4)
+            n0.add_dependency(n1)
+            n0.add_dependency(n2)
+            n1.add_dependency(n2)
+            n3.add_dependency(n0)
+            store.build()
+            store.remove_dependencies(n0.index)
+            assert n0.dependency_nodes == []
+            assert n1.dependent_nodes == []
+            assert n2.dependent_nodes == [n1]
+            assert n0.dependent_nodes == [n3]
+            assert store.num_edges == 2
+
+        def test_keeps_dependencies_added_after_removal(self, store):
+            n0, n1, n2 = add_nodes(store, 3)
+            n0.add_dependency(n1)
+            store.build()
+            store.remove_dependencies(n0.index)
+            n0.add_dependency(n2)
+            n0.add_dependency(n1)
+            assert n0.dependency_nodes == [n2, n1]
+            assert n1.dependent_nodes == [n0]
+            store.build()
+            assert n0.dependency_nodes == [n2, n1]
+            assert n1.dependent_nodes == [n0]
+            assert n2.dependent_nodes == [n0]
+            assert store.num_edges == 2
+
+        def test_allows_reversed_edge_to_be_added(self, store):
+            n0, n1 = add_nodes(store, 2)
+            n0.add_dependency(n1)
+            store.remove_dependencies(n0.index)
+            n1.add_dependency(n0)
+            assert n1.resolve_dependencies() == [n0, n1]
+
+        def test_invalidates_cached_orders_through_node(self, store):
+            n0, n1, n2 = add_nodes(store, 3)
+            n2.add_dependency(n1)
+            n1.add_dependency(n0)
+            n2.resolve_dependencies()
+            store.remove_dependencies(n1.index)
+            assert n2.resolve_dependencies() == [n1, n2]
+
+    class TestDependentClosure:
+        def test_orders_transitive_dependents_after_their_dependencies(self, store):
+            n0, n1, n2, n3, n4 = add_nodes(store, 5)
+            n2.add_dependency(n1)
+            n1.add_dependency(n0)
+            n3.add_dependency(n0)
+            n2.add_dependency(n3)
+            closure = store.dependent_closure([n0.index])
+            assert sorted(closure) == [n0.index, n1.index, n2.index, n3.index]
+            assert closure[0] == n0.index
+            assert closure[-1] == n2.index
+
+    class TestTruncate:
+        def test_drops_trailing_removed_nodes(self, store):
+            n0, n1, n2 = add_nodes(store, 3)
+            n0.add_dependency(n1)
+            n2.add_dependency(n0)
+            store.remove_node(n2.index)
+            store.truncate(2)
+            assert store.num_nodes == 2
+            assert n0.dependency_nodes == [n1]
+            assert n0.dependent_nodes == []
+
+
+class TestDependencyNode:
+    def test_views_of_the_same_node_are_equal(self, store):
+        n0, n1 = add_nodes(store, 2)
+        assert store.node(0) == n0
+        assert store.node(0) != n1
+        assert len({store.node(0), n0, n1}) == 2
+
+
+class TestFindCycles:
+    @pytest.fixture(name="store")
+    def create_store_without_cycle_detection(self):
+        return DependencyStore(detect_cycles=False)
+
+    def test_finds_every_cycle_in_one_pass(self, store):
+        nodes = add_nodes(store, 7)
+        # Cycle 0 -> 1 -> 2 -> 0, cycle 3 <-> 4, self cycle 5, and 6 depending on all of them
+        nodes[0].add_dependency(nodes[1])
+        nodes[1].add_dependency(nodes[2])
+        nodes[2].add_dependency(nodes[0])
+        nodes[3].add_dependency(nodes[4])
+        nodes[4].add_dependency(nodes[3])
+        nodes[5].add_dependency(nodes[5])
+        for node in nodes[:6]:
+            nodes[6].add_dependency(node)
+
+        cycles = DependencyGraph.find_cycles(store)
+        cycle_names = sorted([node.debug_name for node in cycle] for cycle in cycles)
+        assert cycle_names == [["node0", "node1", "node2"], ["node3", "node4"], ["node5"]]
+
+    def test_finds_no_cycles_in_acyclic_graph(self, store):
+        nodes = add_nodes(store, 4)
+        nodes[3].add_dependency(nodes[1])
+        nodes[3].add_dependency(nodes[2])
+        nodes[1].add_dependency(nodes[0])
+        nodes[2].add_dependency(nodes[0])
+        assert DependencyGraph.find_cycles(store) == []
+
+    def test_orders_components_with_dependencies_first(self, store):
+        nodes = add_nodes(store, 3)
+        nodes[0].add_dependency(nodes[2])
+        nodes[2].add_dependency(nodes[1])
+        components = DependencyGraph.strongly_connected_components(store)
+        assert components == [[nodes[1]], [nodes[2]], [nodes[0]]]
+
+    def test_reenabling_detection_restores_topological_order(self, store):
+        nodes = add_nodes(store, 3)
+        nodes[0].add_dependency(nodes[1])
+        nodes[1].add_dependency(nodes[2])
+        store.detect_cycles = True
+        assert nodes[2].order < nodes[1].order < nodes[0].order
+        with pytest.raises(CircularDependencyException):
+            nodes[2].add_dependency(nodes[0])
+
+    def test_reenabling_detection_throws_circular_dependency_exception_with_cycle(self, store):
+        nodes = add_nodes(store, 2)
+        nodes[0].add_dependency(nodes[1])
+        nodes[1].add_dependency(nodes[0])
+        with pytest.raises(CircularDependencyException):
+            store.detect_cycles = True
+        assert store.detect_cycles is False
+
+
+class TestResolutionCache:
+    def test_caches_resolved_order(self, store):
+        n0, n1, n2 = add_nodes(store, 3)
+        n2.add_dependency(n1)
+        n1.add_dependency(n0)
+        assert store.cached_resolution(n2.index) is None
+        resolved = n2.resolve_dependencies()
+        assert store.cached_resolution(n2.index) == [n0.index, n1.index, n2.index]
+        assert n2.resolve_dependencies() == resolved
+
+    def test_invalidates_order_when_edge_is_added_in_reachable_subgraph(self, store):
+        n0, n1, n2, n3 = add_nodes(store, 4)
+        n2.add_dependency(n1)
+        n1.add_dependency(n0)
+        n2.resolve_dependencies()
+        n0.add_dependency(n3)
+        assert store.cached_resolution(n2.index) is None
+        assert n2.resolve_dependencies() == [n3, n0, n1, n2]
+
+    def test_keeps_order_when_edge_is_added_outside_reachable_subgraph(self, store):
+        n0, n1, n2, n3 = add_nodes(store, 4)
+        n1.add_dependency(n0)
+        n1.resolve_dependencies()
+        n3.add_dependency(n2)
+        n2.add_dependency(n1)
+        assert store.cached_resolution(n1.index) == [n0.index, n1.index]
+
+    def test_reuses_cached_order_of_dependency(self, store):
+        n0, n1, n2, n3, n4 = add_nodes(store, 5)
+        #   n4
+        #  /  \
+        # n3  n2
+        #  \  /
+        #   n1
+        #   |
+        #   n0
+        n1.add_dependency(n0)
+        n2.add_dependency(n1)
+        n3.add_dependency(n1)
+        n4.add_dependency(n3)
+        n4.add_dependency(n2)
+        n2.resolve_dependencies()
+        assert n4.resolve_dependencies() == [n0, n1, n3, n2, n4]
+
+    def test_clears_cache_when_node_is_removed(self, store):
+        n0, n1 = add_nodes(store, 2)
+        n1.add_dependency(n0)
+        n1.resolve_dependencies()
+        store.remove_node(n0.index)
+        assert store.cached_resolution(n1.index) is None
+        assert n1.resolve_dependencies() == [n1]
+
+    def test_keeps_orders_without_removed_node(self, store):
+        n0, n1, n2 = add_nodes(store, 3)
+        n1.add_dependency(n0)
+        n1.resolve_dependencies()
+        store.remove_node(n2.index)
+        assert store.cached_resolution(n1.index) == [n0.index, n1.index]
+
+    def test_detects_cycle_through_cached_dependency(self):
+        store = DependencyStore(detect_cycles=False)
+        n0, n1, n2 = add_nodes(store, 3)
+        n1.add_dependency(n0)
+        n1.resolve_dependencies()
+        n0.add_dependency(n2)
+        n2.add_dependency(n1)
+        with pytest.raises(CircularDependencyException):
+            n2.resolve_dependencies()
@@ -1,12 +1,13 @@
 import pytest
 import sys
+import threading
 
 from skeema.core.handle import INVALID_HANDLE
 from skeema.core.container import Container
 
 
 class MyObject:
-    def on_add_to_container(self, handle, debug_name):
+    def on_add_to_container(self, handle, debug_name, dependency_store=None):
         pass
 
 
@@ -35,6 +36,18 @@ class TestContainer:
             handle = container.add_object(id0, MyObject(), id0)
             assert handle == INVALID_HANDLE
 
+    class TestAddObjects:
+        def test_returns_a_handle_per_object(self, container, id0, id1):
+            objects = [MyObject(), MyObject()]
+            handles = container.add_objects([(id0, objects[0], id0), (id1, objects[1], id1)])
+            assert container.get_objects(handles) == objects
+
+        def test_returns_invalid_handle_with_duplicate_id(self, container, id0, id1):
+            container.add_object(id0, MyObject(), id0)
+            handles = container.add_objects([(id0, MyObject(), id0), (id1, MyObject(), id1)])
+            assert handles[0] == INVALID_HANDLE
+            assert handles[1] != INVALID_HANDLE
+
     class TestGetObjectHandle:
         def test_returns_correct_handle_with_valid_id(self, container, id0):
             object_in = MyObject()
@@ -57,6 +70,56 @@ class TestContainer:
             object_out = container.get_object(INVALID_HANDLE)
             assert object_out is None
 
+    class TestGetObjects:
+        def test_returns_objects_for_valid_handles_and_none_otherwise(self, container, id0, id1):
+            object0 = MyObject()
+            object1 = MyObject()
+            handle0 = container.add_object(id0, object0, id0)
+            handle1 = container.add_object(id1, object1, id1)
+            objects_out = container.get_objects([handle1, INVALID_HANDLE, handle0])
+            assert objects_out[0] == object1
+            assert objects_out[1] is None
+            assert objects_out[2] == object0
+
+    class TestRemoveObject:
+        def test_removes_object_and_releases_reference(self, container, id0):
+            object_in = MyObject()
+            handle = container.add_object(id0, object_in, id0)
+            assert container.remove_object(id0) is True
+
+            assert container.get_object(handle) is None
+            assert container.get_object_handle(id0) == INVALID_HANDLE
+
+            expected_ref_count = 1
+            actual_ref_count = sys.getrefcount(object_in) - 1
+            assert expected_ref_count == actual_ref_count
+
+        def test_returns_false_with_unknown_id(self, container, id0):
+            assert container.remove_object(id0) is False
+
+        def test_keeps_other_objects(self, container, id0, id1, id2):
+            objects_in = [MyObject() for _ in range(3)]
+            handles = [container.add_object(_id, obj, _id) for _id, obj in zip((id0, id1, id2), objects_in)]
+            container.remove_object(id0)
+            container.remove_object(id2)
+            assert container.get_object(handles[1]) == objects_in[1]
+            assert container.remove_object(id1) is True
+
+        def test_allows_id_to_be_added_again(self, container, id0):
+            container.add_object(id0, MyObject(), id0)
+            container.remove_object(id0)
+            handle = container.add_object(id0, MyObject(), id0)
+            assert handle != INVALID_HANDLE
+
+    class TestCompact:
+        def test_reclaims_slots_of_removed_objects(self, container, id0, id1):
+            object_in = MyObject()
+            handle = container.add_object(id0, object_in, id0)
+            container.add_object(id1, MyObject(), id1)
+            container.remove_object(id1)
+            assert container.compact() == 1
+            assert container.get_object(handle) == object_in
+
     class TestClear:
         def test_removes_all_objects(self, container, id0):
             object_in = MyObject()
@@ -75,3 +138,29 @@ class TestContainer:
             expected_ref_count = 1
             actual_ref_count = sys.getrefcount(object_in) - 1
             assert expected_ref_count == actual_ref_count
+
+    class TestThreadSafe:
+        def test_adds_each_id_once_under_contention(self, contention):
+            container = Container(thread_safe=True)
+            num_threads = 8
+            num_ids = 500
+            objects = [MyObject() for _ in range(num_ids)]
+            added = [[] for _ in range(num_threads)]
+
+            def register(thread_index):
+                for i, obj in enumerate(objects):
+                    handle = container.add_object(f"id{i}", obj, f"id{i}")
+                    if handle != INVALID_HANDLE:
+                        added[thread_index].append(handle)
+
+            threads = [threading.Thread(target=register, args=(i,)) for i in range(num_threads)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            all_handles = [handle for handles in added for handle in handles]
+            assert len(all_handles) == num_ids
+            assert len(set(all_handles)) == num_ids
+            for i, obj in enumerate(objects):
+                assert container.get_object(container.get_object_handle(f"id{i}")) == obj
@@ -0,0 +1,38 @@
+import pytest
+
+from skeema.core.handle import Handle, INVALID_HANDLE
+
+
+class TestHandle:
+    def test_default_handle_is_invalid_handle(self):
+        handle = Handle()
+        assert handle == INVALID_HANDLE
+        assert handle.index == Handle.INVALID_INDEX
+        assert handle.generation == Handle.ZEROTH_GENERATION
+
+    def test_unpacks_index_and_generation(self):
+        handle = Handle(12, 34)
+        assert handle.index == 12
+        assert handle.generation == 34
+
+    def test_handles_with_same_index_and_generation_are_equal(self):
+        assert Handle(1, 2) == Handle(1, 2)
+        assert Handle(1, 2) != Handle(1, 3)
+        assert Handle(1, 2) != Handle(2, 2)
+
+    def test_is_not_equal_to_other_types(self):
+        assert Handle(1, 2) != (1, 2)
+        assert INVALID_HANDLE != None
+
+    def test_equal_handles_have_equal_hashes(self):
+        assert hash(Handle(5, 7)) == hash(Handle(5, 7))
+
+    def test_can_be_used_as_dict_key(self):
+        index = {Handle(0, 1): 'a', Handle(0, 2): 'b'}
+        assert index[Handle(0, 1)] == 'a'
+        assert index[Handle(0, 2)] == 'b'
+        assert Handle(1, 1) not in index
+
+    def test_has_no_instance_dict(self):
+        with pytest.raises(AttributeError):
+            Handle().__dict__
@@ -1,13 +1,16 @@
+import threading
+
 import pytest
 
 from skeema.core.handle import Handle, INVALID_HANDLE
 from skeema.core.handle import HandleInvalidException, HandleOutOfRangeException, HandleIsInactiveException, HandleIsRetiredException
 from skeema.core.handle_manager import HandleManager
+from skeema.core.compact_handle_manager import CompactHandleManager
 
 
-@pytest.fixture(name="manager")
-def create_handle_manager():
-    handle_manager = HandleManager()
+@pytest.fixture(name="manager", params=[HandleManager, CompactHandleManager])
+def create_handle_manager(request):
+    handle_manager = request.param()
     return handle_manager
 
 
@@ -30,6 +33,23 @@ class TestHandleManager:
             manager.issue_handle()
             assert manager.num_active_handles == active_handles + 1
 
+        def test_reuses_removed_entry_with_new_generation(self, manager):
+            manager.issue_handle()
+            removed_handle = manager.issue_handle()
+            manager.issue_handle()
+            manager.remove_handle(removed_handle)
+            handle = manager.issue_handle()
+            assert handle.index == removed_handle.index
+            assert handle.generation == removed_handle.generation + 1
+
+        def test_does_not_grow_entries_with_free_entry(self, manager):
+            handle = manager.issue_handle()
+            manager.issue_handle()
+            manager.remove_handle(handle)
+            manager.issue_handle()
+            assert manager.num_entries == 2
+            assert manager.num_free_entries == 0
+
     class TestRemoveHandle:
         @pytest.fixture(name="handle")
         def issue_handle(self, manager):
@@ -76,6 +96,58 @@ class TestHandleManager:
             with pytest.raises(HandleIsRetiredException):
                 manager.validate_handle(handle)
 
+    class TestCompact:
+        def test_reclaims_trailing_inactive_entries(self, manager):
+            handle0 = manager.issue_handle()
+            handle1 = manager.issue_handle()
+            handle2 = manager.issue_handle()
+            manager.remove_handle(handle2)
+            manager.remove_handle(handle0)
+            assert manager.compact() == 1
+            assert manager.num_entries == 2
+            manager.validate_handle(handle1)
+
+        def test_keeps_inactive_entries_before_active_entries(self, manager):
+            handle0 = manager.issue_handle()
+            manager.issue_handle()
+            manager.remove_handle(handle0)
+            assert manager.compact() == 0
+            handle = manager.issue_handle()
+            assert handle.index == handle0.index
+
+        def test_does_not_revalidate_reclaimed_handles(self, manager):
+            handle = manager.issue_handle()
+            manager.remove_handle(handle)
+            manager.compact()
+            reissued_handle = manager.issue_handle()
+            assert reissued_handle.index == handle.index
+            assert reissued_handle.generation > handle.generation
+            assert manager.is_valid(handle) is False
+
+    class TestIsValid:
+        def test_returns_true_with_active_handle(self, manager):
+            handle = manager.issue_handle()
+            assert manager.is_valid(handle) is True
+
+        def test_returns_false_with_invalid_handle(self, manager):
+            assert manager.is_valid(INVALID_HANDLE) is False
+
+        def test_returns_false_with_stranger_handle(self, manager):
+            stranger_manager = HandleManager()
+            handle = stranger_manager.issue_handle()
+            assert manager.is_valid(handle) is False
+
+        def test_returns_false_with_inactive_handle(self, manager):
+            handle = manager.issue_handle()
+            manager.remove_handle(handle)
+            assert manager.is_valid(handle) is False
+
+        def test_returns_false_with_retired_handle(self, manager):
+            handle = manager.issue_handle()
+            manager.remove_handle(handle)
+            manager.issue_handle()
+            assert manager.is_valid(handle) is False
+
     class TestRemoveAllHandles:
         def test_deactivates_issued_handles(self, manager):
             handle1 = manager.issue_handle()
@@ -88,3 +160,90 @@ class TestHandleManager:
                 manager.validate_handle(handle2)
             with pytest.raises(HandleIsInactiveException):
                 manager.validate_handle(handle3)
+
+        def test_reissues_entries_from_first_index(self, manager):
+            manager.issue_handle()
+            manager.issue_handle()
+            manager.remove_all_handles()
+            handle = manager.issue_handle()
+            assert handle.index == 0
+            assert handle.generation == 2
+
+
+@pytest.mark.parametrize("manager_class", [HandleManager, CompactHandleManager])
+class TestThreadSafeHandleManager:
+    num_threads = 8
+    num_cycles = 2000
+
+    def run_threads(self, target):
+        threads = [threading.Thread(target=target, args=(i,)) for i in range(self.num_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_issues_unique_handles_under_contention(self, manager_class, contention):
+        manager = manager_class(thread_safe=True)
+        issued = [[] for _ in range(self.num_threads)]
+
+        def churn(thread_index):
+            for _ in range(self.num_cycles):
+                handle = manager.issue_handle()
+                issued[thread_index].append(handle)
+                manager.remove_handle(handle)
+
+        self.run_threads(churn)
+
+        all_handles = [handle for handles in issued for handle in handles]
+        assert len(set(all_handles)) == len(all_handles)
+        assert manager.num_active_handles == 0
+        assert manager.num_entries <= self.num_threads
+
+    def test_issues_monotonic_generations_per_index_under_contention(self, manager_class, contention):
+        manager = manager_class(thread_safe=True)
+        issued = [[] for _ in range(self.num_threads)]
+
+        def churn(thread_index):
+            held = []
+            for cycle in range(self.num_cycles):
+                handle = manager.issue_handle()
+                issued[thread_index].append(handle)
+                held.append(handle)
+                if cycle % 3 == 0:
+                    manager.remove_handle(held.pop(0))
+
+        self.run_threads(churn)
+
+        generations_by_index = {}
+        for handles in issued:
+            for handle in handles:
+                generations_by_index.setdefault(handle.index, []).append(handle.generation)
+        for generations in generations_by_index.values():
+            assert len(set(generations)) == len(generations)
+            assert sorted(generations) == list(range(1, len(generations) + 1))
+        for handles in issued:
+            last_generation_by_index = {}
+            for handle in handles:
+                assert handle.generation > last_generation_by_index.get(handle.index, 0)
+                last_generation_by_index[handle.index] = handle.generation
+
+
+class TestCompactHandleManager:
+    def test_tracks_active_flags_across_bitset_bytes(self):
+        manager = CompactHandleManager()
+        handles = [manager.issue_handle() for _ in range(17)]
+        for handle in handles[::2]:
+            manager.remove_handle(handle)
+        for handle in handles[1::2]:
+            manager.validate_handle(handle)
+        for handle in handles[::2]:
+            with pytest.raises(HandleIsInactiveException):
+                manager.validate_handle(handle)
+
+    def test_wraps_generation_skipping_zeroth_generation(self):
+        manager = CompactHandleManager()
+        handle = manager.issue_handle()
+        manager._generations[handle.index] = manager._max_generation
+        manager.remove_handle(Handle(handle.index, manager._max_generation))
+        handle = manager.issue_handle()
+        assert handle.generation == 1
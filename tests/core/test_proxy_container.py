@@ -1,8 +1,9 @@
 import pytest
 import sys
+import threading
 
 from skeema.core.handle import INVALID_HANDLE
-from skeema.core.handle import HandleIsInactiveException
+from skeema.core.handle import HandleIsInactiveException, HandleIsRetiredException
 from skeema.core.proxy_container import ProxyContainer
 
 
@@ -52,6 +53,23 @@ class TestHandleManagedContainer:
             object_out = container.get(handle)
             assert object_out is None
 
+    class TestGetMany:
+        def test_returns_objects_in_handle_order(self, container):
+            objects_in = [MyObject() for _ in range(3)]
+            handles = [container.add_object(object_in) for object_in in objects_in]
+            objects_out = container.get_many(reversed(handles))
+            assert objects_out == list(reversed(objects_in))
+
+        def test_returns_none_for_each_invalid_handle(self, container):
+            object_in = MyObject()
+            removed_handle = container.add_object(MyObject())
+            handle = container.add_object(object_in)
+            container.remove(removed_handle)
+            objects_out = container.get_many([INVALID_HANDLE, removed_handle, handle])
+            assert objects_out[0] is None
+            assert objects_out[1] is None
+            assert objects_out[2] == object_in
+
     class TestRemove:
         def test_throws_handle_is_inactive_exception_with_already_removed_handle(self, container):
             object_in = MyObject()
@@ -60,6 +78,37 @@ class TestHandleManagedContainer:
             with pytest.raises(HandleIsInactiveException):
                 container.remove(handle)
 
+        def test_does_not_affect_other_objects_when_slot_is_reused(self, container):
+            objects_in = [MyObject() for _ in range(3)]
+            handles = [container.add_object(object_in) for object_in in objects_in]
+            container.remove(handles[1])
+            object_in = MyObject()
+            handle = container.add_object(object_in)
+            assert container.get(handle) == object_in
+            assert container.get(handles[0]) == objects_in[0]
+            assert container.get(handles[2]) == objects_in[2]
+            assert container.get(handles[1]) is None
+
+        def test_does_not_clear_reissued_slot_with_stale_handle(self, container):
+            stale_handle = container.add_object(MyObject())
+            container.remove(stale_handle)
+            object_in = MyObject()
+            handle = container.add_object(object_in)
+            with pytest.raises(HandleIsRetiredException):
+                container.remove(stale_handle)
+            assert container.get(handle) == object_in
+
+    class TestCompact:
+        def test_reclaims_trailing_free_slots(self, container):
+            object_in = MyObject()
+            handle = container.add_object(object_in)
+            removed_handles = [container.add_object(MyObject()) for _ in range(3)]
+            for removed_handle in removed_handles:
+                container.remove(removed_handle)
+            assert container.compact() == 3
+            assert container.get(handle) == object_in
+            assert container.get_many(removed_handles) == [None, None, None]
+
     class TestAddObject:
         def test_does_not_create_reference(self, container):
             object_in = MyObject()
@@ -67,3 +116,40 @@ class TestHandleManagedContainer:
             expected_ref_count = 1
             actual_ref_count = sys.getrefcount(object_in) - 1
             assert expected_ref_count == actual_ref_count
+
+
+class TestThreadSafeProxyContainer:
+    num_cycles = 5000
+
+    def test_gets_objects_while_compacting_under_contention(self, contention):
+        container = ProxyContainer(thread_safe=True)
+        container.add_object(MyObject())
+        objects = [MyObject() for _ in range(self.num_cycles)]
+        added = []
+        done = threading.Event()
+        errors = []
+
+        def churn():
+            for obj in objects:
+                added.append((container.add_object(obj), obj))
+                container.remove(added[-1][0])
+                container.compact()
+            done.set()
+
+        def read():
+            try:
+                while not done.is_set():
+                    if added:
+                        handle, obj = added[-1]
+                        assert container.get(handle) in (None, obj)
+                        assert container.get_many([handle])[0] in (None, obj)
+            except Exception as exception:
+                errors.append(exception)
+
+        threads = [threading.Thread(target=churn)] + [threading.Thread(target=read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
@@ -1,7 +1,10 @@
 import pytest
+import json
 import os
+from collections import Counter
 from urllib.parse import urljoin
 
+from skeema.core.dependency import CircularDependencyException
 from skeema.file.file import JsonFileManager, JsonFile
 
 
@@ -9,8 +12,39 @@ class TestFile:
     pass
 
 
+class TestJsonFile:
+    class TestReferences:
+        def test_collects_references_while_decoding(self, tmp_path):
+            path = tmp_path / 'a.json'
+            path.write_text(json.dumps({'anyOf': [[{'$ref': '#/definitions/b'}], {'items': {'$ref': '#/definitions/c'}}]}))
+            file = JsonFileManager().create_file(str(path))
+            file.fetch()
+
+            assert file.references == ['#/definitions/b', '#/definitions/c']
+            assert file.content['anyOf'][1] == {'items': {'$ref': '#/definitions/c'}}
+
+
 class TestFileManager:
     class TestLoad:
+        @pytest.fixture(name='diamond')
+        def fixture_diamond(self, write_json):
+            write_json('b.json', {'properties': {'d': {'$ref': './d.json'}}})
+            write_json('c.json', {'properties': {'d': {'$ref': './d.json'}}})
+            write_json('d.json', {'type': 'string'})
+            return write_json('a.json', {'properties': {'b': {'$ref': './b.json'}, 'c': {'$ref': './c.json'}}})
+
+        @pytest.fixture(name='fetched')
+        def fixture_fetched(self, monkeypatch):
+            fetched = Counter()
+            fetch = JsonFile.fetch
+
+            def counting_fetch(file):
+                fetched[file.path] += 1
+                fetch(file)
+
+            monkeypatch.setattr(JsonFile, 'fetch', counting_fetch)
+            return fetched
+
         def test_loads_a_local_file(self):
             file_manager = JsonFileManager()
             cwd = os.getcwd()
@@ -19,3 +53,128 @@ class TestFileManager:
             p = urljoin(scheme, path)
             print(p)
             file_manager.load(p)
+
+        def test_fetches_each_path_of_a_diamond_exactly_once(self, diamond, fetched):
+            JsonFileManager().load(diamond)
+
+            assert len(fetched) == 4
+            assert set(fetched.values()) == {1}
+
+        def test_marks_every_referenced_file_as_loaded(self, diamond, tmp_path):
+            file_manager = JsonFileManager()
+            file_manager.load(diamond)
+
+            assert all(file_manager.get_file(str(tmp_path / name)).loaded for name in ('a.json', 'b.json', 'c.json', 'd.json'))
+
+        def test_loads_a_file_once_however_its_path_is_written(self, diamond, fetched, tmp_path, monkeypatch):
+            monkeypatch.chdir(tmp_path)
+            file_manager = JsonFileManager()
+            file_manager.load('./a.json')
+            file_manager.load('a.json')
+
+            assert fetched == Counter({'a.json': 1, 'b.json': 1, 'c.json': 1, 'd.json': 1})
+
+        def test_resolves_a_bare_reference_against_the_referring_file(self, write_json, tmp_path, monkeypatch):
+            a = write_json('schemas/a.json', {'properties': {'b': {'$ref': 'b.json'}}})
+            b = write_json('schemas/b.json', {'type': 'string'})
+            monkeypatch.chdir(tmp_path)
+            file_manager = JsonFileManager()
+
+            assert [node.debug_name for node in file_manager.load(a).dependency_node.dependency_nodes] == [b]
+
+        def test_resolves_a_parent_reference_against_the_referring_file(self, write_json, tmp_path, monkeypatch):
+            a = write_json('schemas/a.json', {'properties': {'b': {'$ref': '../common/b.json#/definitions/b'}}})
+            b = write_json('common/b.json', {'definitions': {'b': {'type': 'string'}}})
+            monkeypatch.chdir(tmp_path / 'schemas')
+            file_manager = JsonFileManager()
+
+            assert [node.debug_name for node in file_manager.load(a).dependency_node.dependency_nodes] == [b]
+
+        def test_does_not_fetch_a_loaded_file_again(self, diamond, fetched):
+            file_manager = JsonFileManager()
+            file_manager.load(diamond)
+            file_manager.load(diamond)
+
+            assert fetched[diamond] == 1
+
+        class TestConcurrently:
+            def test_loads_every_referenced_file(self, diamond, tmp_path):
+                file_manager = JsonFileManager(concurrent=True, max_workers=4)
+                file_manager.load(diamond)
+
+                assert file_manager.get_file(str(tmp_path / 'd.json')).content == {'type': 'string'}
+
+            def test_fetches_each_path_exactly_once(self, diamond, fetched):
+                JsonFileManager(concurrent=True, max_workers=4).load(diamond)
+
+                assert len(fetched) == 4
+                assert set(fetched.values()) == {1}
+
+            def test_resolves_dependencies_in_the_same_order_as_a_sequential_load(self, diamond):
+                sequential = JsonFileManager().load(diamond)
+                concurrent = JsonFileManager(concurrent=True).load(diamond)
+
+                def resolved_paths(file):
+                    return [node.debug_name for node in file.dependency_node.resolve_dependencies()]
+
+                assert resolved_paths(concurrent) == resolved_paths(sequential)
+
+            def test_raises_on_circular_references(self, write_json):
+                write_json('b.json', {'properties': {'a': {'$ref': './a.json'}}})
+                root = write_json('a.json', {'properties': {'b': {'$ref': './b.json'}}})
+
+                with pytest.raises(CircularDependencyException):
+                    JsonFileManager(concurrent=True).load(root)
+
+    class TestLoadDirectory:
+        def test_loads_every_matching_file(self, write_json, tmp_path):
+            write_json('a.json', {'type': 'object'})
+            write_json('nested/b.json', {'type': 'string'})
+            write_json('c.txt', 'not json')
+            file_manager = JsonFileManager(max_workers=2)
+            files = file_manager.load_directory(str(tmp_path))
+
+            assert [file.content for file in files] == [{'type': 'object'}, {'type': 'string'}]
+            assert all(file.loaded for file in files)
+
+        def test_adds_references_between_files_in_the_directory(self, write_json, tmp_path):
+            write_json('a.json', {'properties': {'b': {'$ref': './b.json'}}})
+            b = write_json('b.json', {'type': 'string'})
+            file_manager = JsonFileManager(max_workers=2)
+            a, _b = file_manager.load_directory(str(tmp_path))
+
+            assert [node.debug_name for node in a.dependency_node.dependency_nodes] == [b]
+
+        def test_loads_files_referenced_from_outside_the_directory(self, write_json, tmp_path):
+            write_json('schemas/a.json', {'properties': {'b': {'$ref': './../b.json'}}})
+            b = write_json('b.json', {'type': 'string'})
+            file_manager = JsonFileManager(max_workers=2)
+            file_manager.load_directory(str(tmp_path / 'schemas'))
+
+            assert file_manager.get_file(b).content == {'type': 'string'}
+
+        def test_loads_a_file_once_when_it_is_also_referenced_through_a_relative_path(self, write_json, tmp_path):
+            write_json('schemas/a.json', {'properties': {'b': {'$ref': './../b.json'}}})
+            b = write_json('b.json', {'type': 'string'})
+            file_manager = JsonFileManager(max_workers=2)
+            _b, a = file_manager.load_directory(str(tmp_path))
+
+            assert [node.debug_name for node in a.dependency_node.dependency_nodes] == [b]
+
+        def test_loads_each_file_once_from_a_dot_prefixed_directory(self, write_json, tmp_path, monkeypatch):
+            write_json('d/a.json', {'properties': {'b': {'$ref': './sub/b.json'}}})
+            write_json('d/sub/b.json', {'type': 'string'})
+            monkeypatch.chdir(tmp_path)
+            file_manager = JsonFileManager(max_workers=2)
+            file_manager.load_directory('./d')
+
+            assert sorted(file.path for file in file_manager.files) == [
+                os.path.join('d', 'a.json'), os.path.join('d', 'sub', 'b.json')
+            ]
+
+        def test_raises_on_circular_references(self, write_json, tmp_path):
+            write_json('a.json', {'properties': {'b': {'$ref': './b.json'}}})
+            write_json('b.json', {'properties': {'a': {'$ref': './a.json'}}})
+
+            with pytest.raises(CircularDependencyException):
+                JsonFileManager(max_workers=2).load_directory(str(tmp_path))
@@ -0,0 +1,86 @@
+import pytest
+import gzip
+import json
+import os
+import zipfile
+
+from skeema.file.file import FileManager, JsonFileManager
+
+
+@pytest.fixture(name='bundle')
+def fixture_bundle(tmp_path):
+    path = tmp_path / 'bundle.zip'
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('schemas/person.json', json.dumps({'properties': {'address': {'$ref': 'address.json'}}}))
+        archive.writestr('schemas/address.json', json.dumps({'properties': {'city': {'$ref': '../common/city.json'}}}))
+        archive.writestr('common/city.json', json.dumps({'type': 'string'}))
+        archive.writestr('common/unused.json', json.dumps({'type': 'number'}))
+        archive.writestr('schemas/country.json.gz', gzip.compress(json.dumps({'type': 'string'}).encode('utf-8')))
+    return str(path)
+
+
+class TestFileManager:
+    class TestSplitArchivePath:
+        def test_splits_a_path_inside_an_archive(self):
+            path = os.path.join('bundles', 'bundle.zip', 'schemas', 'person.json')
+            archive_path, member = FileManager.split_archive_path(path)
+
+            assert archive_path == os.path.join('bundles', 'bundle.zip')
+            assert member == 'schemas/person.json'
+
+        def test_returns_none_for_a_path_outside_an_archive(self):
+            assert FileManager.split_archive_path(os.path.join('schemas', 'person.json')) is None
+
+    class TestLoad:
+        def test_loads_a_gzip_compressed_file(self, tmp_path):
+            path = tmp_path / 'person.json.gz'
+            path.write_bytes(gzip.compress(json.dumps({'type': 'object'}).encode('utf-8')))
+
+            assert JsonFileManager().load(str(path)).content == {'type': 'object'}
+
+        def test_resolves_references_inside_an_archive(self, bundle):
+            file_manager = JsonFileManager()
+            file_manager.load(os.path.join(bundle, 'schemas', 'person.json'))
+
+            assert file_manager.get_file(os.path.join(bundle, 'common', 'city.json')).content == {'type': 'string'}
+
+        def test_resolves_a_bare_reference_against_the_referring_member(self, bundle):
+            file_manager = JsonFileManager()
+            person = file_manager.load(os.path.join(bundle, 'schemas', 'person.json'))
+
+            assert [node.debug_name for node in person.dependency_node.dependency_nodes] == [
+                os.path.join(bundle, 'schemas', 'address.json')
+            ]
+
+        def test_resolves_a_parent_reference_against_the_referring_member(self, bundle):
+            file_manager = JsonFileManager()
+            file_manager.load(os.path.join(bundle, 'schemas', 'person.json'))
+            address = file_manager.get_file(os.path.join(bundle, 'schemas', 'address.json'))
+
+            assert [node.debug_name for node in address.dependency_node.dependency_nodes] == [
+                os.path.join(bundle, 'common', 'city.json')
+            ]
+
+        def test_loads_a_gzip_compressed_member(self, bundle):
+            file_manager = JsonFileManager()
+
+            assert file_manager.load(os.path.join(bundle, 'schemas', 'country.json.gz')).content == {'type': 'string'}
+
+        def test_decompresses_only_referenced_members(self, bundle, monkeypatch):
+            read_members = []
+            read = zipfile.ZipFile.read
+            monkeypatch.setattr(zipfile.ZipFile, 'read', lambda archive, name: read_members.append(name) or read(archive, name))
+            file_manager = JsonFileManager()
+            file_manager.load(os.path.join(bundle, 'schemas', 'person.json'))
+
+            assert sorted(read_members) == ['common/city.json', 'schemas/address.json', 'schemas/person.json']
+
+        def test_opens_an_archive_once(self, bundle, monkeypatch):
+            opened = []
+            zip_file = zipfile.ZipFile
+            monkeypatch.setattr(zipfile, 'ZipFile', lambda path: opened.append(path) or zip_file(path))
+            file_manager = JsonFileManager(concurrent=True)
+            file_manager.load(os.path.join(bundle, 'schemas', 'person.json'))
+            file_manager.close()
+
+            assert opened == [bundle]
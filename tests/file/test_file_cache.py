@@ -0,0 +1,78 @@
+
+from skeema.file.file import JsonFileManager
+from skeema.file.file_cache import FileCache
+
+
+class TestFileCache:
+    class TestGet:
+        def test_returns_none_for_an_uncached_file(self, write_json):
+            path = write_json('a.json', {})
+            file_cache = FileCache()
+
+            assert file_cache.get(path, file_cache.validator(path)) is None
+            assert file_cache.misses == 1
+
+        def test_returns_the_content_of_an_unchanged_file(self, write_json):
+            path = write_json('a.json', {})
+            file_cache = FileCache()
+            file_cache.put(path, file_cache.validator(path), 'content')
+
+            assert file_cache.get(path, file_cache.validator(path)) == 'content'
+            assert file_cache.hits == 1
+
+        def test_returns_none_for_a_file_with_a_new_modification_time(self, write_json):
+            path = write_json('a.json', {}, mtime_ns=1_000_000_000)
+            file_cache = FileCache()
+            file_cache.put(path, file_cache.validator(path), 'content')
+            write_json('a.json', {}, mtime_ns=2_000_000_000)
+
+            assert file_cache.get(path, file_cache.validator(path)) is None
+
+        def test_returns_none_for_a_file_with_the_same_stat_but_new_content_if_hashing(self, write_json):
+            path = write_json('a.json', {'type': 'object'}, mtime_ns=1_000_000_000)
+            file_cache = FileCache(hash_contents=True)
+            file_cache.put(path, file_cache.validator(path), 'content')
+            write_json('a.json', {'type': 'string'}, mtime_ns=1_000_000_000)
+
+            assert file_cache.get(path, file_cache.validator(path)) is None
+
+    class TestPut:
+        def test_evicts_the_least_recently_used_file(self, write_json):
+            paths = [write_json(f'{name}.json', {}) for name in 'abc']
+            file_cache = FileCache(max_entries=2)
+            file_cache.put(paths[0], file_cache.validator(paths[0]), 'a')
+            file_cache.put(paths[1], file_cache.validator(paths[1]), 'b')
+            file_cache.get(paths[0], file_cache.validator(paths[0]))
+            file_cache.put(paths[2], file_cache.validator(paths[2]), 'c')
+
+            assert len(file_cache) == 2
+            assert file_cache.get(paths[1], file_cache.validator(paths[1])) is None
+            assert file_cache.get(paths[0], file_cache.validator(paths[0])) == 'a'
+
+
+class TestFileManager:
+    class TestLoad:
+        def test_does_not_read_unchanged_files_again(self, write_json, monkeypatch):
+            write_json('b.json', {'type': 'string'})
+            root = write_json('a.json', {'properties': {'b': {'$ref': './b.json'}}})
+            file_cache = FileCache()
+            JsonFileManager(file_cache=file_cache).load(root)
+
+            read_paths = []
+            read = JsonFileManager.read
+            monkeypatch.setattr(JsonFileManager, 'read', lambda manager, path: read_paths.append(path) or read(manager, path))
+            file_manager = JsonFileManager(file_cache=file_cache)
+            file_manager.load(root)
+
+            assert read_paths == []
+            assert file_cache.hits == 2
+            assert file_manager.get_file(root).references == ['./b.json']
+            assert file_manager.get_file(root).dependency_node.dependency_nodes[0].debug_name.endswith('b.json')
+
+        def test_reads_changed_files_again(self, write_json):
+            root = write_json('a.json', {'type': 'object'}, mtime_ns=1_000_000_000)
+            file_cache = FileCache()
+            JsonFileManager(file_cache=file_cache).load(root)
+            write_json('a.json', {'type': 'string'}, mtime_ns=2_000_000_000)
+
+            assert JsonFileManager(file_cache=file_cache).load(root).content == {'type': 'string'}
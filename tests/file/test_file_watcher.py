@@ -0,0 +1,134 @@
+import pytest
+import os
+import threading
+
+from skeema.file.file import JsonFileManager
+from skeema.file.file_watcher import FileWatcher
+
+
+@pytest.fixture(name='file_manager')
+def fixture_file_manager(write_json):
+    write_json('a.json', {'properties': {'b': {'$ref': './b.json'}}})
+    write_json('b.json', {'properties': {'c': {'$ref': './c.json'}}})
+    write_json('c.json', {'type': 'string'})
+    write_json('d.json', {'type': 'string'})
+    file_manager = JsonFileManager()
+    file_manager.load(write_json('root.json', {'properties': {'a': {'$ref': './a.json'}, 'd': {'$ref': './d.json'}}}))
+    return file_manager
+
+
+def names(files):
+    return [os.path.basename(file.path) for file in files]
+
+
+class TestFileWatcher:
+    class TestPoll:
+        def test_reports_nothing_without_changes(self, file_manager):
+            file_watcher = FileWatcher(file_manager)
+
+            assert file_watcher.poll() == []
+
+        def test_reports_a_changed_file_and_its_dependents_in_order(self, file_manager, write_json):
+            file_watcher = FileWatcher(file_manager)
+            write_json('b.json', {'properties': {'c': {'$ref': './c.json'}}, 'type': 'object'})
+
+            assert names(file_watcher.poll()) == ['b.json', 'a.json', 'root.json']
+            assert file_watcher.poll() == []
+
+        def test_reloads_the_content_of_a_changed_file(self, file_manager, write_json, tmp_path):
+            file_watcher = FileWatcher(file_manager)
+            write_json('c.json', {'type': 'integer'})
+            file_watcher.poll()
+
+            assert file_manager.get_file(str(tmp_path / 'c.json')).content == {'type': 'integer'}
+
+        def test_replaces_the_references_of_a_changed_file(self, file_manager, write_json, tmp_path):
+            file_watcher = FileWatcher(file_manager)
+            write_json('e.json', {'type': 'number'})
+            write_json('b.json', {'properties': {'e': {'$ref': './e.json'}}})
+            file_watcher.poll()
+
+            b = file_manager.get_file(str(tmp_path / 'b.json'))
+            assert names(file_manager.get_files_from_handles(
+                node.handle for node in b.dependency_node.dependency_nodes
+            )) == ['e.json']
+            assert file_manager.get_file(str(tmp_path / 'e.json')).content == {'type': 'number'}
+
+        def test_ignores_deleted_files(self, file_manager, tmp_path):
+            file_watcher = FileWatcher(file_manager)
+            os.remove(tmp_path / 'd.json')
+
+            assert file_watcher.poll() == []
+
+        def test_keeps_the_previous_content_of_a_file_that_fails_to_decode(self, file_manager, tmp_path):
+            file_watcher = FileWatcher(file_manager)
+            (tmp_path / 'b.json').write_text('{"properties": {"c"')
+
+            with pytest.raises(ValueError):
+                file_watcher.poll()
+            b = file_manager.get_file(str(tmp_path / 'b.json'))
+            assert b.content == {'properties': {'c': {'$ref': './c.json'}}}
+            assert names(file_manager.get_files_from_handles(
+                node.handle for node in b.dependency_node.dependency_nodes
+            )) == ['c.json']
+
+        def test_reloads_a_file_that_failed_to_decode_on_the_next_poll(self, file_manager, write_json, tmp_path):
+            file_watcher = FileWatcher(file_manager)
+            (tmp_path / 'c.json').write_text('{"type": ')
+            with pytest.raises(ValueError):
+                file_watcher.poll()
+            write_json('c.json', {'type': 'integer'})
+
+            assert names(file_watcher.poll()) == ['c.json', 'b.json', 'a.json', 'root.json']
+            assert file_manager.get_file(str(tmp_path / 'c.json')).content == {'type': 'integer'}
+
+        def test_reports_a_change_made_while_reloading(self, file_manager, write_json, monkeypatch):
+            file_watcher = FileWatcher(file_manager)
+            write_json('d.json', {'type': 'integer'})
+            reload = file_manager.reload
+
+            def reload_and_change(paths):
+                affected_files = reload(paths)
+                write_json('d.json', {'type': 'number'})
+                return affected_files
+
+            monkeypatch.setattr(file_manager, 'reload', reload_and_change)
+            file_watcher.poll()
+            monkeypatch.undo()
+
+            assert names(file_watcher.poll()) == ['d.json', 'root.json']
+
+    class TestWatch:
+        def test_calls_on_change_until_stopped(self, file_manager, write_json):
+            file_watcher = FileWatcher(file_manager, interval=0.01)
+            write_json('d.json', {'type': 'integer'})
+            stop = threading.Event()
+            changes = []
+
+            def on_change(files):
+                changes.append(names(files))
+                stop.set()
+
+            file_watcher.watch(on_change, stop)
+
+            assert changes == [['d.json', 'root.json']]
+
+        def test_keeps_watching_after_a_file_fails_to_decode(self, file_manager, write_json, tmp_path):
+            file_watcher = FileWatcher(file_manager, interval=0.01)
+            (tmp_path / 'd.json').write_text('{"type": ')
+            stop = threading.Event()
+            errors = []
+            changes = []
+
+            def on_error(error):
+                errors.append(error)
+                write_json('d.json', {'type': 'integer'})
+
+            def on_change(files):
+                changes.append(names(files))
+                stop.set()
+
+            file_watcher.watch(on_change, stop, on_error)
+
+            assert len(errors) == 1
+            assert changes == [['d.json', 'root.json']]
@@ -0,0 +1,184 @@
+import pytest
+import json
+import sys
+import threading
+import time
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from skeema.file.file import JsonFileManager
+from skeema.file.http_cache import HttpCache, OfflineCacheMissException
+
+
+class SchemaServer(ThreadingHTTPServer):
+    """
+    Serves registered files with ETag and Last-Modified validators, and counts the requests it receives.
+    """
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SchemaRequestHandler)
+        self.files = {}
+        self.requests = []
+        self.delay = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f'http://{host}:{port}'
+
+    def handle_error(self, request, client_address):
+        # Clients that time out close the connection before the response is written
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def serve(self, path, content, etag='"1"', last_modified='Mon, 05 Oct 2026 10:00:00 GMT'):
+        self.files[path] = (json.dumps(content), etag, last_modified)
+
+
+class SchemaRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get('If-None-Match')))
+        time.sleep(self.server.delay)
+        if self.path not in self.server.files:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body, etag, last_modified = self.server.files[self.path]
+        if etag is not None and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        encoded = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(encoded)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(name='server')
+def fixture_server():
+    server = SchemaServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpCache:
+    class TestFetch:
+        def test_returns_the_body_of_the_remote_file(self, server):
+            server.serve('/person.json', {'type': 'object'})
+            http_cache = HttpCache()
+
+            assert json.loads(http_cache.fetch(f'{server.url}/person.json')) == {'type': 'object'}
+
+        def test_revalidates_a_cached_file_instead_of_downloading_it_again(self, server, tmp_path):
+            server.serve('/person.json', {'type': 'object'})
+            http_cache = HttpCache(str(tmp_path))
+            http_cache.fetch(f'{server.url}/person.json')
+            body = http_cache.fetch(f'{server.url}/person.json')
+
+            assert json.loads(body) == {'type': 'object'}
+            assert server.requests == [('/person.json', None), ('/person.json', '"1"')]
+            assert http_cache.num_requests == 2
+            assert http_cache.num_downloads == 1
+
+        def test_downloads_a_changed_file(self, server, tmp_path):
+            server.serve('/person.json', {'type': 'object'})
+            http_cache = HttpCache(str(tmp_path))
+            http_cache.fetch(f'{server.url}/person.json')
+            server.serve('/person.json', {'type': 'string'}, etag='"2"')
+
+            assert json.loads(http_cache.fetch(f'{server.url}/person.json')) == {'type': 'string'}
+            assert http_cache.num_downloads == 2
+
+        def test_persists_the_cache_across_instances(self, server, tmp_path):
+            server.serve('/person.json', {'type': 'object'})
+            HttpCache(str(tmp_path)).fetch(f'{server.url}/person.json')
+            http_cache = HttpCache(str(tmp_path))
+            http_cache.fetch(f'{server.url}/person.json')
+
+            assert http_cache.num_downloads == 0
+
+        def test_shares_one_cache_entry_between_fragments_of_a_url(self, server, tmp_path):
+            server.serve('/person.json', {'type': 'object'})
+            http_cache = HttpCache(str(tmp_path))
+            http_cache.fetch(f'{server.url}/person.json#/definitions/a')
+            http_cache.fetch(f'{server.url}/person.json#/definitions/b')
+
+            assert server.requests == [('/person.json', None), ('/person.json', '"1"')]
+            assert len(list(tmp_path.iterdir())) == 1
+
+        def test_raises_if_the_server_does_not_respond_within_the_timeout(self, server):
+            server.serve('/person.json', {'type': 'object'})
+            server.delay = 0.5
+            http_cache = HttpCache(timeout=0.05)
+
+            with pytest.raises(requests.Timeout):
+                http_cache.fetch(f'{server.url}/person.json')
+
+        def test_raises_on_an_error_response(self, server):
+            http_cache = HttpCache()
+
+            with pytest.raises(requests.HTTPError):
+                http_cache.fetch(f'{server.url}/missing.json')
+
+        class TestOffline:
+            def test_serves_a_cached_file_without_sending_a_request(self, server, tmp_path):
+                server.serve('/person.json', {'type': 'object'})
+                HttpCache(str(tmp_path)).fetch(f'{server.url}/person.json')
+                server.requests.clear()
+                http_cache = HttpCache(str(tmp_path), offline=True)
+
+                assert json.loads(http_cache.fetch(f'{server.url}/person.json')) == {'type': 'object'}
+                assert server.requests == []
+
+            def test_raises_if_the_file_is_not_cached(self, server, tmp_path):
+                http_cache = HttpCache(str(tmp_path), offline=True)
+
+                with pytest.raises(OfflineCacheMissException):
+                    http_cache.fetch(f'{server.url}/person.json')
+
+
+class TestFileManager:
+    class TestLoad:
+        def test_loads_remote_references_relative_to_the_remote_file(self, server, tmp_path):
+            server.serve('/schemas/person.json', {'properties': {'address': {'$ref': './address.json'}}})
+            server.serve('/schemas/address.json', {'type': 'string'})
+            file_manager = JsonFileManager(http_cache=HttpCache(str(tmp_path)))
+            file_manager.load(f'{server.url}/schemas/person.json')
+
+            assert file_manager.get_file(f'{server.url}/schemas/address.json').content == {'type': 'string'}
+            assert sorted(path for path, _etag in server.requests) == ['/schemas/address.json', '/schemas/person.json']
+
+        def test_loads_a_remote_file_once_for_references_to_its_fragments(self, server, tmp_path):
+            server.serve('/schemas/person.json', {'properties': {
+                'home': {'$ref': './address.json#/definitions/home'},
+                'work': {'$ref': './address.json#/definitions/work'}
+            }})
+            server.serve('/schemas/address.json', {'definitions': {'home': {}, 'work': {}}})
+            file_manager = JsonFileManager(http_cache=HttpCache(str(tmp_path)))
+            file_manager.load(f'{server.url}/schemas/person.json')
+
+            assert sorted(file.path for file in file_manager.files) == [
+                f'{server.url}/schemas/address.json', f'{server.url}/schemas/person.json'
+            ]
+            assert sorted(path for path, _etag in server.requests) == ['/schemas/address.json', '/schemas/person.json']
+
+        def test_loads_https_urls_through_the_http_cache(self, tmp_path):
+            url = 'https://example.invalid/person.json'
+            http_cache = HttpCache(str(tmp_path), offline=True)
+            http_cache._write_entry(url, {'url': url, 'etag': None, 'last_modified': None, 'body': '{"type": "object"}'})
+            file_manager = JsonFileManager(http_cache=http_cache)
+
+            assert file_manager.load(url).content == {'type': 'object'}
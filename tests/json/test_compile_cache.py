@@ -0,0 +1,120 @@
+from skeema.intermediate import Representation
+from skeema.schema import CompileCache, CompileScheduler, Keyword
+from skeema.schema.json import SchemaManager
+from skeema.schema.json.compiler import Compiler
+from skeema.schema.json.schema import Schema
+
+
+class Title(Keyword):
+    @property
+    def key(self):
+        return "title"
+
+    def _compile(self, schema, data, class_context, compilation_context):
+        return True
+
+
+def create_schemas(manager, person_properties=None):
+    manager.create_schema('schemas/cached_person.json', 'CachedPerson', {
+        "type": "object",
+        "properties": person_properties or {"name": {"type": "string"}}
+    })
+    manager.create_schema('schemas/cached_book.json', 'CachedBook', {
+        "type": "object",
+        "properties": {"title": {"type": "string"}, "author": {"$ref": "./cached_person.json"}}
+    })
+    return manager.get_schema('schemas/cached_book.json')
+
+
+def compile_book(compile_cache, person_properties=None):
+    manager = SchemaManager(compile_cache)
+    return create_schemas(manager, person_properties).compile()
+
+
+def representation(class_name):
+    return Representation(class_name, [], [], [])
+
+
+class TestCompileCache:
+    class TestKey:
+        def test_ignores_the_order_of_keys_in_the_definition(self):
+            key_a = CompileCache.key('A', {"type": "object", "required": ["a"]}, [])
+            key_b = CompileCache.key('A', {"required": ["a"], "type": "object"}, [])
+            assert key_a == key_b
+
+        def test_changes_with_the_keys_of_dependencies(self):
+            assert CompileCache.key('A', {}, ['b']) != CompileCache.key('A', {}, ['c'])
+
+        def test_changes_with_the_compiler_fingerprint(self):
+            assert CompileCache.key('A', {}, [], 'Type') != CompileCache.key('A', {}, [], 'Type\0Title')
+
+    class TestGet:
+        def test_returns_none_for_an_uncached_key(self, tmp_path):
+            compile_cache = CompileCache(str(tmp_path))
+            assert compile_cache.get('missing') is None
+            assert compile_cache.misses == 1
+
+        def test_returns_an_equal_representation_from_another_instance(self, tmp_path):
+            CompileCache(str(tmp_path)).put('a', representation('A'))
+            compile_cache = CompileCache(str(tmp_path))
+            assert compile_cache.get('a') == representation('A')
+            assert compile_cache.hits == 1
+
+    class TestPut:
+        def test_evicts_the_least_recently_used_entries_beyond_the_size_limit(self, tmp_path):
+            compile_cache = CompileCache(str(tmp_path))
+            compile_cache.put('a', representation('A'))
+            entry_size = compile_cache.size
+            compile_cache = CompileCache(str(tmp_path), max_bytes=2 * entry_size)
+            compile_cache.put('b', representation('B'))
+            compile_cache.get('a')
+            compile_cache.put('c', representation('C'))
+
+            assert compile_cache.evictions == 1
+            assert compile_cache.get('b') is None
+            assert compile_cache.get('a') is not None
+            assert compile_cache.size <= 2 * entry_size
+
+
+class TestSchema:
+    class TestCompile:
+        def test_takes_every_representation_from_the_cache_when_unchanged(self, tmp_path):
+            compile_cache = CompileCache(str(tmp_path))
+            expected = compile_book(compile_cache)
+            compile_cache = CompileCache(str(tmp_path))
+            actual = compile_book(compile_cache)
+
+            assert list(actual.representations) == list(expected.representations)
+            assert compile_cache.misses == 0
+            assert compile_cache.hits == len(expected.representations)
+
+        def test_compiles_a_changed_schema_and_its_dependents_again(self, tmp_path):
+            compile_book(CompileCache(str(tmp_path)))
+            compile_cache = CompileCache(str(tmp_path))
+            context = compile_book(compile_cache, {"name": {"type": "string"}, "age": {"type": "integer"}})
+
+            assert compile_cache.misses == 3
+            assert context.get_representation('CachedBook') is not None
+
+        def test_compiles_every_schema_again_when_a_keyword_is_registered(self, tmp_path, monkeypatch):
+            compile_cache = CompileCache(str(tmp_path))
+            expected = compile_book(compile_cache)
+            compiler = Compiler()
+            compiler.register_keyword(Title())
+            monkeypatch.setattr(Schema, '_compiler', compiler)
+            compile_cache = CompileCache(str(tmp_path))
+            compile_book(compile_cache)
+
+            assert compile_cache.hits == 0
+            assert compile_cache.misses == len(expected.representations)
+
+        def test_takes_representations_from_the_cache_when_scheduled(self, tmp_path):
+            compile_cache = CompileCache(str(tmp_path))
+            expected = compile_book(compile_cache)
+            manager = SchemaManager(CompileCache(str(tmp_path)))
+            create_schemas(manager)
+            actual = CompileScheduler(manager, max_workers=2).compile()
+
+            assert manager.compile_cache.misses == 0
+            assert sorted(r.class_name for r in actual.representations) == \
+                sorted(r.class_name for r in expected.representations)
@@ -0,0 +1,105 @@
+import pytest
+
+from skeema.schema import CompileScheduler
+from skeema.schema.json import SchemaManager
+
+
+def create_schemas(manager):
+    person_kv = {
+        "definitions": {
+            "address": {
+                "type": "object",
+                "properties": {
+                    "city": {"type": "string"},
+                    "province": {"type": "string"}
+                }
+            }
+        },
+        "type": "object",
+        "properties": {
+            "name": {"type": "string"},
+            "age": {"type": "integer"},
+            "address": {"$ref": "#/definitions/address"}
+        }
+    }
+    book_kv = {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string"},
+            "author": {"$ref": "./person.json"},
+            "editor": {"$ref": "./person.json"}
+        }
+    }
+    library_kv = {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string"},
+            "book": {"$ref": "./book.json"},
+            "librarian": {"$ref": "./person.json"}
+        }
+    }
+    manager.create_schema('schemas/person.json', 'Person', person_kv)
+    manager.create_schema('schemas/book.json', 'Book', book_kv)
+    manager.create_schema('schemas/library.json', 'Library', library_kv)
+
+
+def compile_serially(roots):
+    manager = SchemaManager()
+    create_schemas(manager)
+    context = None
+    for root in roots:
+        context = manager.get_schema(root).compile(context)
+    return context
+
+
+class TestCompileScheduler:
+    class TestCompile:
+        @pytest.mark.parametrize("max_workers", [1, 4])
+        def test_matches_serial_compile_of_a_root(self, max_workers):
+            manager = SchemaManager()
+            create_schemas(manager)
+            scheduler = CompileScheduler(manager, max_workers=max_workers)
+            context = scheduler.compile([manager.get_schema('schemas/library.json')])
+
+            expected_context = compile_serially(['schemas/library.json'])
+            assert list(context.representations) == list(expected_context.representations)
+            assert str(context) == str(expected_context)
+
+        def test_matches_serial_compile_of_every_schema(self):
+            manager = SchemaManager()
+            create_schemas(manager)
+            context = CompileScheduler(manager).compile()
+
+            expected_context = compile_serially(['schemas/person.json', 'schemas/book.json', 'schemas/library.json'])
+            assert list(context.representations) == list(expected_context.representations)
+
+        def test_marks_compiled_schemas(self):
+            manager = SchemaManager()
+            create_schemas(manager)
+            CompileScheduler(manager).compile()
+            assert manager.get_schema('schemas/person.json').compiled is True
+            assert manager.get_schema('schemas/book.json').compiled is True
+            assert manager.get_schema('schemas/library.json').compiled is True
+
+        def test_skips_schemas_which_are_already_compiled(self):
+            manager = SchemaManager()
+            create_schemas(manager)
+            manager.get_schema('schemas/person.json').compile()
+            context = CompileScheduler(manager).compile([manager.get_schema('schemas/book.json')])
+            assert context.get_representation('Person') is None
+            assert context.get_representation('Book') is not None
+
+    class TestLevels:
+        def test_places_schemas_after_their_dependencies(self):
+            manager = SchemaManager()
+            create_schemas(manager)
+            scheduler = CompileScheduler(manager)
+            roots = [manager.get_schema('schemas/library.json')]
+            scheduler._populate(roots, None)
+            levels = scheduler._levels(scheduler._serial_order(roots))
+
+            class_levels = {schema.class_name: i for i, level in enumerate(levels) for schema in level}
+            assert class_levels['Address'] < class_levels['Person']
+            assert class_levels['Person'] < class_levels['Book']
+            assert class_levels['Book'] < class_levels['Library']
+            assert class_levels['NameClass'] == 0
@@ -0,0 +1,115 @@
+import pytest
+
+from skeema.intermediate import CompilationContext
+from skeema.schema import Keyword, KeywordCompilationException, KeywordRegistry
+from skeema.schema.json import SchemaManager
+from skeema.schema.json.compiler import Compiler
+from skeema.schema.json.keyword import Properties, Required, Type
+
+
+class Description(Keyword):
+    def __init__(self):
+        self.descriptions = []
+
+    @property
+    def key(self):
+        return "description"
+
+    def _compile(self, schema, data, class_context, compilation_context):
+        self.descriptions.append((schema.class_name, data))
+        return True
+
+
+class Failing(Keyword):
+    @property
+    def key(self):
+        return "failing"
+
+    def _compile(self, schema, data, class_context, compilation_context):
+        raise KeywordCompilationException("Always fails.")
+
+
+@pytest.fixture(name='registry')
+def create_registry():
+    return KeywordRegistry([Type(), Properties(), Required()])
+
+
+class TestKeywordRegistry:
+    class TestDispatch:
+        def test_dispatches_only_keys_present_in_registration_order(self, registry):
+            dispatched = registry.dispatch({"required": ["a"], "title": "A", "type": "object"})
+            assert [(keyword.key, data) for keyword, data in dispatched] == [("type", "object"), ("required", ["a"])]
+
+        def test_dispatches_nothing_without_registered_keys(self, registry):
+            assert registry.dispatch({"title": "A"}) == []
+
+    class TestRegister:
+        def test_runs_new_keywords_after_existing_ones(self, registry):
+            registry.register(Description())
+            assert [keyword.key for keyword in registry.keywords] == ["type", "properties", "required", "description"]
+
+        def test_replaces_the_keyword_of_a_key_in_place(self, registry):
+            required = Required()
+            registry.register(required)
+            assert registry.keywords[2] is required
+            assert len(registry.keywords) == 3
+
+    class TestUnregister:
+        def test_removes_the_keyword_of_a_key(self, registry):
+            assert registry.unregister("properties") is True
+            assert registry.get("properties") is None
+            assert registry.unregister("properties") is False
+
+
+class TestCompiler:
+    class TestCompile:
+        def test_creates_keywords_once(self, monkeypatch):
+            compiler = Compiler()
+            created = []
+            monkeypatch.setattr(Compiler, 'get_compilation_keys', lambda self: created.append(self) or [])
+            manager = SchemaManager()
+            context = CompilationContext()
+            for i in range(3):
+                compiler.compile(manager.create_schema(f'schemas/once{i}.json', f'Once{i}', {"type": "string"}), context)
+
+            assert created == []
+            assert len(list(context.representations)) == 3
+
+        def test_does_not_leak_data_between_schemas(self):
+            manager = SchemaManager()
+            with_required = manager.create_schema('schemas/leak_a.json', 'LeakA', {
+                "type": "object",
+                "properties": {"name": {"type": "string"}},
+                "required": ["name"]
+            })
+            without_required = manager.create_schema('schemas/leak_b.json', 'LeakB', {
+                "type": "object",
+                "properties": {"name": {"type": "string"}}
+            })
+            with_required.compile()
+            context = without_required.compile()
+
+            assert context.get_representation('LeakB')._parameters[0].required is False
+
+        def test_runs_registered_keywords(self):
+            compiler = Compiler()
+            description = Description()
+            compiler.register_keyword(description)
+            manager = SchemaManager()
+            schema = manager.create_schema('schemas/described.json', 'Described', {
+                "type": "string", "description": "A name"
+            })
+            compiler.compile(schema, schema.compile())
+
+            assert description.descriptions == [('Described', "A name")]
+
+        def test_warns_and_continues_when_a_keyword_fails(self, capsys):
+            compiler = Compiler()
+            compiler.register_keyword(Failing())
+            manager = SchemaManager()
+            schema = manager.create_schema('schemas/failing.json', 'FailingSchema', {"failing": True, "type": "string"})
+            context = schema.compile()
+            compiler.compile(schema, context)
+
+            assert 'Always fails.' in capsys.readouterr().out
+            assert context.get_representation('FailingSchema') is not None
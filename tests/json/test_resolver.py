@@ -0,0 +1,90 @@
+import pytest
+
+from skeema.schema.resolver import Resolver
+from skeema.schema.json import SchemaManager
+
+
+@pytest.fixture(name='resolver')
+def create_resolver():
+    return Resolver()
+
+
+@pytest.fixture(name='person')
+def create_person():
+    return {
+        "definitions": {
+            "address": {
+                "type": "object",
+                "properties": {"city": {"type": "string"}}
+            },
+            "a/b": {"type": "string"}
+        },
+        "allOf": [{"properties": {"name": {"type": "string"}}}]
+    }
+
+
+class TestResolver:
+    class TestResolveUrl:
+        def test_resolves_a_reference_relative_to_the_base_url(self, resolver):
+            assert resolver.resolve_url('schemas/book.json', './person.json') == 'schemas/person.json'
+
+        def test_resolves_a_fragment_against_the_base_document(self, resolver):
+            url = resolver.resolve_url('schemas/person.json', '#/definitions/address')
+            assert url == 'schemas/person.json#/definitions/address'
+
+        def test_keeps_absolute_references(self, resolver):
+            url = resolver.resolve_url('schemas/book.json', 'http://example.com/person.json')
+            assert url == 'http://example.com/person.json'
+
+        def test_normalizes_empty_fragments_and_percent_encoding(self, resolver):
+            assert resolver.resolve_url('schemas/book.json', './person.json#') == 'schemas/person.json'
+            assert resolver.resolve_url('schemas/book.json', './person.json#/definitions/%61ddress') == \
+                'schemas/person.json#/definitions/address'
+
+    class TestGet:
+        def test_finds_subschemas_by_json_pointer(self, resolver, person):
+            resolver.register_document('schemas/person.json', person)
+            assert resolver.get('schemas/person.json') is person
+            assert resolver.get('schemas/person.json#/definitions/address/properties/city') == {"type": "string"}
+            assert resolver.get('schemas/person.json#/allOf/0/properties/name') == {"type": "string"}
+
+        def test_escapes_json_pointer_tokens(self, resolver, person):
+            resolver.register_document('schemas/person.json', person)
+            assert resolver.get('schemas/person.json#/definitions/a~1b') == {"type": "string"}
+
+        def test_drops_subschemas_of_a_replaced_document(self, resolver, person):
+            resolver.register_document('schemas/person.json', person)
+            resolver.register_document('schemas/person.json', {"type": "object"})
+            assert resolver.get('schemas/person.json#/definitions/address') is None
+            assert 'schemas/person.json' in resolver
+
+
+class TestSchemaManager:
+    class TestResolveSchema:
+        def test_creates_a_schema_for_a_pointer_into_an_indexed_document(self, person):
+            manager = SchemaManager()
+            manager.create_schema('schemas/resolver_person.json', 'ResolverPerson', person)
+            reference = './resolver_person.json#/definitions/address/properties/city'
+            schema = manager.resolve_schema('schemas/book.json', reference)
+
+            assert schema.url == 'schemas/resolver_person.json#/definitions/address/properties/city'
+            assert schema.class_name == 'City'
+            assert schema.key_value_definition == {"type": "string"}
+            assert len(manager.schemas) == 2
+            manager.resolve_schema('schemas/book.json', reference)
+            assert len(manager.schemas) == 2
+
+        def test_returns_none_for_an_unknown_reference(self):
+            assert SchemaManager().resolve_schema('schemas/book.json', './missing.json') is None
+
+        def test_compiles_a_property_referencing_a_nested_subschema(self, person):
+            manager = SchemaManager()
+            manager.create_schema('schemas/resolver_person.json', 'ResolverPerson', person)
+            book = manager.create_schema('schemas/resolver_book.json', 'ResolverBook', {
+                "type": "object",
+                "properties": {"city": {"$ref": "./resolver_person.json#/definitions/address/properties/city"}}
+            })
+            context = book.compile()
+
+            assert book.property_map == {'city': 'City'}
+            assert context.get_representation('ResolverBook').data_members[0]['class'] == 'City'
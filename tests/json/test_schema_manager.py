@@ -0,0 +1,196 @@
+import pytest
+
+from skeema.intermediate import CompilationContext
+
+from skeema.schema import Schema
+from skeema.schema.json import SchemaManager
+
+
+@pytest.fixture(name='manager')
+def create_manager():
+    return SchemaManager()
+
+
+class TestSchemaManager:
+    class TestFindCircularDependencies:
+        def test_reports_every_cycle(self, manager):
+            manager.create_schema('schemas/a.json', 'A', {"$ref": "./b.json"})
+            manager.create_schema('schemas/b.json', 'B', {"$ref": "./a.json"})
+            manager.create_schema('schemas/c.json', 'C', {"$ref": "./d.json"})
+            manager.create_schema('schemas/d.json', 'D', {
+                "type": "object",
+                "properties": {
+                    "c": {"$ref": "./c.json"},
+                    "a": {"$ref": "./a.json"}
+                }
+            })
+
+            cycles = manager.find_circular_dependencies()
+            assert sorted(sorted(cycle) for cycle in cycles) == [
+                ['schemas/a.json', 'schemas/b.json'],
+                ['schemas/c.json', 'schemas/d.json']
+            ]
+
+        def test_reports_no_cycles_and_allows_compilation(self, manager):
+            manager.create_schema('schemas/person.json', 'Person', {
+                "type": "object",
+                "properties": {"name": {"type": "string"}}
+            })
+            manager.create_schema('schemas/book.json', 'Book', {
+                "type": "object",
+                "properties": {"author": {"$ref": "./person.json"}}
+            })
+
+            assert manager.find_circular_dependencies() == []
+            context = manager.get_schema('schemas/book.json').compile()
+            assert context.get_representation('Book') is not None
+            assert context.get_representation('Person') is not None
+
+    class TestAnalyzeDependencies:
+        def test_weights_schemas_by_profiled_compile_time(self, manager):
+            manager.create_schema('schemas/person.json', 'Person', {
+                "type": "object",
+                "properties": {"name": {"type": "string"}}
+            })
+            manager.create_schema('schemas/book.json', 'Book', {
+                "type": "object",
+                "properties": {"author": {"$ref": "./person.json"}}
+            })
+            context = manager.get_schema('schemas/book.json').compile(CompilationContext(profile=True))
+            assert set(context.compile_times) == {
+                'schemas/book.json',
+                'schemas/person.json',
+                'schemas/person.json#/properties/NameClass'
+            }
+
+            analysis = manager.analyze_dependencies(context)
+            assert [node.debug_name for node in analysis.critical_path()] == [
+                'schemas/person.json#/properties/NameClass',
+                'schemas/person.json',
+                'schemas/book.json'
+            ]
+            assert analysis.critical_path_length == pytest.approx(sum(context.compile_times.values()))
+
+    class TestReloadSchemas:
+        @pytest.fixture(name='library')
+        def fixture_library(self, manager):
+            manager.create_schema('schemas/reload_person.json', 'ReloadPerson', {
+                "type": "object",
+                "properties": {"name": {"type": "string"}}
+            })
+            manager.create_schema('schemas/reload_book.json', 'ReloadBook', {
+                "type": "object",
+                "properties": {"author": {"$ref": "./reload_person.json"}}
+            })
+            manager.create_schema('schemas/reload_shelf.json', 'ReloadShelf', {
+                "type": "object",
+                "properties": {"label": {"type": "string"}}
+            })
+            for schema in manager.schemas:
+                schema.compile()
+            return manager
+
+        def test_recompiles_only_changed_schemas_and_their_dependents(self, library):
+            compilation_context = library.reload_schemas({
+                'schemas/reload_person.json': {
+                    "type": "object",
+                    "properties": {"name": {"type": "string"}, "age": {"type": "integer"}}
+                }
+            })
+
+            class_names = sorted(representation.class_name for representation in compilation_context.representations)
+            assert class_names == ['AgeClass', 'NameClass', 'ReloadBook', 'ReloadPerson']
+
+        def test_replaces_schemas_created_from_the_old_definition(self, library):
+            library.reload_schemas({
+                'schemas/reload_person.json': {"type": "object", "properties": {"age": {"type": "integer"}}}
+            })
+
+            person = library.get_schema('schemas/reload_person.json')
+            assert person.property_map == {'age': 'AgeClass'}
+            assert library.get_schema('schemas/reload_person.json#/properties/NameClass') is None
+            assert all(schema.compiled for schema in library.schemas)
+
+        def test_keeps_the_schemas_created_from_unchanged_definitions(self, library):
+            library.reload_schemas({
+                'schemas/reload_person.json': {"type": "object", "properties": {"age": {"type": "integer"}}}
+            })
+            library.reload_schemas({
+                'schemas/reload_person.json': {"type": "object", "properties": {"nickname": {"type": "string"}}}
+            })
+
+            assert library.get_schema('schemas/reload_person.json#/properties/AgeClass') is None
+            assert library.get_schema('schemas/reload_person.json#/properties/NicknameClass') is not None
+            assert library.get_schema('schemas/reload_shelf.json#/properties/LabelClass') is not None
+
+        def test_relinks_dependents_to_the_changed_schema(self, library):
+            library.reload_schemas({
+                'schemas/reload_person.json': {"type": "object", "properties": {"age": {"type": "integer"}}}
+            })
+
+            book = library.get_schema('schemas/reload_book.json')
+            dependency_names = [node.debug_name for node in book.dependency_node.dependency_nodes]
+            assert dependency_names == ['schemas/reload_person.json']
+
+    class TestInvalidate:
+        @pytest.fixture(name='library')
+        def fixture_library(self, manager):
+            manager.create_schema('schemas/invalidate_person.json', 'InvalidatePerson', {
+                "type": "object",
+                "properties": {"name": {"type": "string"}}
+            })
+            manager.create_schema('schemas/invalidate_book.json', 'InvalidateBook', {
+                "type": "object",
+                "properties": {"author": {"$ref": "./invalidate_person.json"}}
+            })
+            manager.create_schema('schemas/invalidate_library.json', 'InvalidateLibrary', {
+                "type": "object",
+                "properties": {"book": {"$ref": "./invalidate_book.json"}}
+            })
+            manager.create_schema('schemas/invalidate_shelf.json', 'InvalidateShelf', {
+                "type": "object",
+                "properties": {"label": {"type": "string"}}
+            })
+            return manager
+
+        @pytest.fixture(name='compilation_context')
+        def fixture_compilation_context(self, library):
+            compilation_context = CompilationContext(profile=True)
+            for schema in library.schemas:
+                schema.compile(compilation_context)
+            return compilation_context
+
+        def test_marks_the_schema_and_its_transitive_dependents_as_uncompiled(self, library, compilation_context):
+            invalidated = library.invalidate('schemas/invalidate_person.json')
+
+            assert [schema.class_name for schema in invalidated] == \
+                ['InvalidatePerson', 'InvalidateBook', 'InvalidateLibrary']
+            assert [schema.class_name for schema in library.schemas if not schema.compiled] == \
+                ['InvalidatePerson', 'InvalidateBook', 'InvalidateLibrary']
+
+        def test_removes_the_invalidated_schemas_from_the_compilation_context(self, library, compilation_context):
+            library.invalidate('schemas/invalidate_book.json', compilation_context)
+
+            assert compilation_context.get_representation('InvalidateBook') is None
+            assert compilation_context.get_representation('InvalidateLibrary') is None
+            assert compilation_context.get_representation('InvalidatePerson') is not None
+            assert 'schemas/invalidate_book.json' not in compilation_context.compile_times
+
+        def test_returns_nothing_for_an_unknown_url(self, library):
+            assert library.invalidate('schemas/unknown.json') == []
+
+        def test_recompiles_only_the_invalidated_schemas(self, library, compilation_context, monkeypatch):
+            expected = {representation.class_name: representation for representation in compilation_context.representations}
+            library.invalidate('schemas/invalidate_book.json', compilation_context)
+
+            compiled = []
+            compile_representation = Schema._compile_representation
+            monkeypatch.setattr(
+                Schema, '_compile_representation',
+                lambda schema, context: compiled.append(schema.class_name) or compile_representation(schema, context)
+            )
+            for schema in library.schemas:
+                schema.compile(compilation_context)
+
+            assert compiled == ['InvalidateBook', 'InvalidateLibrary']
+            assert {r.class_name: r for r in compilation_context.representations} == expected
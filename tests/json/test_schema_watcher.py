@@ -0,0 +1,84 @@
+import pytest
+import threading
+
+from skeema.file.file import JsonFileManager
+from skeema.intermediate.compiler.compiler import Compiler
+from skeema.schema import SchemaWatcher
+from skeema.schema.json import SchemaManager
+
+
+@pytest.fixture(name='managers')
+def fixture_managers(write_json):
+    paths = {
+        'WatchedPerson': write_json('person.json', {"type": "object", "properties": {"name": {"type": "string"}}}),
+        'WatchedBook': write_json('book.json', {"type": "object", "properties": {"author": {"$ref": "./person.json"}}}),
+        'WatchedShelf': write_json('shelf.json', {"type": "object", "properties": {"label": {"type": "string"}}}),
+    }
+
+    file_manager = JsonFileManager()
+    schema_manager = SchemaManager()
+    for class_name, path in paths.items():
+        file_manager.load(path)
+        schema_manager.create_schema(path, class_name, file_manager.get_file(path).content)
+
+    compilation_context = None
+    for schema in schema_manager.schemas:
+        compilation_context = schema.compile(compilation_context)
+    Compiler().compile(compilation_context)
+    return file_manager, schema_manager
+
+
+class TestSchemaWatcher:
+    class TestPoll:
+        def test_returns_none_without_changes(self, managers):
+            schema_watcher = SchemaWatcher(*managers)
+
+            assert schema_watcher.poll() is None
+
+        def test_recompiles_the_changed_schema_and_its_dependents_only(self, managers, write_json):
+            schema_watcher = SchemaWatcher(*managers)
+            write_json('person.json', {"type": "object", "properties": {"nickname": {"type": "string"}}})
+            compilation_context = schema_watcher.poll()
+
+            class_names = sorted(representation.class_name for representation in compilation_context.representations)
+            assert class_names == ['NicknameClass', 'WatchedBook', 'WatchedPerson']
+
+        def test_rebuilds_the_classes_of_the_changed_schemas(self, managers, write_json):
+            schema_watcher = SchemaWatcher(*managers)
+            write_json('person.json', {"type": "object", "properties": {"nickname": {"type": "string"}}})
+            schema_watcher.poll()
+
+            from skeema import WatchedPerson
+            assert WatchedPerson(nickname='Ann').nickname == 'Ann'
+
+        def test_recompiles_a_schema_that_failed_to_decode_on_the_next_poll(self, managers, write_json, tmp_path):
+            schema_watcher = SchemaWatcher(*managers)
+            (tmp_path / 'shelf.json').write_text('{"type": "object", "prop')
+            with pytest.raises(ValueError):
+                schema_watcher.poll()
+            write_json('shelf.json', {"type": "object", "properties": {"code": {"type": "string"}}})
+            compilation_context = schema_watcher.poll()
+
+            class_names = sorted(representation.class_name for representation in compilation_context.representations)
+            assert class_names == ['CodeClass', 'WatchedShelf']
+
+    class TestWatch:
+        def test_keeps_watching_after_a_file_fails_to_decode(self, managers, write_json, tmp_path):
+            schema_watcher = SchemaWatcher(*managers, interval=0.01)
+            (tmp_path / 'shelf.json').write_text('{"type": ')
+            stop = threading.Event()
+            errors = []
+            changes = []
+
+            def on_error(error):
+                errors.append(error)
+                write_json('shelf.json', {"type": "object", "properties": {"label": {"type": "integer"}}})
+
+            def on_change(compilation_context):
+                changes.append(sorted(r.class_name for r in compilation_context.representations))
+                stop.set()
+
+            schema_watcher.watch(on_change, stop, on_error)
+
+            assert len(errors) == 1
+            assert changes == [['LabelClass', 'WatchedShelf']]